@@ -15,13 +15,13 @@ import math
 import sys
 import random
 
-# Initialize Pygame
-pygame.init()
+from dirty_rects import DirtyRects, outline_rects
+from geometry import hexagon_frame_degrees
+from hud import HUD, get_font
 
 # Screen dimensions
 WIDTH, HEIGHT = 700, 520
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("DeepThink R1: Bouncing Ball in Spinning Hexagon")
+CAPTION = "DeepThink R1: Bouncing Ball in Spinning Hexagon"
 
 # Colors
 BLACK = (0, 0, 0)
@@ -35,33 +35,23 @@ ORANGE = (255, 165, 0)
 # Hexagon properties
 hexagon_radius = 250
 hexagon_center = (WIDTH // 2, HEIGHT // 2)
-hexagon_angle = 0  # Initial rotation angle
 hexagon_angular_velocity = 0.5  # Slower rotation speed in degrees per frame
-hexagon_spin_direction = 1  # 1 for clockwise, -1 for counterclockwise
-spin_reverse_timer = 0  # Timer to reverse spin direction
 SPIN_DURATION_MIN = 300   # Spin in one direction between SPIN_DURATION_MIN_MS and SPIN_DURATION_MAZ_MS milliseconds
 SPIN_DURATION_MAX = 1200
 hexagon_wall_thickness = 5  # Thicker walls
 
 # Ball properties
 ball_radius = 20
-ball_position = [WIDTH // 2, HEIGHT // 2]
-ball_velocity = [5, -10]  # Initial velocity
 gravity = 0.5
 friction = 0.99
 
-# Counters
-total_time_counter = 0  # Counter for total time elapsed
-direction_change_counter = 0  # Counter for time since last direction change
+# Display
+HUD_REFRESH_HZ = 15  # HUD text updates per second (None = every frame)
+DIRTY_RECTS = True  # Push only the changed parts of the window with display.update (False = flip all of it)
 
 # Function to draw a hexagon with thicker walls
-def draw_hexagon(surface, center, radius, angle, color, thickness):
-    points = []
-    for i in range(6):
-        x = center[0] + radius * math.cos(math.radians(60 * i + angle))
-        y = center[1] + radius * math.sin(math.radians(60 * i + angle))
-        points.append((x, y))
-    pygame.draw.polygon(surface, color, points, thickness)
+def draw_hexagon(surface, frame, color, thickness):
+    pygame.draw.polygon(surface, color, frame.points, thickness)
 
 # Function to check if a point is inside the hexagon
 def is_point_inside_hexagon(point, center, radius, angle):
@@ -86,18 +76,12 @@ def constrain_ball_inside_hexagon(ball_pos, hex_center, hex_radius, hex_angle):
         ball_pos[1] = hex_center[1] + (hex_radius - ball_radius) * math.sin(angle_to_center)
 
 # Function to check collision between ball and hexagon walls
-def check_collision(ball_pos, ball_vel, hex_center, hex_radius, hex_angle):
+def check_collision(ball_pos, ball_vel, frame):
     for i in range(6):
-        # Get two points of the hexagon wall
-        x1 = hex_center[0] + hex_radius * math.cos(math.radians(60 * i + hex_angle))
-        y1 = hex_center[1] + hex_radius * math.sin(math.radians(60 * i + hex_angle))
-        x2 = hex_center[0] + hex_radius * math.cos(math.radians(60 * (i + 1) + hex_angle))
-        y2 = hex_center[1] + hex_radius * math.sin(math.radians(60 * (i + 1) + hex_angle))
-
-        # Vector of the wall
-        wall_vector = (x2 - x1, y2 - y1)
-        wall_length = math.hypot(wall_vector[0], wall_vector[1])
-        wall_unit_vector = (wall_vector[0] / wall_length, wall_vector[1] / wall_length)
+        # Start point, direction and length of the hexagon wall
+        x1, y1 = frame.vertices[i]
+        wall_unit_vector = frame.units[i]
+        wall_length = frame.lengths[i]
 
         # Vector from ball to wall start
         ball_to_wall = (ball_pos[0] - x1, ball_pos[1] - y1)
@@ -127,7 +111,7 @@ def check_collision(ball_pos, ball_vel, hex_center, hex_radius, hex_angle):
                 ball_vel[1] += kick_force * math.sin(math.radians(kick_angle))
 
             # Reflect the ball's velocity
-            normal_vector = (-wall_unit_vector[1], wall_unit_vector[0])
+            normal_vector = frame.normals[i]
             dot_product = ball_vel[0] * normal_vector[0] + ball_vel[1] * normal_vector[1]
             ball_vel[0] -= 2 * dot_product * normal_vector[0]
             ball_vel[1] -= 2 * dot_product * normal_vector[1]
@@ -137,88 +121,118 @@ def check_collision(ball_pos, ball_vel, hex_center, hex_radius, hex_angle):
             ball_pos[0] += overlap * normal_vector[0]
             ball_pos[1] += overlap * normal_vector[1]
 
+
 # Function to display information
-def display_info(surface, hex_spin_direction, ball_vel, bounce_angle, total_time, direction_change_time):
-    font = pygame.font.SysFont("Arial", 20)
-    spin_text = f"Spin Direction: {'Clockwise' if hex_spin_direction == 1 else 'Counterclockwise'}"
-    vel_text = f"Ball Velocity: ({ball_vel[0]:.2f}, {ball_vel[1]:.2f})"
-    angle_text = f"Bounce Angle: {bounce_angle:.2f}°"
-    total_time_text = f"Total Time: {total_time:.2f} s"
-    direction_change_text = f"{direction_change_time:.1f} s"
-
-    # Combine spin direction and direction change time into one line
-    spin_and_direction_text = f"{spin_text} ({direction_change_text}) "
-
-    # Render the text surfaces
-    total_time_surface = font.render(total_time_text, True, YELLOW)
-    spin_and_direction_surface = font.render(spin_and_direction_text, True, YELLOW)
-    vel_surface = font.render(vel_text, True, YELLOW)
-    angle_surface = font.render(angle_text, True, YELLOW)
-
-    # Display the text on the screen
-    surface.blit(total_time_surface, (10, 10))
-    surface.blit(spin_and_direction_surface, (10, 30))
-    surface.blit(vel_surface, (10, 50))
-    surface.blit(angle_surface, (10, 70))
+# Returns the HUD's area and whether its text changed, for DirtyRects
+def display_info(surface, hud, hex_spin_direction, ball_vel, bounce_angle, total_time, direction_change_time):
+    changed = False
+    if hud.refresh_due():
+        spin_text = 'Clockwise' if hex_spin_direction == 1 else 'Counterclockwise'
+        changed = hud.update([
+            ("Total Time: ", f"{total_time:.2f} s"),
+            ("Spin Direction: ", f"{spin_text} ({direction_change_time:.1f} s) "),
+            ("Ball Velocity: ", f"({ball_vel[0]:.2f}, {ball_vel[1]:.2f})"),
+            ("Bounce Angle: ", f"{bounce_angle:.2f}°"),
+        ])
+    return hud.draw(surface), changed
+
+
+# Function to initialize pygame and open the window. Importing this module initializes nothing.
+def init_display():
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption(CAPTION)
+    return screen
 
 
 # Main loop
-# Main loop
-clock = pygame.time.Clock()
-running = True
-spin_duration = random.randint(SPIN_DURATION_MIN, SPIN_DURATION_MAX)  # Generate a random duration once
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-    # Update hexagon rotation
-    hexagon_angle += hexagon_angular_velocity * hexagon_spin_direction
-    if hexagon_angle >= 360:
-        hexagon_angle -= 360
-    elif hexagon_angle < 0:
-        hexagon_angle += 360
-
-    # Randomly reverse hexagon spin direction
-    spin_reverse_timer += 1
-    if spin_reverse_timer > spin_duration:  # Compare to the fixed random duration
-        hexagon_spin_direction *= -1
-        spin_reverse_timer = 0
-        direction_change_counter = 0  # Reset the direction change counter
-        spin_duration = random.randint(SPIN_DURATION_MIN, SPIN_DURATION_MAX)  # Generate a new random duration
-
-    # Update ball position and velocity
-    ball_velocity[1] += gravity  # Apply gravity
-    ball_velocity[0] *= friction  # Apply friction
-    ball_velocity[1] *= friction  # Apply friction
-    ball_position[0] += ball_velocity[0]
-    ball_position[1] += ball_velocity[1]
-
-    # Constrain the ball inside the hexagon
-    constrain_ball_inside_hexagon(ball_position, hexagon_center, hexagon_radius, hexagon_angle)
-
-    # Check for collisions with hexagon walls
-    check_collision(ball_position, ball_velocity, hexagon_center, hexagon_radius, hexagon_angle)
-
-    # Update counters
-    total_time_counter += clock.get_time() / 1000  # Convert milliseconds to seconds
-    direction_change_counter += clock.get_time() / 1000  # Convert milliseconds to seconds
-
-    # Clear the screen
-    screen.fill(BLACK)
-
-    # Draw the hexagon with thicker walls
-    draw_hexagon(screen, hexagon_center, hexagon_radius, hexagon_angle, WHITE, hexagon_wall_thickness)
-
-    # Draw the ball
-    pygame.draw.circle(screen, BLUE, (int(ball_position[0]), int(ball_position[1])), ball_radius)
-
-    # Display information
-    bounce_angle = math.degrees(math.atan2(ball_velocity[1], ball_velocity[0]))
-    display_info(screen, hexagon_spin_direction, ball_velocity, bounce_angle, total_time_counter, direction_change_counter)
-
-    # Update the display
-    pygame.display.flip()
-
-    # Cap the frame rate
-    clock.tick(60)
\ No newline at end of file
+def main():
+    screen = init_display()
+    hud = HUD(get_font("Arial", 20), YELLOW, origin=(10, 10), line_height=20, refresh_hz=HUD_REFRESH_HZ)
+    dirty = DirtyRects(screen, BLACK, enabled=DIRTY_RECTS)
+
+    # Hexagon state
+    hexagon_angle = 0  # Initial rotation angle
+    hexagon_spin_direction = 1  # 1 for clockwise, -1 for counterclockwise
+    spin_reverse_timer = 0  # Timer to reverse spin direction
+
+    # Ball state
+    ball_position = [WIDTH // 2, HEIGHT // 2]
+    ball_velocity = [5, -10]  # Initial velocity
+
+    # Counters
+    total_time_counter = 0  # Counter for total time elapsed
+    direction_change_counter = 0  # Counter for time since last direction change
+
+    clock = pygame.time.Clock()
+    running = True
+    spin_duration = random.randint(SPIN_DURATION_MIN, SPIN_DURATION_MAX)  # Generate a random duration once
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.WINDOWEXPOSED:
+                dirty.invalidate()
+
+        # Update hexagon rotation
+        hexagon_angle += hexagon_angular_velocity * hexagon_spin_direction
+        if hexagon_angle >= 360:
+            hexagon_angle -= 360
+        elif hexagon_angle < 0:
+            hexagon_angle += 360
+
+        # Compute the hexagon's vertices, edges and normals once for collision and drawing
+        hexagon = hexagon_frame_degrees(hexagon_center, hexagon_radius, hexagon_angle)
+
+        # Randomly reverse hexagon spin direction
+        spin_reverse_timer += 1
+        if spin_reverse_timer > spin_duration:  # Compare to the fixed random duration
+            hexagon_spin_direction *= -1
+            spin_reverse_timer = 0
+            direction_change_counter = 0  # Reset the direction change counter
+            spin_duration = random.randint(SPIN_DURATION_MIN, SPIN_DURATION_MAX)  # Generate a new random duration
+
+        # Update ball position and velocity
+        ball_velocity[1] += gravity  # Apply gravity
+        ball_velocity[0] *= friction  # Apply friction
+        ball_velocity[1] *= friction  # Apply friction
+        ball_position[0] += ball_velocity[0]
+        ball_position[1] += ball_velocity[1]
+
+        # Constrain the ball inside the hexagon
+        constrain_ball_inside_hexagon(ball_position, hexagon_center, hexagon_radius, hexagon_angle)
+
+        # Check for collisions with hexagon walls
+        check_collision(ball_position, ball_velocity, hexagon)
+
+        # Update counters
+        total_time_counter += clock.get_time() / 1000  # Convert milliseconds to seconds
+        direction_change_counter += clock.get_time() / 1000  # Convert milliseconds to seconds
+
+        # Clear what was drawn last frame
+        dirty.begin()
+
+        # Draw the hexagon with thicker walls
+        draw_hexagon(screen, hexagon, WHITE, hexagon_wall_thickness)
+        dirty.draw("hexagon", outline_rects(hexagon.points, hexagon_wall_thickness))
+
+        # Draw the ball
+        dirty.draw("ball", pygame.draw.circle(screen, BLUE, (int(ball_position[0]), int(ball_position[1])), ball_radius))
+
+        # Display information
+        bounce_angle = math.degrees(math.atan2(ball_velocity[1], ball_velocity[0]))
+        dirty.draw("hud", *display_info(screen, hud, hexagon_spin_direction, ball_velocity, bounce_angle, total_time_counter, direction_change_counter))
+
+        # Update the parts of the display that changed
+        dirty.end()
+
+        # Cap the frame rate
+        clock.tick(60)
+
+    if DIRTY_RECTS:
+        print(dirty.summary(), file=sys.stderr)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -15,14 +15,14 @@ Display information about the hexagon's rotation direction, ball velocity, and b
 import pygame
 import math
 import random
+import sys
 
-# Initialize pygame
-pygame.init()
+from dirty_rects import DirtyRects, outline_rects
+from hud import HUD, get_font
 
 # Screen dimensions
 WIDTH, HEIGHT = 700, 520
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("GPT-4o: Ball Bouncing Inside a Spinning Hexagon")
+CAPTION = "GPT-4o: Ball Bouncing Inside a Spinning Hexagon"
 
 # Colors
 BLACK = (0, 0, 0)
@@ -33,11 +33,11 @@ GRAY = (127, 127, 127)
 YELLOW = (255, 255, 0)
 ORANGE = (255, 165, 0)
 
-# Font setup
-font = pygame.font.Font(None, 24)
+# Display
+HUD_REFRESH_HZ = 15  # HUD text updates per second (None = every frame)
+DIRTY_RECTS = True  # Push only the changed parts of the window with display.update (False = flip all of it)
 
-# Clock for controlling frame rate
-clock = pygame.time.Clock()
+# Frame rate
 FPS = 60
 
 # Physics constants
@@ -53,18 +53,17 @@ HEX_ANGLE_SPEED = math.radians(0.5)  # Speed of rotation in radians per frame
 
 # Ball properties
 BALL_RADIUS = 20
-ball_pos = [WIDTH // 2, HEIGHT // 2 - HEX_RADIUS + BALL_RADIUS * 2]
-ball_velocity = [random.uniform(-2, 2), random.uniform(-2, 2)]
 
-# Rotation direction
-rotation_direction = 1  # 1 for clockwise, -1 for counterclockwise
-last_direction_change = pygame.time.get_ticks()
+# Rotation direction changes
 SPIN_DURATION_MIN_MS = 2000   # Spin in one direction between SPIN_DURATION_MIN_MS and SPIN_DURATION_MAZ_MS milliseconds
 SPIN_DURATION_MAX_MS = 10000
-
-# Counters
-total_time_counter = 0  # Total time elapsed in seconds
-direction_change_counter = 0  # Time since last direction change in seconds
+# ---------------------------------------------------------------------------------------
+def init_display():
+    """Initialize pygame and open the window. Importing this module initializes nothing."""
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption(CAPTION)
+    return screen
 # ---------------------------------------------------------------------------------------
 def rotate_point(point, center, angle):
     px, py = point
@@ -132,87 +131,105 @@ def keep_ball_inside(ball_pos, hex_points):
             ball_pos[1] += normal[1] * overlap
 
 # Main loop
-running = True
-hex_angle = 0
-bounce_angle = 0
-spin_duration = random.randint(SPIN_DURATION_MIN_MS, SPIN_DURATION_MAX_MS)  # Random duration for spin direction
-
-while running:
-    screen.fill(BLACK)
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-    # Update counters
-    delta_time = clock.get_time() / 1000  # Time elapsed since last frame in seconds
-    total_time_counter += delta_time
-    direction_change_counter += delta_time
-
-    # Check if it's time to reverse the spin direction
-    if direction_change_counter * 1000 > spin_duration:  # Convert seconds to milliseconds
-        rotation_direction *= -1
-        direction_change_counter = 0  # Reset the direction change counter
-        spin_duration = random.randint(SPIN_DURATION_MIN_MS, SPIN_DURATION_MAX_MS)  # New random duration
-
-    # Update hexagon rotation
-    hex_angle += HEX_ANGLE_SPEED * rotation_direction
-    hex_points = get_hexagon_points(HEX_CENTER, HEX_RADIUS, hex_angle)
-
-    # Update ball position and velocity
-    ball_velocity[1] += GRAVITY
-    new_ball_pos = [ball_pos[0] + ball_velocity[0], ball_pos[1] + ball_velocity[1]]
-
-    # Check for collisions with hexagon walls
-    for i in range(6):
-        start_point = hex_points[i]
-        end_point = hex_points[(i + 1) % 6]
-        pygame.draw.line(screen, WHITE, start_point, end_point, 3)
-
-        if point_line_distance(new_ball_pos, start_point, end_point) < BALL_RADIUS:
-            normal = [-(end_point[1] - start_point[1]), end_point[0] - start_point[0]]
-            normal_mag = math.sqrt(normal[0]**2 + normal[1]**2)
-            normal = [n / normal_mag for n in normal]
-
-            if not is_near_corner(new_ball_pos, hex_points):
-                kick_angle = random.uniform(0, math.pi * 2)
-                kick_force = random.uniform(KICK_FORCE_MIN, KICK_FORCE_MAX)
-                ball_velocity[0] += math.cos(kick_angle) * kick_force
-                ball_velocity[1] += math.sin(kick_angle) * kick_force
-
-            reflect_ball(ball_velocity, normal)
-            bounce_angle = math.degrees(math.atan2(-ball_velocity[1], ball_velocity[0]))
-
-    ball_pos = new_ball_pos
-    keep_ball_inside(ball_pos, hex_points)
-
-    # Draw the ball
-    pygame.draw.circle(screen, RED, (int(ball_pos[0]), int(ball_pos[1])), BALL_RADIUS)
-
-    # Display information
-    rotation_text = f"Rotation: {'Clockwise' if rotation_direction == 1 else 'Counterclockwise'}"
-    velocity_text = f"Ball Velocity: {math.sqrt(ball_velocity[0] ** 2 + ball_velocity[1] ** 2):.2f}"
-    bounce_text = f"Bounce Angle: {bounce_angle:.2f}°"
-    total_time_text = f"Total Time: {total_time_counter:.2f} s"
-    direction_change_text = f"{direction_change_counter:.1f} s"
-
-    # Combine rotation and direction change into one line
-    rotation_and_direction_text = f" {rotation_text} ({direction_change_text})"
-
-    # Render the text surfaces
-    rotation_and_direction_surface = font.render(rotation_and_direction_text, True, ORANGE)
-    velocity_surface = font.render(velocity_text, True, ORANGE)
-    bounce_surface = font.render(bounce_text, True, ORANGE)
-    total_time_surface = font.render(total_time_text, True, ORANGE)
-
-    # Display the text on the screen
-    screen.blit(total_time_surface, (10, 10))
-    screen.blit(rotation_and_direction_surface, (10, 40))
-    screen.blit(velocity_surface, (10, 70))
-    screen.blit(bounce_surface, (10, 100))
-
-    pygame.display.flip()
-    clock.tick(FPS)
-
-pygame.quit()
+def main():
+    screen = init_display()
+    font = get_font(None, 24)
+    hud = HUD(font, ORANGE, origin=(10, 10), line_height=30, refresh_hz=HUD_REFRESH_HZ)
+    clock = pygame.time.Clock()
+    dirty = DirtyRects(screen, BLACK, enabled=DIRTY_RECTS)
+
+    # Ball state
+    ball_pos = [WIDTH // 2, HEIGHT // 2 - HEX_RADIUS + BALL_RADIUS * 2]
+    ball_velocity = [random.uniform(-2, 2), random.uniform(-2, 2)]
+
+    # Rotation direction
+    rotation_direction = 1  # 1 for clockwise, -1 for counterclockwise
+
+    # Counters
+    total_time_counter = 0  # Total time elapsed in seconds
+    direction_change_counter = 0  # Time since last direction change in seconds
+
+    running = True
+    hex_angle = 0
+    bounce_angle = 0
+    spin_duration = random.randint(SPIN_DURATION_MIN_MS, SPIN_DURATION_MAX_MS)  # Random duration for spin direction
+
+    while running:
+        dirty.begin()  # Clear what was drawn last frame
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.WINDOWEXPOSED:
+                dirty.invalidate()
+
+        # Update counters
+        delta_time = clock.get_time() / 1000  # Time elapsed since last frame in seconds
+        total_time_counter += delta_time
+        direction_change_counter += delta_time
+
+        # Check if it's time to reverse the spin direction
+        if direction_change_counter * 1000 > spin_duration:  # Convert seconds to milliseconds
+            rotation_direction *= -1
+            direction_change_counter = 0  # Reset the direction change counter
+            spin_duration = random.randint(SPIN_DURATION_MIN_MS, SPIN_DURATION_MAX_MS)  # New random duration
+
+        # Update hexagon rotation
+        hex_angle += HEX_ANGLE_SPEED * rotation_direction
+        hex_points = get_hexagon_points(HEX_CENTER, HEX_RADIUS, hex_angle)
+
+        # Update ball position and velocity
+        ball_velocity[1] += GRAVITY
+        new_ball_pos = [ball_pos[0] + ball_velocity[0], ball_pos[1] + ball_velocity[1]]
+
+        # Check for collisions with hexagon walls
+        for i in range(6):
+            start_point = hex_points[i]
+            end_point = hex_points[(i + 1) % 6]
+            pygame.draw.line(screen, WHITE, start_point, end_point, 3)
+
+            if point_line_distance(new_ball_pos, start_point, end_point) < BALL_RADIUS:
+                normal = [-(end_point[1] - start_point[1]), end_point[0] - start_point[0]]
+                normal_mag = math.sqrt(normal[0]**2 + normal[1]**2)
+                normal = [n / normal_mag for n in normal]
+
+                if not is_near_corner(new_ball_pos, hex_points):
+                    kick_angle = random.uniform(0, math.pi * 2)
+                    kick_force = random.uniform(KICK_FORCE_MIN, KICK_FORCE_MAX)
+                    ball_velocity[0] += math.cos(kick_angle) * kick_force
+                    ball_velocity[1] += math.sin(kick_angle) * kick_force
+
+                reflect_ball(ball_velocity, normal)
+                bounce_angle = math.degrees(math.atan2(-ball_velocity[1], ball_velocity[0]))
+
+        dirty.draw("hexagon", outline_rects(hex_points, 3))
+
+        ball_pos = new_ball_pos
+        keep_ball_inside(ball_pos, hex_points)
+
+        # Draw the ball
+        dirty.draw("ball", pygame.draw.circle(screen, RED, (int(ball_pos[0]), int(ball_pos[1])), BALL_RADIUS))
+
+        # Display information
+        hud_changed = False
+        if hud.refresh_due():
+            rotation_text = 'Clockwise' if rotation_direction == 1 else 'Counterclockwise'
+            hud_changed = hud.update([
+                ("Total Time: ", f"{total_time_counter:.2f} s"),
+                (" Rotation: ", f"{rotation_text} ({direction_change_counter:.1f} s)"),
+                ("Ball Velocity: ", f"{math.sqrt(ball_velocity[0] ** 2 + ball_velocity[1] ** 2):.2f}"),
+                ("Bounce Angle: ", f"{bounce_angle:.2f}°"),
+            ])
+        dirty.draw("hud", hud.draw(screen), hud_changed)
+
+        dirty.end()  # Update the parts of the display that changed
+        clock.tick(FPS)
+
+    if DIRTY_RECTS:
+        print(dirty.summary(), file=sys.stderr)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
 # ----------------------------- END ------------------------------------------------------
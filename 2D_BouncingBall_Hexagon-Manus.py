@@ -29,13 +29,15 @@ import numpy as np
 import random
 import time
 
-# Initialize pygame
-pygame.init()
+from dirty_rects import DirtyRects, outline_rects
+from geometry import TURN_SPOKES, hexagon_frame
+from hud import HUD, get_font
+from profiling import make_profiler
+from state import Ball, Hexagon
 
 # Screen dimensions
 WIDTH, HEIGHT = 700, 520
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Manus: Ball Bouncing in a Spinning Hexagon")
+CAPTION = "Manus: Ball Bouncing in a Spinning Hexagon"
 
 # Colors
 WHITE = (255, 255, 255)
@@ -47,69 +49,67 @@ YELLOW = (255, 255, 0)
 # Physics constants
 GRAVITY = 0.5
 FRICTION = 0.98
-ROTATION_SPEED = 0.01  # Radians per frame
+ROTATION_SPEED = 0.01  # Radians per frame, at the start (the sign is the spin direction)
 
 # Kick parameters
 MIN_KICK_FORCE = 3.0
 MAX_KICK_FORCE = 8.0
 
 # Ball properties
-ball_radius = 15
-ball_pos = np.array([WIDTH // 2, HEIGHT // 2], dtype=float)
-ball_vel = np.array([2.0, 0.0], dtype=float)
+BALL_RADIUS = 15
+BALL_START_POS = (WIDTH // 2, HEIGHT // 2)
+BALL_START_VEL = (2.0, 0.0)
 
 # Hexagon properties
-hexagon_radius = 250
-hexagon_center = np.array([WIDTH // 2, HEIGHT // 2])
-hexagon_angle = 0
+HEXAGON_RADIUS = 250
+HEXAGON_CENTER = (WIDTH // 2, HEIGHT // 2)
 
-# Clock for controlling frame rate
-clock = pygame.time.Clock()
+# Frame rate
 FPS = 60
 
-# Disable audio to prevent ALSA errors
-pygame.mixer.quit()
-
-# Font for text display
-font = pygame.font.SysFont('Arial', 16)
-
-# Tracking variables
-start_time = time.time()
-last_bounce_time = start_time
-last_direction_change_time = start_time
-bounce_angle = 0
-spin_direction = "Clockwise"  # Initial spin direction
-total_bounces = 0
-last_kick_force = 0.0
-last_kick_angle = 0.0
+# Text display
+HUD_REFRESH_HZ = 15  # HUD text updates per second (None = every frame)
+DIRTY_RECTS = True  # Push only the changed parts of the window with display.update (False = flip all of it)
 
 # Kick effect visualization
-kick_effect_time = 0
 kick_effect_duration = 15  # frames
 
 # Random direction change settings
 MIN_DIRECTION_CHANGE_TIME = 3.0  # Minimum time between direction changes (seconds)
 MAX_DIRECTION_CHANGE_TIME = 8.0  # Maximum time between direction changes (seconds)
-next_direction_change = start_time + random.uniform(MIN_DIRECTION_CHANGE_TIME, MAX_DIRECTION_CHANGE_TIME)
 
 
-def get_hexagon_vertices():
-    """Calculate the vertices of the hexagon based on current rotation angle."""
-    vertices = []
-    for i in range(6):
-        angle = hexagon_angle + i * (2 * math.pi / 6)
-        x = hexagon_center[0] + hexagon_radius * math.cos(angle)
-        y = hexagon_center[1] + hexagon_radius * math.sin(angle)
-        vertices.append((x, y))
-    return vertices
+def new_simulation(start_time):
+    """A fresh ball in a fresh hexagon, with the first spin reversal scheduled."""
+    ball = Ball(BALL_START_POS, BALL_START_VEL, BALL_RADIUS, now=start_time)
+    hexagon = Hexagon(HEXAGON_CENTER, HEXAGON_RADIUS, rotation_speed=ROTATION_SPEED, now=start_time)
+    hexagon.next_direction_change = start_time + random.uniform(MIN_DIRECTION_CHANGE_TIME,
+                                                                MAX_DIRECTION_CHANGE_TIME)
+    return ball, hexagon
+
+
+def init_display():
+    """Initialize pygame and open the window. Importing this module initializes nothing."""
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption(CAPTION)
 
+    # Disable audio to prevent ALSA errors
+    pygame.mixer.quit()
+    return screen
 
-def get_hexagon_edges():
+
+def get_hexagon_frame(hexagon):
+    """Calculate the vertices, edges and normals of the hexagon at the current rotation angle."""
+    return hexagon_frame(hexagon.center, hexagon.radius, hexagon.angle, TURN_SPOKES)
+
+
+def get_hexagon_edges(frame):
     """Get the edges (line segments) of the hexagon."""
-    vertices = get_hexagon_vertices()
+    vertices = frame.vertices
     edges = []
     for i in range(6):
-        edges.append((vertices[i], vertices[(i + 1) % 6]))
+        edges.append((vertices[i], vertices[i + 1]))
     return edges
 
 
@@ -142,10 +142,8 @@ def calculate_angle_degrees(vector):
     return (angle_deg + 360) % 360  # Normalize to [0, 360)
 
 
-def apply_random_kick():
+def apply_random_kick(ball):
     """Apply a random kick to the ball."""
-    global ball_vel, last_kick_force, last_kick_angle, kick_effect_time
-
     # Generate random kick force and angle
     kick_force = random.uniform(MIN_KICK_FORCE, MAX_KICK_FORCE)
     kick_angle_rad = random.uniform(0, 2 * math.pi)
@@ -156,106 +154,107 @@ def apply_random_kick():
     kick_vector = np.array([kick_x, kick_y])
 
     # Apply kick to ball velocity
-    ball_vel += kick_vector
+    ball.vel += kick_vector
 
     # Store kick information for display
-    last_kick_force = kick_force
-    last_kick_angle = math.degrees(kick_angle_rad)
+    ball.last_kick_force = kick_force
+    ball.last_kick_angle = math.degrees(kick_angle_rad)
 
     # Set kick effect visualization timer
-    kick_effect_time = kick_effect_duration
+    ball.kick_effect_time = kick_effect_duration
 
 
-def check_collision():
+def check_collision(ball, hexagon, frame):
     """Check and handle collision between ball and hexagon edges."""
-    global ball_pos, ball_vel, bounce_angle, last_bounce_time, total_bounces
-
-    edges = get_hexagon_edges()
+    edges = get_hexagon_edges(frame)
     collision_occurred = False
 
     for edge in edges:
-        dist, nearest = distance_point_to_line(ball_pos, edge[0], edge[1])
+        dist, nearest = distance_point_to_line(ball.pos, edge[0], edge[1])
 
-        if dist <= ball_radius:
+        if dist <= ball.radius:
             # Calculate normal vector (perpendicular to the edge)
             edge_vec = np.array(edge[1]) - np.array(edge[0])
             normal = np.array([-edge_vec[1], edge_vec[0]])
             normal = normal / np.linalg.norm(normal)
 
             # Make sure normal points toward the ball
-            if np.dot(normal, ball_pos - np.array(edge[0])) < 0:
+            if np.dot(normal, ball.pos - np.array(edge[0])) < 0:
                 normal = -normal
 
             # Move ball outside the edge
-            penetration = ball_radius - dist
-            ball_pos = ball_pos + penetration * normal
+            penetration = ball.radius - dist
+            ball.pos = ball.pos + penetration * normal
 
             # Calculate bounce angle (angle between incoming velocity and normal)
-            incoming_angle = calculate_angle_degrees(ball_vel)
+            incoming_angle = calculate_angle_degrees(ball.vel)
             normal_angle = calculate_angle_degrees(normal)
             bounce_angle = abs(incoming_angle - normal_angle)
             if bounce_angle > 180:
                 bounce_angle = 360 - bounce_angle
+            ball.bounce_angle = bounce_angle
 
             # Reflect velocity with some energy loss (friction)
-            ball_vel = reflect_velocity(ball_vel, normal) * FRICTION
+            ball.vel = reflect_velocity(ball.vel, normal) * FRICTION
 
             # Add some effect from the rotating hexagon
             tangent = np.array([normal[1], -normal[0]])
-            rotation_effect = ROTATION_SPEED * hexagon_radius * tangent
-            ball_vel = ball_vel + rotation_effect * 0.2
+            rotation_effect = hexagon.rotation_speed * hexagon.radius * tangent
+            ball.vel = ball.vel + rotation_effect * 0.2
 
             # Apply random kick
-            apply_random_kick()
+            apply_random_kick(ball)
 
             # Update bounce time
-            last_bounce_time = time.time()
-            total_bounces += 1
+            ball.last_bounce_time = time.time()
+            ball.total_bounces += 1
             collision_occurred = True
 
     return collision_occurred
 
 
-def toggle_spin_direction():
+def toggle_spin_direction(hexagon):
     """Toggle the spin direction of the hexagon."""
-    global ROTATION_SPEED, spin_direction, last_direction_change_time, next_direction_change
-    ROTATION_SPEED = -ROTATION_SPEED
-    spin_direction = "Clockwise" if ROTATION_SPEED > 0 else "Counter-Clockwise"
-    last_direction_change_time = time.time()
+    hexagon.rotation_speed = -hexagon.rotation_speed
+    hexagon.last_direction_change_time = time.time()
     # Schedule next random direction change
-    next_direction_change = last_direction_change_time + random.uniform(MIN_DIRECTION_CHANGE_TIME,
-                                                                        MAX_DIRECTION_CHANGE_TIME)
+    hexagon.next_direction_change = hexagon.last_direction_change_time + random.uniform(MIN_DIRECTION_CHANGE_TIME,
+                                                                                        MAX_DIRECTION_CHANGE_TIME)
 
 
-def enforce_boundary():
+def enforce_boundary(ball, hexagon):
     """Ensure the ball stays inside the hexagon."""
-    global ball_pos, ball_vel
-
-    # Get current hexagon vertices
-    vertices = get_hexagon_vertices()
-
     # Check if ball is too far from center
-    dist_from_center = np.linalg.norm(ball_pos - hexagon_center)
-    max_safe_dist = hexagon_radius - ball_radius - 5  # 5 pixel buffer
+    dist_from_center = np.linalg.norm(ball.pos - hexagon.center)
+    max_safe_dist = hexagon.radius - ball.radius - 5  # 5 pixel buffer
 
     if dist_from_center > max_safe_dist:
         # Ball is too close to edge, apply correction
-        to_center = hexagon_center - ball_pos
+        to_center = hexagon.center - ball.pos
         to_center_norm = to_center / np.linalg.norm(to_center)
 
         # Move ball to safe position
-        ball_pos = hexagon_center - max_safe_dist * to_center_norm
+        ball.pos = hexagon.center - max_safe_dist * to_center_norm
 
         # Add velocity component toward center
-        if np.dot(ball_vel, to_center) < 0:  # If moving away from center
-            ball_vel = reflect_velocity(ball_vel, to_center_norm) * FRICTION
+        if np.dot(ball.vel, to_center) < 0:  # If moving away from center
+            ball.vel = reflect_velocity(ball.vel, to_center_norm) * FRICTION
 
 
 def main():
-    global ball_pos, ball_vel, hexagon_angle, next_direction_change, kick_effect_time
+    screen = init_display()
+    clock = pygame.time.Clock()
+    font = get_font('Arial', 16)
+    hud = HUD(font, BLUE, origin=(10, 10), line_height=20, refresh_hz=HUD_REFRESH_HZ)
+    profiler = make_profiler()  # BB_PROFILE=1 times every phase of the loop
+    dirty = DirtyRects(screen, BLACK, enabled=DIRTY_RECTS)
+
+    start_time = time.time()
+    ball, hexagon = new_simulation(start_time)
 
     running = True
     while running:
+        profiler.frame()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -263,78 +262,99 @@ def main():
                 if event.key == pygame.K_ESCAPE:
                     running = False
                 elif event.key == pygame.K_SPACE:
-                    toggle_spin_direction()
+                    toggle_spin_direction(hexagon)
                 elif event.key == pygame.K_r:
                     # Reset ball position to center
-                    ball_pos = np.array([WIDTH // 2, HEIGHT // 2], dtype=float)
-                    ball_vel = np.array([2.0, 0.0], dtype=float)
+                    ball.reset(BALL_START_POS, BALL_START_VEL)
+                elif event.key == pygame.K_p:
+                    profiler.overlay = not profiler.overlay
+            elif event.type == pygame.WINDOWEXPOSED:
+                dirty.invalidate()
+
+        profiler.lap("events")
 
         # Check if it's time for a random direction change
         current_time = time.time()
-        if current_time >= next_direction_change:
-            toggle_spin_direction()
+        if current_time >= hexagon.next_direction_change:
+            toggle_spin_direction(hexagon)
 
-        # Clear screen
-        screen.fill(BLACK)
+        profiler.lap("spin")
 
         # Update hexagon rotation
-        hexagon_angle += ROTATION_SPEED
+        hexagon.angle += hexagon.rotation_speed
+        frame = get_hexagon_frame(hexagon)
 
         # Update ball position with gravity
-        ball_vel[1] += GRAVITY
-        ball_pos += ball_vel
+        ball.vel[1] += GRAVITY
+        ball.pos += ball.vel
+
+        profiler.lap("physics")
 
         # Check for collision with hexagon
-        check_collision()
+        check_collision(ball, hexagon, frame)
 
         # Enforce boundary to keep ball inside
-        enforce_boundary()
+        enforce_boundary(ball, hexagon)
+
+        profiler.lap("collision")
+
+        # Clear what was drawn last frame
+        dirty.begin()
 
         # Draw hexagon
-        pygame.draw.polygon(screen, WHITE, get_hexagon_vertices(), 2)
+        pygame.draw.polygon(screen, WHITE, frame.points, 2)
+        dirty.draw("hexagon", outline_rects(frame.points, 2))
 
         # Draw ball with kick effect
+        ball_pos = ball.pos
         ball_color = RED
-        if kick_effect_time > 0:
+        if ball.kick_effect_time > 0:
             # Flash yellow when kicked
             ball_color = YELLOW
-            kick_effect_time -= 1
+            ball.kick_effect_time -= 1
 
             # Draw kick vector line
             kick_line_end = (
-                int(ball_pos[0] + last_kick_force * 5 * math.cos(math.radians(last_kick_angle))),
-                int(ball_pos[1] + last_kick_force * 5 * math.sin(math.radians(last_kick_angle)))
+                int(ball_pos[0] + ball.last_kick_force * 5 * math.cos(math.radians(ball.last_kick_angle))),
+                int(ball_pos[1] + ball.last_kick_force * 5 * math.sin(math.radians(ball.last_kick_angle)))
             )
-            pygame.draw.line(screen, YELLOW, (int(ball_pos[0]), int(ball_pos[1])), kick_line_end, 2)
+            dirty.draw("kick", pygame.draw.line(screen, YELLOW, (int(ball_pos[0]), int(ball_pos[1])), kick_line_end, 2))
 
-        pygame.draw.circle(screen, ball_color, (int(ball_pos[0]), int(ball_pos[1])), ball_radius)
+        dirty.draw("ball", pygame.draw.circle(screen, ball_color, (int(ball_pos[0]), int(ball_pos[1])), ball.radius))
 
-        # Calculate current metrics
-        elapsed_time = current_time - start_time
-        time_since_direction_change = current_time - last_direction_change_time
-        velocity_magnitude = np.linalg.norm(ball_vel)
-        velocity_angle = calculate_angle_degrees(ball_vel)
+        profiler.lap("draw")
 
         # Display text information
-        text_lines = [
-            f"Spin Direction: {spin_direction}",
-            f"Ball Velocity: {velocity_magnitude:.2f} px/frame @ {velocity_angle:.1f}°",
-            f"Bounce Angle: {bounce_angle:.1f}°",
-            f"Total Time: {elapsed_time:.2f} sec",
-            f"Direction Change Time: {time_since_direction_change:.2f} sec",
-            f"Last Kick: {last_kick_force:.2f} @ {last_kick_angle:.1f}°"
-        ]
-
-        for i, line in enumerate(text_lines):
-            text_surface = font.render(line, True, BLUE)
-            screen.blit(text_surface, (10, 10 + i * 20))
-
-        # Update display
-        pygame.display.flip()
+        hud_changed = False
+        if hud.refresh_due():
+            elapsed_time = current_time - start_time
+            time_since_direction_change = current_time - hexagon.last_direction_change_time
+            velocity_magnitude = np.linalg.norm(ball.vel)
+            velocity_angle = calculate_angle_degrees(ball.vel)
+            hud_changed = hud.update([
+                ("Spin Direction: ", hexagon.spin_direction),
+                ("Ball Velocity: ", f"{velocity_magnitude:.2f} px/frame @ {velocity_angle:.1f}°"),
+                ("Bounce Angle: ", f"{ball.bounce_angle:.1f}°"),
+                ("Total Time: ", f"{elapsed_time:.2f} sec"),
+                ("Direction Change Time: ", f"{time_since_direction_change:.2f} sec"),
+                ("Last Kick: ", f"{ball.last_kick_force:.2f} @ {ball.last_kick_angle:.1f}°"),
+            ])
+        dirty.draw("hud", hud.draw(screen), hud_changed)
+        dirty.draw("profiler", profiler.draw(screen))
+        profiler.lap("hud")
+
+        # Update the parts of the display that changed
+        dirty.end()
+        profiler.lap("flip")
 
         # Cap the frame rate
         clock.tick(FPS)
+        profiler.lap("tick")
 
+    if profiler.enabled:
+        print(profiler.report(), file=sys.stderr)
+    if DIRTY_RECTS:
+        print(dirty.summary(), file=sys.stderr)
     pygame.quit()
     sys.exit()
 
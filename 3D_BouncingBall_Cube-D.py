@@ -38,13 +38,15 @@ import pygame
 import math
 import random
 
-# Initialize Pygame
-pygame.init()
+import numpy as np
+
+from hud import HUD, get_font
+from painter import CubePainter
+from projection import fov_project, rotate_points, rotation_matrix
 
 # Screen dimensions
 WIDTH, HEIGHT = 700, 520
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("DeepThink R1:3D Spinning Glass Cube with Bouncing Ball")
+CAPTION = "DeepThink R1:3D Spinning Glass Cube with Bouncing Ball"
 
 # Colors
 BLACK = (0, 0, 0)
@@ -56,8 +58,10 @@ YELLOW = (255, 255, 0)
 ORANGE = (255, 165, 0)
 GLASS_COLOR = (100, 100, 255, 128)  # Semi-transparent blue for glass effect
 
-# Clock for controlling frame rate
-clock = pygame.time.Clock()
+# Text overlay, fonts are created once
+HUD_REFRESH_HZ = 15  # HUD text updates per second (None = every frame)
+
+# Frame rate
 FPS = 60
 
 # Cube properties
@@ -67,8 +71,6 @@ ROTATION_SPEED = math.radians(0.5)  # Speed of rotation in radians per frame
 
 # Ball properties
 BALL_RADIUS = 20
-ball_pos = [0, 0, 0]  # Ball's position in the cube's local coordinate system
-ball_velocity = [random.uniform(-2, 2), random.uniform(-2, 2), random.uniform(-2, 2)]
 FRICTION = 0.98
 KICK_FORCE_MIN = 2
 KICK_FORCE_MAX = 15  # Increase kick force here, up to 15 without ball escaping the cube.
@@ -82,48 +84,19 @@ PROJECTION_CENTER_X = WIDTH // 2
 PROJECTION_CENTER_Y = HEIGHT // 2
 
 # Timer for controlling spin direction changes
-last_direction_change_time = pygame.time.get_ticks()
 SPIN_DURATION_MIN_MS = 2000   # Spin in one direction between SPIN_DURATION_MIN_MS and SPIN_DURATION_MAZ_MS milliseconds
 SPIN_DURATION_MAX_MS = 10000
 
-# Rotation directions (X=Pitch, Y=Yaw, Z=Roll)
-rotation_direction_x = random.choice([-1, 1])
-rotation_direction_y = random.choice([-1, 1])
-rotation_direction_z = random.choice([-1, 1])
-
-
-def project_point(point):
-    """Project a 3D point onto the screen."""
-    x, y, z = point
-    factor = FOV / (FOV + z) if FOV + z != 0 else FOV / (FOV + 1)
-    projected_x = int(PROJECTION_CENTER_X + x * factor)
-    projected_y = int(PROJECTION_CENTER_Y - y * factor)
-    return projected_x, projected_y
-
-
-def rotate_point_3d(point, angle_x, angle_y, angle_z):
-    """Rotate a point in 3D space around the X, Y, and Z axes."""
-    x, y, z = point
-
-    # Rotate around X-axis (Pitch)
-    cos_x, sin_x = math.cos(angle_x), math.sin(angle_x)
-    y_new = y * cos_x - z * sin_x
-    z_new = y * sin_x + z * cos_x
-
-    # Rotate around Y-axis (Yaw)
-    cos_y, sin_y = math.cos(angle_y), math.sin(angle_y)
-    x_new = x * cos_y + z_new * sin_y
-    z_new = -x * sin_y + z_new * cos_y
-
-    # Rotate around Z-axis (Roll)
-    cos_z, sin_z = math.cos(angle_z), math.sin(angle_z)
-    x_final = x_new * cos_z - y_new * sin_z
-    y_final = x_new * sin_z + y_new * cos_z
 
-    return x_final, y_final, z_new
+def init_display():
+    """Initialize pygame and open the window. Importing this module initializes nothing."""
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption(CAPTION)
+    return screen
 
 
-def get_cube_normals(rotated_vertices):
+def get_cube_normals():
     """Calculate the normal vectors of the cube's faces."""
     normals = []
     # Front and back faces (Z-axis)
@@ -138,9 +111,9 @@ def get_cube_normals(rotated_vertices):
     return normals
 
 
-def handle_ball_collision(ball_pos, ball_velocity, rotated_vertices):
+def handle_ball_collision(ball_pos, ball_velocity):
     """Handle collisions between the ball and the cube walls using face normals."""
-    normals = get_cube_normals(rotated_vertices)
+    normals = get_cube_normals()
     for normal in normals:
         # Calculate the distance from the ball to the face
         distance = abs(ball_pos[0] * normal[0] + ball_pos[1] * normal[1] + ball_pos[2] * normal[2] - CUBE_SIZE / 2)
@@ -181,7 +154,7 @@ def calculate_face_brightness(normal, light_direction):
     return brightness
 
 
-def draw_cube_with_lighting(rotated_vertices, projected_vertices):
+def draw_cube_with_lighting(screen, rotated_vertices, projected_vertices):
     """Draw the cube's edges with lighting."""
     light_direction = [0, 0, -1]  # Light coming from the front
 
@@ -227,99 +200,100 @@ cube_edges = [
     (0, 4), (1, 5), (2, 6), (3, 7)  # Connecting edges between front and back faces
 ]
 
-# Rotation angles for the cube
-angle_x = angle_y = angle_z = math.radians(45)
-
-running = True
-while running:
-    screen.fill(BLACK)
-
-    # 3 lines displaying spin angle, ball velocity, and bounce angle
-    # Calculate ball velocity magnitude
-    font = pygame.font.SysFont("Arial", 20)
-    ball_speed = math.sqrt(ball_velocity[0] ** 2 + ball_velocity[1] ** 2 + ball_velocity[2] ** 2)
-
-    # Determine spin direction
-    spin_direction = f"Spin: {'Clockwise' if rotation_direction_x == 1 else 'Counterclockwise'}"
-
-    # Calculate bounce angle (angle of ball velocity in the XY plane)
-    if ball_velocity[0] != 0 or ball_velocity[1] != 0:
-        bounce_angle = math.degrees(math.atan2(ball_velocity[1], ball_velocity[0]))
-    else:
-        bounce_angle = 0
-
-    # Render text
-    spin_text = font.render(spin_direction, True, YELLOW)
-    velocity_text = font.render(f"Ball Speed: {ball_speed:.2f}", True, YELLOW)
-    bounce_text = font.render(f"Bounce Angle: {bounce_angle:.2f}°", True, YELLOW)
-
-    # Convert radians to degrees for display
-    angle_x_deg = math.degrees(angle_x) % 360
-    angle_y_deg = math.degrees(angle_y) % 360
-    angle_z_deg = math.degrees(angle_z) % 360
-
-    # Determine rotation directions
-    x_direction = "+" if rotation_direction_x > 0 else "-"
-    y_direction = "+" if rotation_direction_y > 0 else "-"
-    z_direction = "+" if rotation_direction_z > 0 else "-"
-
-    # Render rotation text
-    pitch_text = font.render(f"Pitch (X): {x_direction}{angle_x_deg:.2f}°", True, YELLOW)
-    yaw_text = font.render(f"Yaw (Y): {y_direction}{angle_y_deg:.2f}°", True, YELLOW)
-    roll_text = font.render(f"Roll (Z): {z_direction}{angle_z_deg:.2f}°", True, YELLOW)
-
-    # Display rotation text on the screen
-    screen.blit(pitch_text, (10, 10))
-    screen.blit(yaw_text, (10, 40))
-    screen.blit(roll_text, (10, 70))
-    screen.blit(velocity_text, (10, 100))
-    screen.blit(bounce_text, (10, 130))
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-    # Change rotation direction after random SPIN_DURATION_MIN_MS
-    current_time = pygame.time.get_ticks()
-    if current_time - last_direction_change_time > random.randint(SPIN_DURATION_MIN_MS, SPIN_DURATION_MAX_MS):
-        rotation_direction_x *= -1
-        rotation_direction_y *= -1
-        rotation_direction_z *= -1
-        last_direction_change_time = current_time
-
-    # Rotate the cube around its center using current directions
-    angle_x += ROTATION_SPEED * rotation_direction_x
-    angle_y += ROTATION_SPEED * rotation_direction_y
-    angle_z += ROTATION_SPEED * rotation_direction_z
-
-    # Rotate cube vertices in local space to simulate spinning
-    rotated_vertices = [rotate_point_3d(vertex, angle_x, angle_y, angle_z) for vertex in cube_vertices_local]
-    rotated_ball_pos = rotate_point_3d(ball_pos, angle_x, angle_y, angle_z)
-
-    # Project vertices onto the screen for rendering in pseudo-3D space
-    projected_vertices = [project_point(vertex) for vertex in rotated_vertices]
-
-    # Draw cube edges to form the spinning glass cube effect
-    for edge in cube_edges:
-        start_idx, end_idx = edge
-        pygame.draw.line(screen, GLASS_COLOR, projected_vertices[start_idx], projected_vertices[end_idx], width=1)
-
-    # Update ball position based on velocity
-    for i in range(3):
-        ball_pos[i] += ball_velocity[i]
-
-    # handle_ball_collision()
-    handle_ball_collision(ball_pos, ball_velocity, rotated_vertices)
-
-    # Rotate and project the ball's position along with the cube's rotation axes
-    rotated_ball_pos = rotate_point_3d(ball_pos, angle_x, angle_y, angle_z)
-    projected_ball_pos = project_point(rotated_ball_pos)
-
-    # Draw the bouncing ball inside the spinning cube as a red circle on screen
-    pygame.draw.circle(screen, YELLOW, projected_ball_pos, BALL_RADIUS)
-
-    # Update display and control frame rate to maintain smooth animation
-    pygame.display.flip()
-    clock.tick(FPS)
-
-pygame.quit()
+def main():
+    screen = init_display()
+    hud = HUD(get_font("Arial", 20), YELLOW, origin=(10, 10), line_height=30, refresh_hz=HUD_REFRESH_HZ)
+    clock = pygame.time.Clock()
+    painter = CubePainter((), (), cube_edges, GLASS_COLOR)  # Edges and ball, sorted by depth
+
+    # Ball state, in the cube's local coordinate system
+    ball_pos = [0, 0, 0]
+    ball_velocity = [random.uniform(-2, 2), random.uniform(-2, 2), random.uniform(-2, 2)]
+
+    # Timer for controlling spin direction changes
+    last_direction_change_time = pygame.time.get_ticks()
+
+    # Rotation directions (X=Pitch, Y=Yaw, Z=Roll)
+    rotation_direction_x = random.choice([-1, 1])
+    rotation_direction_y = random.choice([-1, 1])
+    rotation_direction_z = random.choice([-1, 1])
+
+    # The eight cube vertices followed by the ball, rotated and projected together each frame
+    scene_points = np.array(cube_vertices_local + [ball_pos], dtype=float)
+
+    # Rotation angles for the cube
+    angle_x = angle_y = angle_z = math.radians(45)
+
+    running = True
+    while running:
+        screen.fill(BLACK)
+
+        # Lines displaying pitch, yaw and roll angles, ball speed and bounce angle
+        if hud.refresh_due():
+            ball_speed = math.sqrt(ball_velocity[0] ** 2 + ball_velocity[1] ** 2 + ball_velocity[2] ** 2)
+
+            # Calculate bounce angle (angle of ball velocity in the XY plane)
+            if ball_velocity[0] != 0 or ball_velocity[1] != 0:
+                bounce_angle = math.degrees(math.atan2(ball_velocity[1], ball_velocity[0]))
+            else:
+                bounce_angle = 0
+
+            # Determine rotation directions
+            x_direction = "+" if rotation_direction_x > 0 else "-"
+            y_direction = "+" if rotation_direction_y > 0 else "-"
+            z_direction = "+" if rotation_direction_z > 0 else "-"
+
+            # Convert radians to degrees for display
+            hud.update([
+                ("Pitch (X): ", f"{x_direction}{math.degrees(angle_x) % 360:.2f}°"),
+                ("Yaw (Y): ", f"{y_direction}{math.degrees(angle_y) % 360:.2f}°"),
+                ("Roll (Z): ", f"{z_direction}{math.degrees(angle_z) % 360:.2f}°"),
+                ("Ball Speed: ", f"{ball_speed:.2f}"),
+                ("Bounce Angle: ", f"{bounce_angle:.2f}°"),
+            ])
+        hud.draw(screen)
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+        # Change rotation direction after random SPIN_DURATION_MIN_MS
+        current_time = pygame.time.get_ticks()
+        if current_time - last_direction_change_time > random.randint(SPIN_DURATION_MIN_MS, SPIN_DURATION_MAX_MS):
+            rotation_direction_x *= -1
+            rotation_direction_y *= -1
+            rotation_direction_z *= -1
+            last_direction_change_time = current_time
+
+        # Rotate the cube around its center using current directions
+        angle_x += ROTATION_SPEED * rotation_direction_x
+        angle_y += ROTATION_SPEED * rotation_direction_y
+        angle_z += ROTATION_SPEED * rotation_direction_z
+
+        # Update ball position based on velocity
+        for i in range(3):
+            ball_pos[i] += ball_velocity[i]
+
+        # handle_ball_collision()
+        handle_ball_collision(ball_pos, ball_velocity)
+
+        # Rotate the cube vertices and the ball together with one composed matrix, then project them
+        scene_points[8] = ball_pos
+        rotated_points = rotate_points(scene_points, rotation_matrix(angle_x, angle_y, angle_z))
+        projected_points, _ = fov_project(rotated_points, FOV, (PROJECTION_CENTER_X, PROJECTION_CENTER_Y))
+
+        # Draw the cube edges and the ball back to front (painter's algorithm), so the edges
+        # in front of the ball are drawn over it
+        painter.cube(rotated_points[:8], projected_points[:8])
+        painter.balls(projected_points[8:], rotated_points[8:, 2], BALL_RADIUS, YELLOW)
+        painter.draw(screen)
+
+        # Update display and control frame rate to maintain smooth animation
+        pygame.display.flip()
+        clock.tick(FPS)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
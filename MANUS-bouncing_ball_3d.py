@@ -5,13 +5,15 @@ import numpy as np
 import random
 import time
 
-# Initialize pygame
-pygame.init()
+from hud import HUD, get_font
+from painter import CubePainter
+from profiling import make_profiler
+from projection import axis_matrices, perspective_project, rotate_points, rotation_matrix
+from state import Ball, Cube
 
 # Screen dimensions
 WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Ball Bouncing in a 3D Cube")
+CAPTION = "Ball Bouncing in a 3D Cube"
 
 # Colors
 WHITE = (255, 255, 255)
@@ -79,181 +81,82 @@ face_colors = [
 
 # Ball properties
 BALL_RADIUS = 15
-ball_pos = np.array([0, 0, 0], dtype=float)  # Center of the cube
-ball_vel = np.array([random.uniform(-2, 2), random.uniform(-2, 2), random.uniform(-2, 2)], dtype=float)
+BALL_START_POS = (0, 0, 0)  # Center of the cube
 
-# Rotation angles
-pitch = 0  # X-axis rotation
-yaw = 0    # Y-axis rotation
-roll = 0   # Z-axis rotation
-
-# Rotation directions
-pitch_direction = 1
-yaw_direction = 1
-roll_direction = 1
-
-# Clock for controlling frame rate
-clock = pygame.time.Clock()
+# Frame rate
 FPS = 60
 
-# Disable audio to prevent ALSA errors
-pygame.mixer.quit()
-
-# Font for text display
-font = pygame.font.SysFont('Arial', 16)
-
-# Tracking variables
-start_time = time.time()
-last_bounce_time = start_time
-last_direction_change_time = start_time
-bounce_angle = 0
-total_bounces = 0
-last_kick_force = 0.0
-last_kick_angle = 0.0
-last_face_hit = "None"
+# Text display
+HUD_REFRESH_HZ = 15  # HUD text updates per second (None = every frame)
 
 # Kick effect visualization
-kick_effect_time = 0
 kick_effect_duration = 15  # frames
 
 # Random direction change settings
 MIN_DIRECTION_CHANGE_TIME = 3.0  # Minimum time between direction changes (seconds)
 MAX_DIRECTION_CHANGE_TIME = 8.0  # Maximum time between direction changes (seconds)
-next_direction_change = start_time + random.uniform(MIN_DIRECTION_CHANGE_TIME, MAX_DIRECTION_CHANGE_TIME)
-
-def rotation_matrix_x(angle):
-    """Return the rotation matrix for rotation around X axis."""
-    cos_a = math.cos(angle)
-    sin_a = math.sin(angle)
-    return np.array([
-        [1, 0, 0],
-        [0, cos_a, -sin_a],
-        [0, sin_a, cos_a]
-    ])
-
-def rotation_matrix_y(angle):
-    """Return the rotation matrix for rotation around Y axis."""
-    cos_a = math.cos(angle)
-    sin_a = math.sin(angle)
-    return np.array([
-        [cos_a, 0, sin_a],
-        [0, 1, 0],
-        [-sin_a, 0, cos_a]
-    ])
-
-def rotation_matrix_z(angle):
-    """Return the rotation matrix for rotation around Z axis."""
-    cos_a = math.cos(angle)
-    sin_a = math.sin(angle)
-    return np.array([
-        [cos_a, -sin_a, 0],
-        [sin_a, cos_a, 0],
-        [0, 0, 1]
-    ])
-
-def project_3d_to_2d(point_3d, z_scale=400):
-    """Project a 3D point to 2D screen coordinates using perspective projection."""
-    # Perspective division (further objects appear smaller)
-    z = max(0.1, point_3d[2] + z_scale)  # Avoid division by zero
-    scale_factor = z_scale / z
-    
-    # Project to 2D and translate to screen center
-    x = point_3d[0] * scale_factor + WIDTH // 2
-    y = point_3d[1] * scale_factor + HEIGHT // 2
-    
-    return (x, y)
 
-def rotate_point(point, rotation_matrices):
-    """Rotate a 3D point using the given rotation matrices."""
-    # Apply all rotation matrices in sequence
-    rotated_point = point.copy()
-    for matrix in rotation_matrices:
-        rotated_point = np.dot(matrix, rotated_point)
-    return rotated_point
 
-def get_rotated_vertices():
+def random_velocity():
+    """A random starting velocity, up to 2 px/frame on each axis."""
+    return [random.uniform(-2, 2), random.uniform(-2, 2), random.uniform(-2, 2)]
+
+
+def new_simulation(start_time):
+    """A fresh ball at the center of a fresh cube, with the first direction change scheduled."""
+    ball = Ball(BALL_START_POS, random_velocity(), BALL_RADIUS, now=start_time)
+    cube = Cube(CUBE_SIZE, now=start_time)
+    cube.next_direction_change = start_time + random.uniform(MIN_DIRECTION_CHANGE_TIME, MAX_DIRECTION_CHANGE_TIME)
+    return ball, cube
+
+
+def init_display():
+    """Initialize pygame and open the window. Importing this module initializes nothing."""
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption(CAPTION)
+
+    # Disable audio to prevent ALSA errors
+    pygame.mixer.quit()
+    return screen
+
+
+def get_rotated_vertices(cube):
     """Get the rotated vertices of the cube."""
-    # Create rotation matrices
-    rot_x = rotation_matrix_x(pitch)
-    rot_y = rotation_matrix_y(yaw)
-    rot_z = rotation_matrix_z(roll)
-    
-    # Apply rotations in order: first pitch, then yaw, then roll
-    rotation_matrices = [rot_x, rot_y, rot_z]
-    
-    # Rotate each vertex
-    rotated_vertices = []
-    for vertex in cube_vertices:
-        rotated_vertex = rotate_point(vertex, rotation_matrices)
-        rotated_vertices.append(rotated_vertex)
-    
-    return np.array(rotated_vertices)
+    # One composed matrix (pitch first, then yaw, then roll) applied to all vertices at once
+    return rotate_points(cube_vertices, rotation_matrix(cube.pitch, cube.yaw, cube.roll))
+
 
 def get_projected_vertices(rotated_vertices):
     """Project the rotated vertices to 2D screen coordinates."""
-    projected_vertices = []
-    for vertex in rotated_vertices:
-        projected_vertex = project_3d_to_2d(vertex)
-        projected_vertices.append(projected_vertex)
-    
-    return projected_vertices
-
-def calculate_face_depths(rotated_vertices):
-    """Calculate the average depth (z-coordinate) of each face."""
-    face_depths = []
-    for face in cube_faces:
-        # Calculate average z-coordinate of the face
-        avg_z = sum(rotated_vertices[i][2] for i in face) / len(face)
-        face_depths.append(avg_z)
-    
-    return face_depths
+    projected_vertices, _ = perspective_project(rotated_vertices, 400, (WIDTH // 2, HEIGHT // 2))
+    return projected_vertices.tolist()
 
-def draw_cube(projected_vertices, face_depths):
-    """Draw the cube with proper depth ordering."""
-    # Sort faces by depth (back to front)
-    sorted_indices = np.argsort(face_depths)
-    
-    # Draw faces from back to front (painter's algorithm)
-    for idx in sorted_indices:
-        face = cube_faces[idx]
-        color = face_colors[idx]
-        
-        # Get the projected vertices for this face
-        face_vertices = [projected_vertices[i] for i in face]
-        
-        # Draw face with semi-transparency
-        face_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        pygame.draw.polygon(face_surface, color, face_vertices)
-        screen.blit(face_surface, (0, 0))
-    
-    # Draw edges
-    for edge in cube_edges:
-        pygame.draw.line(screen, WHITE, projected_vertices[edge[0]], projected_vertices[edge[1]], 1)
 
-def project_ball(ball_pos, z_scale=400):
+def project_ball(ball, z_scale=400):
     """Project the 3D ball position to 2D screen coordinates."""
-    projected_pos = project_3d_to_2d(ball_pos, z_scale)
-    
+    projected_pos, scale_factor = perspective_project(ball.pos[None, :], z_scale, (WIDTH // 2, HEIGHT // 2))
+
     # Scale ball size based on depth
-    z = max(0.1, ball_pos[2] + z_scale)
-    scale_factor = z_scale / z
-    radius = int(BALL_RADIUS * scale_factor)
-    
-    return projected_pos, radius
+    radius = int(ball.radius * scale_factor[0])
 
-def check_cube_collision():
+    return projected_pos[0], radius
+
+
+def check_cube_collision(ball, cube):
     """Check and handle collision between ball and cube faces."""
-    global ball_pos, ball_vel, bounce_angle, last_bounce_time, total_bounces, last_face_hit
+    ball_pos = ball.pos
+    ball_radius = ball.radius
     
     # Half size of the cube
-    half_size = CUBE_SIZE / 2
+    half_size = cube.size / 2
     collision_occurred = False
     
     # Check collision with each face
     face_names = ["Back", "Front", "Bottom", "Top", "Left", "Right"]
     
     # Check X boundaries (left and right faces)
-    if abs(ball_pos[0]) + BALL_RADIUS > half_size:
+    if abs(ball_pos[0]) + ball_radius > half_size:
         # Determine which face was hit
         face_index = 5 if ball_pos[0] > 0 else 4  # 5 = right, 4 = left
         
@@ -261,15 +164,15 @@ def check_cube_collision():
         normal = np.array([-1 if ball_pos[0] > 0 else 1, 0, 0], dtype=float)
         
         # Move ball inside
-        penetration = abs(ball_pos[0]) + BALL_RADIUS - half_size
+        penetration = abs(ball_pos[0]) + ball_radius - half_size
         ball_pos[0] -= penetration * np.sign(ball_pos[0])
         
         # Apply collision response
-        apply_collision_response(normal, face_names[face_index])
+        apply_collision_response(ball, normal, face_names[face_index])
         collision_occurred = True
     
     # Check Y boundaries (top and bottom faces)
-    if abs(ball_pos[1]) + BALL_RADIUS > half_size:
+    if abs(ball_pos[1]) + ball_radius > half_size:
         # Determine which face was hit
         face_index = 3 if ball_pos[1] > 0 else 2  # 3 = top, 2 = bottom
         
@@ -277,15 +180,15 @@ def check_cube_collision():
         normal = np.array([0, -1 if ball_pos[1] > 0 else 1, 0], dtype=float)
         
         # Move ball inside
-        penetration = abs(ball_pos[1]) + BALL_RADIUS - half_size
+        penetration = abs(ball_pos[1]) + ball_radius - half_size
         ball_pos[1] -= penetration * np.sign(ball_pos[1])
         
         # Apply collision response
-        apply_collision_response(normal, face_names[face_index])
+        apply_collision_response(ball, normal, face_names[face_index])
         collision_occurred = True
     
     # Check Z boundaries (front and back faces)
-    if abs(ball_pos[2]) + BALL_RADIUS > half_size:
+    if abs(ball_pos[2]) + ball_radius > half_size:
         # Determine which face was hit
         face_index = 1 if ball_pos[2] > 0 else 0  # 1 = front, 0 = back
         
@@ -293,42 +196,42 @@ def check_cube_collision():
         normal = np.array([0, 0, -1 if ball_pos[2] > 0 else 1], dtype=float)
         
         # Move ball inside
-        penetration = abs(ball_pos[2]) + BALL_RADIUS - half_size
+        penetration = abs(ball_pos[2]) + ball_radius - half_size
         ball_pos[2] -= penetration * np.sign(ball_pos[2])
         
         # Apply collision response
-        apply_collision_response(normal, face_names[face_index])
+        apply_collision_response(ball, normal, face_names[face_index])
         collision_occurred = True
     
     return collision_occurred
 
-def apply_collision_response(normal, face_name):
+
+def apply_collision_response(ball, normal, face_name):
     """Apply collision response including reflection and random kick."""
-    global ball_vel, bounce_angle, last_bounce_time, total_bounces, last_face_hit
+    ball_vel = ball.vel
     
     # Calculate bounce angle
     incoming_velocity = np.linalg.norm(ball_vel)
     dot_product = np.dot(ball_vel, normal)
-    bounce_angle = math.degrees(math.acos(abs(dot_product) / (incoming_velocity * np.linalg.norm(normal))))
+    ball.bounce_angle = math.degrees(math.acos(abs(dot_product) / (incoming_velocity * np.linalg.norm(normal))))
     
     # Reflect velocity
     ball_vel = ball_vel - 2 * np.dot(ball_vel, normal) * normal
     
     # Apply friction
-    ball_vel = ball_vel * FRICTION
+    ball.vel = ball_vel * FRICTION
     
     # Apply random kick
-    apply_random_kick()
+    apply_random_kick(ball)
     
     # Update tracking variables
-    last_bounce_time = time.time()
-    total_bounces += 1
-    last_face_hit = face_name
+    ball.last_bounce_time = time.time()
+    ball.total_bounces += 1
+    ball.last_face_hit = face_name
 
-def apply_random_kick():
+
+def apply_random_kick(ball):
     """Apply a random kick to the ball."""
-    global ball_vel, last_kick_force, last_kick_angle, kick_effect_time
-    
     # Generate random kick force and direction
     kick_force = random.uniform(MIN_KICK_FORCE, MAX_KICK_FORCE)
     
@@ -344,39 +247,40 @@ def apply_random_kick():
     kick_vector = np.array([kick_x, kick_y, kick_z])
     
     # Apply kick to ball velocity
-    ball_vel += kick_vector
+    ball.vel += kick_vector
     
     # Store kick information for display
-    last_kick_force = kick_force
-    last_kick_angle = math.degrees(theta)  # Just store azimuthal angle for display
+    ball.last_kick_force = kick_force
+    ball.last_kick_angle = math.degrees(theta)  # Just store azimuthal angle for display
     
     # Set kick effect visualization timer
-    kick_effect_time = kick_effect_duration
+    ball.kick_effect_time = kick_effect_duration
 
-def toggle_rotation_direction():
+
+def toggle_rotation_direction(cube):
     """Randomly toggle one of the rotation directions."""
-    global pitch_direction, yaw_direction, roll_direction, last_direction_change_time, next_direction_change
-    
     # Choose which rotation to change
     rotation_choice = random.randint(0, 2)
     
     if rotation_choice == 0:
-        pitch_direction *= -1
+        cube.pitch_direction *= -1
     elif rotation_choice == 1:
-        yaw_direction *= -1
+        cube.yaw_direction *= -1
     else:
-        roll_direction *= -1
+        cube.roll_direction *= -1
     
     # Update timing
-    last_direction_change_time = time.time()
-    next_direction_change = last_direction_change_time + random.uniform(MIN_DIRECTION_CHANGE_TIME, MAX_DIRECTION_CHANGE_TIME)
+    cube.last_direction_change_time = time.time()
+    cube.next_direction_change = cube.last_direction_change_time + random.uniform(MIN_DIRECTION_CHANGE_TIME,
+                                                                                  MAX_DIRECTION_CHANGE_TIME)
 
-def enforce_boundary():
+
+def enforce_boundary(ball, cube):
     """Ensure the ball stays inside the cube."""
-    global ball_pos, ball_vel
+    ball_pos = ball.pos
     
     # Half size of the cube
-    half_size = CUBE_SIZE / 2 - BALL_RADIUS
+    half_size = cube.size / 2 - ball.radius
     
     # Clamp ball position to cube boundaries
     ball_pos[0] = np.clip(ball_pos[0], -half_size, half_size)
@@ -384,11 +288,20 @@ def enforce_boundary():
     ball_pos[2] = np.clip(ball_pos[2], -half_size, half_size)
 
 def main():
-    global ball_pos, ball_vel, pitch, yaw, roll, pitch_direction, yaw_direction, roll_direction
-    global next_direction_change, kick_effect_time
+    screen = init_display()
+    clock = pygame.time.Clock()
+    font = get_font('Arial', 16)
+    hud = HUD(font, BLUE, origin=(10, 10), line_height=20, refresh_hz=HUD_REFRESH_HZ)
+    profiler = make_profiler()  # BB_PROFILE=1 times every phase of the loop
+    # Faces, edges and ball sorted by depth together; the ball is blitted from a sprite cache
+    painter = CubePainter(cube_faces, face_colors, cube_edges, WHITE)
+
+    start_time = time.time()
+    ball, cube = new_simulation(start_time)
     
     running = True
     while running:
+        profiler.frame()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -396,95 +309,105 @@ def main():
                 if event.key == pygame.K_ESCAPE:
                     running = False
                 elif event.key == pygame.K_SPACE:
-                    toggle_rotation_direction()
+                    toggle_rotation_direction(cube)
                 elif event.key == pygame.K_r:
                     # Reset ball position to center
-                    ball_pos = np.array([0, 0, 0], dtype=float)
-                    ball_vel = np.array([random.uniform(-2, 2), random.uniform(-2, 2), random.uniform(-2, 2)], dtype=float)
+                    ball.reset(BALL_START_POS, random_velocity())
+                elif event.key == pygame.K_p:
+                    profiler.overlay = not profiler.overlay
         
+        profiler.lap("events")
+
         # Check if it's time for a random direction change
         current_time = time.time()
-        if current_time >= next_direction_change:
-            toggle_rotation_direction()
-        
-        # Clear screen
-        screen.fill(BLACK)
+        if current_time >= cube.next_direction_change:
+            toggle_rotation_direction(cube)
         
+        profiler.lap("spin")
+
         # Update rotation angles
-        pitch += PITCH_SPEED * pitch_direction
-        yaw += YAW_SPEED * yaw_direction
-        roll += ROLL_SPEED * roll_direction
-        
-        # Get rotated and projected cube vertices
-        rotated_vertices = get_rotated_vertices()
-        projected_vertices = get_projected_vertices(rotated_vertices)
-        
-        # Calculate face depths for proper rendering order
-        face_depths = calculate_face_depths(rotated_vertices)
+        cube.pitch += PITCH_SPEED * cube.pitch_direction
+        cube.yaw += YAW_SPEED * cube.yaw_direction
+        cube.roll += ROLL_SPEED * cube.roll_direction
         
         # Apply gravity in the rotated coordinate system
         # Rotate gravity vector according to cube orientation
         gravity_vector = np.array([0, GRAVITY, 0])  # Default gravity is along Y axis
-        rot_x = rotation_matrix_x(pitch)
-        rot_y = rotation_matrix_y(yaw)
-        rot_z = rotation_matrix_z(roll)
-        rotated_gravity = rotate_point(gravity_vector, [rot_z, rot_y, rot_x])  # Apply in reverse order
+        rot_x, rot_y, rot_z = axis_matrices(cube.pitch, cube.yaw, cube.roll)
+        # Apply in reverse order, one matrix at a time: a composed matrix rounds differently
+        rotated_gravity = np.dot(rot_x, np.dot(rot_y, np.dot(rot_z, gravity_vector)))
         
         # Update ball velocity with rotated gravity
-        ball_vel += rotated_gravity
+        ball.vel += rotated_gravity
         
         # Update ball position
-        ball_pos += ball_vel
+        ball.pos += ball.vel
         
+        profiler.lap("physics")
+
         # Check for collision with cube
-        check_cube_collision()
+        check_cube_collision(ball, cube)
         
         # Enforce boundary to keep ball inside
-        enforce_boundary()
+        enforce_boundary(ball, cube)
+
+        profiler.lap("collision")
         
-        # Draw cube
-        draw_cube(projected_vertices, face_depths)
+        # Clear screen
+        screen.fill(BLACK)
         
-        # Project ball to 2D and draw
-        projected_ball_pos, projected_radius = project_ball(ball_pos)
+        # Get rotated and projected cube vertices
+        rotated_vertices = get_rotated_vertices(cube)
+        projected_vertices = get_projected_vertices(rotated_vertices)
         
-        # Draw ball with kick effect
+        # Project ball to 2D
+        projected_ball_pos, projected_radius = project_ball(ball)
+
+        # Ball color with kick effect
         ball_color = RED
-        if kick_effect_time > 0:
+        if ball.kick_effect_time > 0:
             # Flash yellow when kicked
             ball_color = YELLOW
-            kick_effect_time -= 1
-        
-        pygame.draw.circle(screen, ball_color, (int(projected_ball_pos[0]), int(projected_ball_pos[1])), projected_radius)
-        
-        # Calculate current metrics
-        elapsed_time = current_time - start_time
-        time_since_direction_change = current_time - last_direction_change_time
-        velocity_magnitude = np.linalg.norm(ball_vel)
+            ball.kick_effect_time -= 1
+
+        # Draw the cube and the ball back to front (painter's algorithm), so the ball
+        # passes behind the front faces and edges
+        painter.cube(rotated_vertices, projected_vertices)
+        painter.balls([projected_ball_pos], [ball.pos[2]], projected_radius, ball_color)
+        painter.draw(screen)
         
+        profiler.lap("draw")
+
         # Display text information
-        text_lines = [
-            f"Pitch: {math.degrees(pitch):.1f}° ({pitch_direction})",
-            f"Yaw: {math.degrees(yaw):.1f}° ({yaw_direction})",
-            f"Roll: {math.degrees(roll):.1f}° ({roll_direction})",
-            f"Ball Velocity: {velocity_magnitude:.2f}",
-            f"Bounce Angle: {bounce_angle:.1f}°",
-            f"Last Face Hit: {last_face_hit}",
-            f"Total Time: {elapsed_time:.2f} sec",
-            f"Direction Change Time: {time_since_direction_change:.2f} sec",
-            f"Last Kick: {last_kick_force:.2f} @ {last_kick_angle:.1f}°"
-        ]
-        
-        for i, line in enumerate(text_lines):
-            text_surface = font.render(line, True, BLUE)
-            screen.blit(text_surface, (10, 10 + i * 20))
-        
+        if hud.refresh_due():
+            elapsed_time = current_time - start_time
+            time_since_direction_change = current_time - cube.last_direction_change_time
+            velocity_magnitude = np.linalg.norm(ball.vel)
+            hud.update([
+                ("Pitch: ", f"{math.degrees(cube.pitch):.1f}° ({cube.pitch_direction})"),
+                ("Yaw: ", f"{math.degrees(cube.yaw):.1f}° ({cube.yaw_direction})"),
+                ("Roll: ", f"{math.degrees(cube.roll):.1f}° ({cube.roll_direction})"),
+                ("Ball Velocity: ", f"{velocity_magnitude:.2f}"),
+                ("Bounce Angle: ", f"{ball.bounce_angle:.1f}°"),
+                ("Last Face Hit: ", ball.last_face_hit),
+                ("Total Time: ", f"{elapsed_time:.2f} sec"),
+                ("Direction Change Time: ", f"{time_since_direction_change:.2f} sec"),
+                ("Last Kick: ", f"{ball.last_kick_force:.2f} @ {ball.last_kick_angle:.1f}°"),
+            ])
+        hud.draw(screen)
+        profiler.draw(screen)
+        profiler.lap("hud")
+
         # Update display
         pygame.display.flip()
+        profiler.lap("flip")
         
         # Cap the frame rate
         clock.tick(FPS)
+        profiler.lap("tick")
     
+    if profiler.enabled:
+        print(profiler.report(), file=sys.stderr)
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,163 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Before/after benchmark for the cube's semi-transparent faces.
+
+"before" is the original draw_cube: a new full-screen SRCALPHA surface per face per frame.
+"after" is cube_render.FaceRenderer: one reused overlay, blits clipped to each face's rect.
+Both draw the same spinning cube off-screen (no window), the frames are checked to be
+pixel-identical, and the per-frame cost is reported at several resolutions.
+
+The allocations are measured, not estimated. tracemalloc only sees Python's allocator, while SDL
+allocates surface pixels with malloc, so the measuring pass counts two things per frame: the pixel
+bytes of every pygame.Surface created (pygame.Surface is swapped for a counting subclass) and the
+peak Python heap growth under tracemalloc, as in benchmark.py.
+
+    python bench_cube_faces.py
+    python bench_cube_faces.py --frames 600 --sizes 700x520 1920x1080
+"""
+###############################################################################################
+import argparse
+import math
+import os
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from cube_render import FaceRenderer
+
+# Same faces and colors as 3D_BouncingBall_Cube-Manus.py
+cube_faces = [
+    [0, 1, 2, 3],  # back face
+    [4, 5, 6, 7],  # front face
+    [0, 1, 5, 4],  # bottom face
+    [2, 3, 7, 6],  # top face
+    [0, 3, 7, 4],  # left face
+    [1, 2, 6, 5]  # right face
+]
+face_colors = [(128, 0, 128, 50), (0, 255, 255, 50), (255, 0, 0, 50),
+               (0, 255, 0, 50), (0, 100, 255, 50), (255, 255, 0, 50)]
+UNIT_CUBE = np.array([[x, y, z] for z in (-0.5, 0.5) for x, y in
+                      ((-0.5, -0.5), (0.5, -0.5), (0.5, 0.5), (-0.5, 0.5))])
+
+
+def cube_frames(width, height, frames):
+    """Projected vertices and back-to-front face order for a cube spinning on all three axes."""
+    size = 280 * height / 520  # Keep the cube's share of the screen as in the 700x520 scripts
+    result = []
+    for k in range(frames):
+        a = 0.01 * k
+        c, s = math.cos(a), math.sin(a)
+        rot_x = np.array([[1, 0, 0], [0, c, -s], [0, s, c]])
+        rot_y = np.array([[c, 0, s], [0, 1, 0], [-s, 0, c]])
+        rot_z = np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]])
+        rotated = UNIT_CUBE * size @ (rot_z @ rot_y @ rot_x).T
+        scale = 400 / np.maximum(0.1, rotated[:, 2] + 400)
+        projected = [(x, y) for x, y in zip(rotated[:, 0] * scale + width // 2,
+                                            rotated[:, 1] * scale + height // 2)]
+        depths = [rotated[face, 2].mean() for face in cube_faces]
+        result.append((projected, np.argsort(depths)))
+    return result
+
+
+def draw_before(screen, projected, order):
+    """The original draw_cube face loop."""
+    width, height = screen.get_size()
+    for idx in order:
+        face_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.polygon(face_surface, face_colors[idx], [projected[i] for i in cube_faces[idx]])
+        screen.blit(face_surface, (0, 0))
+
+
+def make_draw_after():
+    renderer = FaceRenderer()
+
+    def draw_after(screen, projected, order):
+        for idx in order:
+            renderer.draw(screen, face_colors[idx], [projected[i] for i in cube_faces[idx]])
+
+    return draw_after
+
+
+def time_frames(draw, screen, frames):
+    """Per-frame milliseconds for clearing the screen and drawing the six faces."""
+    times = []
+    for projected, order in frames:
+        start = time.perf_counter()
+        screen.fill((0, 0, 0))
+        draw(screen, projected, order)
+        times.append((time.perf_counter() - start) * 1000)
+    return np.array(times)
+
+
+def allocations(draw, screen, frames):
+    """Measured (surface pixel bytes, peak Python heap bytes) allocated per frame by draw."""
+    surface_class = pygame.Surface
+    created = [0]
+
+    class CountingSurface(surface_class):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            created[0] += self.get_pitch() * self.get_height()
+
+    peaks = np.empty(len(frames))  # Allocated before tracing starts, so it is not counted
+    pygame.Surface = CountingSurface  # cube_render looks it up on the module too
+    tracemalloc.start()
+    try:
+        for i, (projected, order) in enumerate(frames):
+            screen.fill((0, 0, 0))
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            draw(screen, projected, order)
+            peaks[i] = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+        pygame.Surface = surface_class
+    return created[0] / len(frames), float(peaks.mean())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--sizes", nargs="+", default=["700x520", "1280x720", "1920x1080", "2560x1440"])
+    args = parser.parse_args()
+
+    pygame.display.init()
+    print(f"{'':>39} {'surface MB/frame':>17} {'Python heap kB/frame':>21}")
+    print(f"{'size':>10} {'before ms':>10} {'after ms':>9} {'speedup':>8} {'before':>8} {'after':>8} "
+          f"{'before':>10} {'after':>10}")
+    for size in args.sizes:
+        width, height = (int(v) for v in size.split("x"))
+        frames = cube_frames(width, height, args.frames)
+
+        # Same pixels either way
+        before_screen = pygame.Surface((width, height))
+        after_screen = pygame.Surface((width, height))
+        draw_after = make_draw_after()
+        for projected, order in frames[:10]:
+            before_screen.fill((0, 0, 0))
+            after_screen.fill((0, 0, 0))
+            draw_before(before_screen, projected, order)
+            draw_after(after_screen, projected, order)
+            if pygame.image.tobytes(before_screen, "RGB") != pygame.image.tobytes(after_screen, "RGB"):
+                raise SystemExit(f"{size}: FaceRenderer output differs from the original draw_cube")
+
+        before = time_frames(draw_before, before_screen, frames)
+        after = time_frames(draw_after, after_screen, frames)
+        # The "after" overlay was created by the pixel check above: this is the steady state
+        surface_before, heap_before = allocations(draw_before, before_screen, frames[:30])
+        surface_after, heap_after = allocations(draw_after, after_screen, frames[:30])
+        print(f"{size:>10} {np.median(before):10.3f} {np.median(after):9.3f} "
+              f"{np.median(before) / np.median(after):7.1f}x {surface_before / 1e6:8.1f} {surface_after / 1e6:8.1f} "
+              f"{heap_before / 1e3:10.1f} {heap_after / 1e3:10.1f}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Benchmark harness for every simulation variant's physics step and frame drawing.
+
+Each case drives an engine headlessly with a fixed seed and step count:
+    step     sim.step() alone: the script's collision code (check_collision,
+             handle_ball_collision, check_cube_collision, enforce_boundary, ...) as ported to
+             hexagon_sim / cube_sim
+    render   scenes.py drawing one frame onto an off-screen surface (draw_hexagon, draw_cube,
+             draw_cube_with_lighting for "cube:D:lit"), timed apart from the physics;
+             render:crowd draws a whole crowd with scenes.CrowdScene
+    batch    HexagonBatch, where one step moves every ball
+    kernel   kernels.py's flat-buffer Manus engines on their fastest backend (numba if installed)
+    crowd    HexagonCrowd / CubeCrowd, every ball in one container with ball-ball collisions
+
+For every case it reports steps/s, per-step time percentiles (p50/p90/p99/max) and, from a
+second pass under tracemalloc, the peak bytes allocated within a step and the bytes still held
+per step afterwards. A leak shows up as a steady non-zero value; the D hexagon legitimately keeps
+about 2.6 kB per step while its FrameCache fills up with the 720 hexagon angles.
+Results are written as JSON together with the Python/NumPy/pygame versions and the git commit,
+and --compare prints the speed ratio against an earlier file:
+
+    python benchmark.py --json bench.json
+    python benchmark.py --only hexagon:D cube:Manus --compare bench.json
+"""
+###############################################################################################
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from cube_batch import CubeCrowd
+from hexagon_batch import HexagonBatch, HexagonCrowd
+from kernels import KERNEL_ENGINES
+from recording import ENGINES
+from scenes import CrowdScene, make_scene
+
+# name -> (mode, engine kind, variant, scene options; crowd: engine parameters)
+CASES = {
+    "hexagon:D": ("step", "hexagon", "D", {}),
+    "hexagon:G": ("step", "hexagon", "G", {}),
+    "hexagon:Manus": ("step", "hexagon", "Manus", {}),
+    "hexagon:Swept": ("step", "hexagon", "Swept", {}),
+    "cube:D": ("step", "cube", "D", {}),
+    "cube:G": ("step", "cube", "G", {}),
+    "cube:Manus": ("step", "cube", "Manus", {}),
+    "cube:Manus-3d": ("step", "cube", "Manus-3d", {}),
+    "kernel:hexagon:Manus": ("kernel", "hexagon", "Manus", {}),
+    "kernel:cube:Manus": ("kernel", "cube", "Manus", {}),
+    "render:hexagon:D": ("render", "hexagon", "D", {}),
+    "render:hexagon:G": ("render", "hexagon", "G", {}),
+    "render:hexagon:Manus": ("render", "hexagon", "Manus", {}),
+    "render:cube:D": ("render", "cube", "D", {}),
+    "render:cube:D:lit": ("render", "cube", "D", {"lighting": True}),
+    "render:cube:G": ("render", "cube", "G", {}),
+    "render:cube:Manus": ("render", "cube", "Manus", {}),
+    "render:cube:Manus-3d": ("render", "cube", "Manus-3d", {}),
+    "batch:hexagon:1000": ("batch", "hexagon", 1000, {}),
+    "crowd:hexagon:3000": ("crowd", "hexagon", 3000, {"ball_radius": 3}),
+    "crowd:cube:3000": ("crowd", "cube", 3000, {"ball_radius": 5}),
+    "render:crowd:hexagon:3000": ("crowd-render", "hexagon", 3000, {"ball_radius": 3}),
+    "render:crowd:cube:3000": ("crowd-render", "cube", 3000, {"ball_radius": 5}),
+}
+
+
+def _percentiles(samples_ns):
+    samples = np.asarray(samples_ns) / 1e3
+    p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+    return {"p50_us": round(p50, 2), "p90_us": round(p90, 2), "p99_us": round(p99, 2),
+            "max_us": round(samples.max(), 2)}
+
+
+def _make(mode, kind, variant, seed, options):
+    if mode == "batch":
+        return HexagonBatch(variant, seed=seed)
+    if mode == "kernel":
+        return KERNEL_ENGINES[kind](variant, seed=seed)
+    if mode in ("crowd", "crowd-render"):
+        crowd = HexagonCrowd if kind == "hexagon" else CubeCrowd
+        return crowd(variant, seed=seed, **options)
+    return ENGINES[kind](variant, seed=seed)
+
+
+def _timed(mode, sim, steps, scene=None, surface=None):
+    """Per-step wall times (ns) of the part being measured."""
+    clock = time.perf_counter_ns
+    times = []
+    if scene is not None:
+        for _ in range(steps):
+            sim.step()
+            start = clock()
+            scene.draw(surface, sim)
+            times.append(clock() - start)
+    else:
+        step = sim.step
+        for _ in range(steps):
+            start = clock()
+            step()
+            times.append(clock() - start)
+    return times
+
+
+def _allocations(mode, sim, steps, scene=None, surface=None):
+    """(peak bytes allocated inside one step, bytes retained per step) under tracemalloc."""
+    peaks = np.empty(steps)  # Allocated before tracing starts, so it is not counted
+    tracemalloc.start()
+    retained_start = tracemalloc.get_traced_memory()[0]
+    for i in range(steps):
+        if scene is not None:
+            sim.step()
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        if scene is not None:
+            scene.draw(surface, sim)
+        else:
+            sim.step()
+        peaks[i] = tracemalloc.get_traced_memory()[1] - before
+    retained = tracemalloc.get_traced_memory()[0] - retained_start
+    tracemalloc.stop()
+    return float(peaks.mean()), retained / steps
+
+
+def run_case(name, steps=5000, frames=600, seed=0, alloc_steps=500, warmup=100):
+    """Benchmark one case and return its result dict."""
+    mode, kind, variant, options = CASES[name]
+    count = frames if mode in ("render", "crowd-render") else steps
+    sim = _make(mode, kind, variant, seed, options)
+    scene = surface = None
+    if mode == "render":
+        scene = make_scene(kind, variant, sim.params, **options)
+    elif mode == "crowd-render":
+        scene = CrowdScene(sim)
+    if scene is not None:
+        surface = pygame.Surface(scene.size, 0, 32)
+
+    _timed(mode, sim, warmup, scene, surface)  # Caches, font surfaces, CPU frequency
+    times = _timed(mode, sim, count, scene, surface)
+    total = sum(times) / 1e9
+    result = {"case": name, "mode": mode, "seed": seed, "steps": count, "warmup": warmup,
+              "seconds": round(total, 4), "steps_per_s": round(count / total, 1)}
+    if mode in ("batch", "crowd", "crowd-render"):
+        result["ball_steps_per_s"] = round(count * variant / total, 1)
+    result.update(_percentiles(times))
+
+    peak, retained = _allocations(mode, _make(mode, kind, variant, seed, options), min(alloc_steps, count), scene, surface)
+    result["alloc_peak_bytes_per_step"] = round(peak, 1)
+    result["retained_bytes_per_step"] = round(retained, 1)
+    return result
+
+
+def environment():
+    """Versions and commit, stored with every result file."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pygame": pygame.version.ver,
+        "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} CPUs)",
+    }
+
+
+def print_table(results, baseline=None):
+    old = {r["case"]: r for r in baseline["results"]} if baseline else {}
+    print(f"{'case':<24}{'steps/s':>12}{'p50 us':>10}{'p99 us':>10}{'alloc B':>12}{'kept B':>8}"
+          + (f"{'vs base':>9}" if old else ""))
+    for r in results:
+        line = (f"{r['case']:<24}{r['steps_per_s']:>12,.0f}{r['p50_us']:>10.1f}{r['p99_us']:>10.1f}"
+                f"{r['alloc_peak_bytes_per_step']:>12,.0f}{r['retained_bytes_per_step']:>8.1f}")
+        if r["case"] in old:
+            line += f"{r['steps_per_s'] / old[r['case']]['steps_per_s']:>8.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every variant's physics and rendering.")
+    parser.add_argument("--only", nargs="+", choices=sorted(CASES), metavar="CASE",
+                        help="cases to run (default: all): " + ", ".join(CASES))
+    parser.add_argument("--steps", type=int, default=5000, help="physics steps per step/batch case")
+    parser.add_argument("--frames", type=int, default=600, help="frames per render case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="an earlier --json file to compare against")
+    args = parser.parse_args()
+
+    results = [run_case(name, args.steps, args.frames, args.seed) for name in (args.only or CASES)]
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
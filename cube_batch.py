@@ -0,0 +1,215 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Vectorized N-ball version of the spinning-cube simulation (the 3D counterpart of hexagon_batch.py).
+
+CubeBatch holds many independent balls, each in its own spinning cube, as NumPy arrays:
+    pos, vel             (N, 3) float64, in the cube's local frame
+    angles               (N, 3) pitch, yaw, roll in radians
+    directions           (N, 3) +1 / -1 spin direction per axis
+
+The policy is the Manus one (3D_BouncingBall_Cube-Manus.py, CubeSim "Manus"): gravity rotated
+with the cube, check_cube_collision per axis with apply_collision_response and a random 3D kick,
+then the enforce_boundary clamp. rescue=False leaves the clamp out.
+
+gravity, friction, rotation_speed, the spin schedule and the kick range accept a scalar or one
+value per ball, and seed may be a sequence of per-ball seeds, as in HexagonBatch:
+
+    batch = CubeBatch(10_000, seed=range(10_000), kick_force_max=np.linspace(1, 40, 10_000))
+    batch.step(3600)
+
+CubeCrowd puts all the balls into one cube, still in its local frame with the rotated gravity, and
+lets them collide with each other; broadphase.SortAndSweep finds the touching pairs:
+
+    crowd = CubeCrowd(3000, seed=1, ball_radius=5)
+    crowd.step(600)
+"""
+###############################################################################################
+import numpy as np
+
+from broadphase import SortAndSweep, resolve_contacts
+from cube_sim import VARIANTS
+from streams import make_streams
+
+# Parameters that may differ from ball to ball
+PER_BALL = ("gravity", "friction", "rotation_speed", "spin_min", "spin_max",
+            "kick_force_min", "kick_force_max")
+
+
+class CubeBatch:
+    """N balls, each bouncing inside its own spinning cube."""
+
+    def __init__(self, n_balls, seed=None, rescue=True, variant="Manus", **params):
+        if not variant.startswith("Manus"):
+            raise ValueError(f"CubeBatch runs the Manus policy, got variant {variant!r}")
+        settings = dict(VARIANTS[variant])
+        unknown = set(params) - set(settings)
+        if unknown:
+            raise TypeError(f"Unknown {variant} parameter(s): {', '.join(sorted(unknown))}")
+        settings.update(params)
+
+        n = int(n_balls)
+        self.n_balls = n
+        self.variant = variant
+        self.seed = seed
+        self.rescue = rescue
+        self.streams = make_streams(seed, n)
+        for name, value in settings.items():
+            if name in PER_BALL:
+                value = np.broadcast_to(np.asarray(value, dtype=float), (n,)).copy()
+            setattr(self, name, value)
+
+        every = slice(None)
+        self.frame_time = 1 / self.fps
+        self.pos = np.zeros((n, 3))
+        self.vel = np.empty((n, 3))
+        for axis in range(3):
+            self.vel[:, axis] = self.streams.uniform(every, np.full(n, -2.0), np.full(n, 2.0))
+        self.angles = np.full((n, 3), float(self.initial_angle))
+        self.directions = np.ones((n, 3))
+        self.next_direction_change = self.streams.uniform(every, self.spin_min, self.spin_max)
+        self.bounces = np.zeros(n, dtype=np.int64)
+        self.rescues = np.zeros(n, dtype=np.int64)  # Balls enforce_boundary had to move
+        self.step_count = 0
+
+    @property
+    def time(self):
+        """Seconds of simulated time."""
+        return self.step_count * self.frame_time
+
+    # ---------------------------------------------------------------------------------------
+    def step(self, n=1):
+        """Advance every ball by n frames."""
+        for _ in range(n):
+            self._spin()
+            self._integrate()
+            self._check_collisions()
+            if self.rescue:
+                self._enforce_boundary()
+            self.step_count += 1
+
+    def _spin(self):
+        """toggle_rotation_direction() where it is due, then rotate every cube."""
+        now = self.time
+        due = np.nonzero(now >= self.next_direction_change)[0]
+        if due.size:
+            axis = self.streams.integers(due, np.zeros(due.size), np.full(due.size, 2))
+            self.directions[due, axis] *= -1
+            self.next_direction_change[due] = now + self.streams.uniform(due, self.spin_min[due],
+                                                                         self.spin_max[due])
+        self.angles += self.rotation_speed[:, None] * self.directions
+
+    def _integrate(self):
+        """Gravity rotated into the cube's frame (rot_x @ rot_y @ rot_z @ [0, g, 0]), then move."""
+        sx, sy, sz = np.sin(self.angles).T
+        cx, cy, cz = np.cos(self.angles).T
+        g = self.gravity
+        vel = self.vel
+        vel[:, 0] -= cy * sz * g
+        vel[:, 1] += (cx * cz - sx * sy * sz) * g
+        vel[:, 2] += (sx * cz + cx * sy * sz) * g
+        self.pos += vel
+
+    def _check_collisions(self):
+        """Vectorized check_cube_collision(): one axis at a time, as the script does."""
+        limit = self.cube_size / 2 - self.ball_radius
+        for axis in range(3):
+            hit = np.nonzero(np.abs(self.pos[:, axis]) > limit)[0]
+            if hit.size == 0:
+                continue
+            side = np.sign(self.pos[hit, axis])
+            self.pos[hit, axis] = side * limit
+
+            # Reflect off the face (inward normal -side on this axis), friction, then the kick
+            vel = self.vel[hit]
+            vel[:, axis] *= -1
+            vel *= self.friction[hit, None]
+            kick_force = self.streams.uniform(hit, self.kick_force_min[hit], self.kick_force_max[hit])
+            theta = self.streams.uniform(hit, np.zeros(hit.size), np.full(hit.size, 2 * np.pi))
+            phi = self.streams.uniform(hit, np.zeros(hit.size), np.full(hit.size, np.pi))
+            vel[:, 0] += kick_force * np.sin(phi) * np.cos(theta)
+            vel[:, 1] += kick_force * np.sin(phi) * np.sin(theta)
+            vel[:, 2] += kick_force * np.cos(phi)
+            self.vel[hit] = vel
+            self.bounces[hit] += 1
+
+    def _enforce_boundary(self):
+        """enforce_boundary(): clamp the center to the cube minus the ball radius."""
+        limit = self.cube_size / 2 - self.ball_radius
+        outside = (np.abs(self.pos) > limit).any(axis=1)
+        if outside.any():
+            np.clip(self.pos, -limit, limit, out=self.pos)
+            self.rescues[outside] += 1
+
+    # ---------------------------------------------------------------------------------------
+    def overlap(self):
+        """Per-ball CubeSim.overlap(): pixels past the nearest face, <= 0 while fully inside."""
+        return np.abs(self.pos).max(axis=1) - (self.cube_size / 2 - self.ball_radius)
+
+    def kinetic_energy(self):
+        """Per-ball kinetic energy (unit mass), in px^2/frame^2."""
+        return 0.5 * np.einsum("ij,ij->i", self.vel, self.vel)
+
+
+class CubeCrowd(CubeBatch):
+    """N balls sharing one spinning cube, colliding with the faces and with each other.
+
+    Ball-ball contacts are resolved by broadphase.resolve_contacts after check_cube_collision,
+    with the balls clamped inside the cube between its iterations.
+    """
+
+    def __init__(self, n_balls, seed=None, rescue=True, variant="Manus", restitution=1.0, **params):
+        if np.ndim(seed) != 0:
+            raise ValueError("The balls of a CubeCrowd share one cube and one seed")
+        super().__init__(n_balls, seed, rescue, variant, **params)
+        self.restitution = restitution
+        self.next_direction_change[:] = self.next_direction_change[0]  # One cube, one spin schedule
+        self.pos[:] = self._lattice(self.n_balls)
+        self.sweep = SortAndSweep(self.n_balls)
+        self.contacts = 0  # Ball-ball contacts resolved so far
+
+    def _lattice(self, n):
+        """n non-overlapping starting positions on a cubic lattice, closest to the center first."""
+        spacing = 2.05 * self.ball_radius
+        limit = self.cube_size / 2 - self.ball_radius
+        side = int(limit // spacing)
+        if (2 * side + 1) ** 3 < n:
+            raise ValueError(f"Only {(2 * side + 1) ** 3} balls of radius {self.ball_radius} fit into the cube")
+        points = np.mgrid[-side:side + 1, -side:side + 1, -side:side + 1].reshape(3, -1).T * spacing
+        order = np.argsort(np.einsum("ij,ij->i", points, points), kind="stable")
+        return points[order[:n]]
+
+    # ---------------------------------------------------------------------------------------
+    def step(self, n=1):
+        """Advance every ball by n frames."""
+        for _ in range(n):
+            self._spin()
+            self._integrate()
+            self._check_collisions()
+            self._collide_balls()  # After the faces, which would pile the balls they stop onto each other
+            if self.rescue:
+                self._enforce_boundary()
+            self.step_count += 1
+
+    def _spin(self):
+        """toggle_rotation_direction() for the one cube, then rotate it."""
+        now = self.time
+        if now >= self.next_direction_change[0]:
+            first = np.array([0])
+            axis = int(self.streams.integers(first, np.zeros(1), np.full(1, 2))[0])
+            self.directions[:, axis] *= -1
+            self.next_direction_change[:] = now + self.streams.uniform(first, self.spin_min[:1], self.spin_max[:1])
+        self.angles += self.rotation_speed[:, None] * self.directions
+
+    def _collide_balls(self):
+        """Resolve every pair of touching balls found by the sweep."""
+        diameter = 2 * self.ball_radius
+        i, j = self.sweep.pairs(self.pos, diameter)
+        self.contacts += resolve_contacts(self.pos, self.vel, i, j, diameter, self.restitution, constrain=self._inside)
+
+    def _inside(self, pos):
+        """Clamp the centers in pos to the cube minus the ball radius."""
+        limit = self.cube_size / 2 - self.ball_radius
+        np.clip(pos, -limit, limit, out=pos)
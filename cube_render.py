@@ -0,0 +1,37 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Semi-transparent face drawing for the 3D cube scripts.
+
+draw_cube used to allocate a new full-screen pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA) for
+each of the six faces on every frame, draw one polygon on it and alpha-blit the whole screen.
+FaceRenderer keeps a single overlay the size of the target surface and only touches the rectangle
+the polygon actually covers:
+    1. draw the polygon on the overlay (pygame returns its bounding rect)
+    2. alpha-blit just that rect onto the screen
+    3. clear that rect back to transparent for the next face
+Pixels outside the polygon were fully transparent in the old overlay, so the result is identical.
+"""
+###############################################################################################
+import pygame
+
+TRANSPARENT = (0, 0, 0, 0)
+
+
+class FaceRenderer:
+    """Draws semi-transparent polygons through one reusable SRCALPHA overlay."""
+
+    def __init__(self):
+        self.overlay = None
+
+    def draw(self, surface, color, points):
+        """Alpha-blend a filled polygon onto surface. Returns the rect that was touched."""
+        overlay = self.overlay
+        if overlay is None or overlay.get_size() != surface.get_size():
+            overlay = self.overlay = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+        rect = pygame.draw.polygon(overlay, color, points)
+        surface.blit(overlay, rect, rect)
+        overlay.fill(TRANSPARENT, rect)
+        return rect
@@ -0,0 +1,386 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Headless, fixed-step engine for the spinning-cube scripts (the 3D counterpart of hexagon_sim.py).
+
+    sim = CubeSim("Manus", seed=42)
+    sim.step(10_000)
+
+Each variant follows its script's physics operation for operation, so a seeded run matches the
+original loop bit-for-bit:
+    "D"        -> 3D_BouncingBall_Cube-D.py      (handle_ball_collision with face normals + clamp)
+    "G"        -> 3D_BouncingBall_Cube-G.py      (per-axis handle_ball_collision)
+    "Manus"    -> 3D_BouncingBall_Cube-Manus.py  (rotated gravity, check_cube_collision,
+                                                  apply_collision_response, enforce_boundary)
+    "Manus-3d" -> MANUS-bouncing_ball_3d.py      (same code as Manus, 800x600 and gentler kicks)
+
+The ball lives in the cube's local frame. pitch/yaw/roll are the cube's rotation angles in radians;
+the D and G scripts call them angle_x/angle_y/angle_z.
+Wall-clock timers (pygame.time.get_ticks, time.time) are replaced by a fixed frame time of 1/fps.
+telemetry=BounceLog(...) (telemetry.py) records every face contact, as in HexagonSim.
+"""
+###############################################################################################
+import math
+import random
+
+import numpy as np
+
+from projection import axis_matrices
+
+_MANUS = {
+    "width": 700, "height": 520, "fps": 60,
+    "cube_size": 280,
+    "ball_radius": 20,
+    "gravity": 0.05,
+    "friction": 0.98,
+    "rotation_speed": 0.01,  # Radians per frame, on each axis
+    "initial_angle": 0.0,
+    "kick_force_min": 0.4, "kick_force_max": 15.0,
+    "spin_min": 3.0, "spin_max": 10.0,  # Seconds between direction changes
+    "kick_effect_duration": 15,  # Frames
+}
+
+# Script defaults
+VARIANTS = {
+    "D": {
+        "width": 700, "height": 520, "fps": 60,
+        "cube_size": 280,
+        "ball_radius": 20,
+        "friction": 0.98,
+        "rotation_speed": math.radians(0.5),  # Radians per frame, on each axis
+        "initial_angle": math.radians(45),
+        "kick_force_min": 2, "kick_force_max": 15,
+        "max_velocity": 20,
+        "spin_min": 2000, "spin_max": 10000,  # Milliseconds
+    },
+    "G": {
+        "width": 700, "height": 520, "fps": 60,
+        "cube_size": 280,
+        "ball_radius": 20,
+        "friction": 0.98,
+        "rotation_speed": math.radians(0.5),
+        "initial_angle": math.radians(45),
+        "kick_force_min": 2, "kick_force_max": 7,
+        "spin_min": 2000, "spin_max": 10000,
+    },
+    "Manus": _MANUS,
+    "Manus-3d": dict(_MANUS, width=800, height=600, cube_size=300, ball_radius=15,
+                     kick_force_min=0.5, kick_force_max=2.0, spin_max=8.0),
+}
+
+FACE_NAMES = ["Back", "Front", "Bottom", "Top", "Left", "Right"]
+
+
+class CubeSim:
+    """One ball bouncing inside a spinning cube, stepped without a display."""
+
+    kind = "cube"
+
+    def __init__(self, variant="Manus", seed=None, telemetry=None, **params):
+        if variant not in VARIANTS:
+            raise ValueError(f"Unknown cube variant {variant!r}, expected one of {sorted(VARIANTS)}")
+        settings = dict(VARIANTS[variant])
+        unknown = set(params) - set(settings)
+        if unknown:
+            raise TypeError(f"Unknown {variant} parameter(s): {', '.join(sorted(unknown))}")
+        settings.update(params)
+
+        self.variant = variant
+        self.seed = seed
+        self.params = settings
+        self.rng = random.Random(seed)
+        self.telemetry = telemetry  # A telemetry.BounceLog, or None
+        for name, value in settings.items():
+            setattr(self, name, value)
+
+        self.frame_time = 1 / self.fps
+        self.step_count = 0
+        self.time = 0.0  # Seconds of simulated time
+        self.direction_change_time = 0.0  # Seconds since the last direction change
+        self.pitch = self.yaw = self.roll = self.initial_angle
+        self.bounce_angle = 0.0
+        self.total_bounces = 0
+        self.last_face_hit = "None"
+        self.last_kick_force = 0.0
+        self.last_kick_angle = 0.0
+        self.kick_effect_time = 0
+        self.kick_flash = False  # True on frames the Manus script draws the ball yellow
+
+        # Draw the initial random values in the same order the scripts do at import time
+        rng = self.rng
+        ball_vel = [rng.uniform(-2, 2), rng.uniform(-2, 2), rng.uniform(-2, 2)]
+        if variant.startswith("Manus"):
+            self.ball_pos = np.array([0, 0, 0], dtype=float)
+            self.ball_vel = np.array(ball_vel, dtype=float)
+            self.directions = [1, 1, 1]
+            self.next_direction_change = self.time + rng.uniform(self.spin_min, self.spin_max)
+            self._step = self._step_manus
+        else:
+            self.ball_pos = [0, 0, 0]
+            self.ball_vel = ball_vel
+            self.directions = [rng.choice([-1, 1]), rng.choice([-1, 1]), rng.choice([-1, 1])]
+            self.last_direction_change_ms = 0
+            self._step = self._step_d if variant == "D" else self._step_g
+
+    # ---------------------------------------------------------------------------------------
+    @property
+    def angles(self):
+        """(pitch, yaw, roll) in radians."""
+        return self.pitch, self.yaw, self.roll
+
+    def overlap(self):
+        """How far (pixels) the ball reaches past the nearest face; <= 0 while it is fully inside.
+
+        The ball lives in the cube's local frame, so the faces are axis aligned there.
+        Above ball_radius the ball's center has left the cube.
+        """
+        reach = max(abs(float(p)) for p in self.ball_pos)
+        return reach - (self.cube_size / 2 - self.ball_radius)
+
+    def step(self, n=1):
+        """Advance the simulation by n frames."""
+        step = self._step
+        for _ in range(n):
+            step()
+
+    def _rotate(self):
+        directions = self.directions
+        speed = self.rotation_speed
+        self.pitch += speed * directions[0]
+        self.yaw += speed * directions[1]
+        self.roll += speed * directions[2]
+
+    def _ticks(self):
+        """pygame.time.get_ticks() equivalent: whole milliseconds of simulated time."""
+        return int(self.time * 1000)
+
+    # ---------------------------------------------------------------------------------------
+    def _step_d(self):
+        """One frame of 3D_BouncingBall_Cube-D.py."""
+        # The script draws a fresh random duration every frame
+        current_time = self._ticks()
+        if current_time - self.last_direction_change_ms > self.rng.randint(self.spin_min, self.spin_max):
+            self.directions = [-d for d in self.directions]
+            self.last_direction_change_ms = current_time
+            self.direction_change_time = 0.0
+        self._rotate()
+
+        ball_pos = self.ball_pos
+        ball_vel = self.ball_vel
+        for i in range(3):
+            ball_pos[i] += ball_vel[i]
+        self._handle_collision_d(ball_pos, ball_vel)
+        self._finish_frame()
+
+    def _handle_collision_d(self, ball_pos, ball_velocity):
+        """handle_ball_collision() from the D script."""
+        half = self.cube_size / 2
+        radius = self.ball_radius
+        rng = self.rng
+        max_velocity = self.max_velocity
+        friction = self.friction
+        for face, normal in enumerate(_D_NORMALS):
+            distance = abs(ball_pos[0] * normal[0] + ball_pos[1] * normal[1] + ball_pos[2] * normal[2] - half)
+            if distance < radius:
+                velocity_in = (ball_velocity[0], ball_velocity[1], ball_velocity[2])
+
+                # Reflect the ball's velocity off the face
+                dot_product = ball_velocity[0] * normal[0] + ball_velocity[1] * normal[1] + ball_velocity[2] * normal[2]
+                ball_velocity[0] -= 2 * dot_product * normal[0]
+                ball_velocity[1] -= 2 * dot_product * normal[1]
+                ball_velocity[2] -= 2 * dot_product * normal[2]
+
+                # Add a random kick force
+                kick_force = rng.uniform(self.kick_force_min, self.kick_force_max)
+                kick_angle_xy = rng.uniform(0, math.pi * 2)
+                kick_x = math.cos(kick_angle_xy) * kick_force
+                kick_y = math.sin(kick_angle_xy) * kick_force
+                ball_velocity[0] += kick_x
+                ball_velocity[1] += kick_y
+                kick_z = rng.uniform(-1, 1) * kick_force
+                ball_velocity[2] += kick_z
+
+                for i in range(3):
+                    ball_velocity[i] = max(-max_velocity, min(max_velocity, ball_velocity[i]))
+                for i in range(3):
+                    ball_velocity[i] *= friction
+
+                # Correct position to ensure it doesn't "tunnel" through walls
+                for i in range(3):
+                    if ball_pos[i] > half - radius:
+                        ball_pos[i] = half - radius
+                    if ball_pos[i] < -half + radius:
+                        ball_pos[i] = -half + radius
+
+                self.last_kick_force = kick_force
+                self.last_kick_angle = math.degrees(kick_angle_xy)
+                self.last_face_hit = _D_FACE_NAMES[face]
+                self.total_bounces += 1
+                if self.telemetry is not None:
+                    # _D_NORMALS point out of the cube; telemetry reports the inward normal
+                    self.telemetry.bounce(self.step_count, self.last_face_hit, velocity_in,
+                                          (-normal[0], -normal[1], -normal[2]),
+                                          (kick_x, kick_y, kick_z), tuple(ball_velocity))
+
+    # ---------------------------------------------------------------------------------------
+    def _step_g(self):
+        """One frame of 3D_BouncingBall_Cube-G.py."""
+        current_time = self._ticks()
+        if current_time - self.last_direction_change_ms > self.rng.randint(self.spin_min, self.spin_max):
+            # The G script only reverses pitch and yaw
+            self.directions = [-self.directions[0], -self.directions[1], self.directions[2]]
+            self.last_direction_change_ms = current_time
+            self.direction_change_time = 0.0
+        self._rotate()
+
+        ball_pos = self.ball_pos
+        for i in range(3):
+            ball_pos[i] += self.ball_vel[i]
+        self._handle_collision_g(ball_pos, self.ball_vel)
+        self._finish_frame()
+
+    def _handle_collision_g(self, ball_pos, ball_velocity):
+        """handle_ball_collision() from the G script."""
+        half = self.cube_size / 2
+        radius = self.ball_radius
+        rng = self.rng
+        for i in range(3):
+            if abs(ball_pos[i]) + radius > half:
+                velocity_in = (ball_velocity[0], ball_velocity[1], ball_velocity[2])
+                kick_force = rng.uniform(self.kick_force_min, self.kick_force_max)
+                kick_angle_xy = rng.uniform(0, math.pi * 2)
+                kick_cos = math.cos(kick_angle_xy) * kick_force
+                kick_sin = math.sin(kick_angle_xy) * kick_force
+
+                if i == 0:  # X-axis collision
+                    ball_velocity[0] *= -1
+                    ball_velocity[1] += kick_sin
+                    ball_velocity[2] += kick_cos
+                    kick = (0.0, kick_sin, kick_cos)
+                elif i == 1:  # Y-axis collision
+                    ball_velocity[1] *= -1
+                    ball_velocity[0] += kick_cos
+                    ball_velocity[2] += kick_sin
+                    kick = (kick_cos, 0.0, kick_sin)
+                else:  # Z-axis collision
+                    ball_velocity[2] *= -1
+                    ball_velocity[0] += kick_cos
+                    ball_velocity[1] += kick_sin
+                    kick = (kick_cos, kick_sin, 0.0)
+
+                for j in range(3):
+                    ball_velocity[j] *= self.friction
+
+                self.last_face_hit = FACE_NAMES[2 * _AXIS_FACE_PAIR[i] + (ball_pos[i] > 0)]
+                ball_pos[i] = math.copysign(half - radius - 1e-3, ball_pos[i])
+                self.last_kick_force = kick_force
+                self.last_kick_angle = math.degrees(kick_angle_xy)
+                self.total_bounces += 1
+                if self.telemetry is not None:
+                    normal = [0.0, 0.0, 0.0]
+                    normal[i] = -math.copysign(1.0, ball_pos[i])  # Inward
+                    self.telemetry.bounce(self.step_count, self.last_face_hit, velocity_in, normal, kick,
+                                          tuple(ball_velocity))
+
+    # ---------------------------------------------------------------------------------------
+    def _step_manus(self):
+        """One frame of 3D_BouncingBall_Cube-Manus.py / MANUS-bouncing_ball_3d.py."""
+        current_time = self.time
+        if current_time >= self.next_direction_change:
+            self._toggle_rotation_manus(current_time)
+        self._rotate()
+
+        # Gravity rotates with the cube: Z, then Y, then X, one matrix at a time as the scripts do.
+        # rot_x @ rot_y @ rot_z composed first rounds differently and the seeded run drifts away.
+        rot_x, rot_y, rot_z = axis_matrices(self.pitch, self.yaw, self.roll)
+        rotated_gravity = np.dot(rot_x, np.dot(rot_y, np.dot(rot_z, np.array([0, self.gravity, 0]))))
+        self.ball_vel += rotated_gravity
+        self.ball_pos += self.ball_vel
+
+        self._check_collision_manus()
+
+        # enforce_boundary()
+        half_size = self.cube_size / 2 - self.ball_radius
+        ball_pos = self.ball_pos
+        ball_pos[0] = np.clip(ball_pos[0], -half_size, half_size)
+        ball_pos[1] = np.clip(ball_pos[1], -half_size, half_size)
+        ball_pos[2] = np.clip(ball_pos[2], -half_size, half_size)
+
+        # The script counts the kick flash down while drawing
+        self.kick_flash = self.kick_effect_time > 0
+        if self.kick_flash:
+            self.kick_effect_time -= 1
+        self._finish_frame()
+
+    def _toggle_rotation_manus(self, current_time):
+        """toggle_rotation_direction() from the Manus script."""
+        self.directions[self.rng.randint(0, 2)] *= -1
+        self.direction_change_time = 0.0
+        self.next_direction_change = current_time + self.rng.uniform(self.spin_min, self.spin_max)
+
+    def _check_collision_manus(self):
+        """check_cube_collision() from the Manus script."""
+        half_size = self.cube_size / 2
+        ball_pos = self.ball_pos
+        for axis in range(3):
+            if abs(ball_pos[axis]) + self.ball_radius > half_size:
+                # Face index: 5 = right / 4 = left, 3 = top / 2 = bottom, 1 = front / 0 = back
+                face_index = 2 * _AXIS_FACE_PAIR[axis] + (1 if ball_pos[axis] > 0 else 0)
+
+                # Normal vector pointing inward
+                normal = np.zeros(3)
+                normal[axis] = -1 if ball_pos[axis] > 0 else 1
+
+                # Move ball inside
+                penetration = abs(ball_pos[axis]) + self.ball_radius - half_size
+                ball_pos[axis] -= penetration * np.sign(ball_pos[axis])
+
+                self._collision_response_manus(normal, FACE_NAMES[face_index])
+
+    def _collision_response_manus(self, normal, face_name):
+        """apply_collision_response() and apply_random_kick() from the Manus script."""
+        velocity_in = self.ball_vel.tolist()
+        incoming_velocity = np.linalg.norm(self.ball_vel)
+        dot_product = np.dot(self.ball_vel, normal)
+        self.bounce_angle = math.degrees(math.acos(abs(dot_product) / (incoming_velocity * np.linalg.norm(normal))))
+
+        # Reflect velocity, apply friction
+        self.ball_vel = self.ball_vel - 2 * np.dot(self.ball_vel, normal) * normal
+        self.ball_vel = self.ball_vel * self.friction
+
+        # Random kick in a random 3D direction
+        kick_force = self.rng.uniform(self.kick_force_min, self.kick_force_max)
+        theta = self.rng.uniform(0, math.pi * 2)  # Azimuthal angle
+        phi = self.rng.uniform(0, math.pi)  # Polar angle
+        kick = np.array([kick_force * math.sin(phi) * math.cos(theta),
+                         kick_force * math.sin(phi) * math.sin(theta),
+                         kick_force * math.cos(phi)])
+        self.ball_vel += kick
+        self.last_kick_force = kick_force
+        self.last_kick_angle = math.degrees(theta)
+        self.kick_effect_time = self.kick_effect_duration
+        self.total_bounces += 1
+        self.last_face_hit = face_name
+        if self.telemetry is not None:
+            self.telemetry.bounce(self.step_count, face_name, velocity_in, normal.tolist(), kick.tolist(),
+                                  self.ball_vel.tolist())
+
+    # ---------------------------------------------------------------------------------------
+    def _finish_frame(self):
+        self.step_count += 1
+        self.time += self.frame_time
+        self.direction_change_time += self.frame_time
+        if self.variant in ("D", "G"):
+            # What the D/G HUD shows: angle of the velocity in the XY plane
+            vx, vy = self.ball_vel[0], self.ball_vel[1]
+            self.bounce_angle = math.degrees(math.atan2(vy, vx)) if vx != 0 or vy != 0 else 0
+
+
+# Face order of get_cube_normals() in the D script
+_D_NORMALS = [[0, 0, 1], [0, 0, -1], [-1, 0, 0], [1, 0, 0], [0, 1, 0], [0, -1, 0]]
+_D_FACE_NAMES = ["Front", "Back", "Left", "Right", "Top", "Bottom"]
+
+# FACE_NAMES holds (negative, positive) face pairs: Z at 0, Y at 2, X at 4
+_AXIS_FACE_PAIR = [2, 1, 0]
@@ -0,0 +1,149 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Dirty-rectangle rendering for the 2D hexagon scripts: push only the pixels that changed.
+
+Every frame the scripts clear the whole 700x520 window and flip all of it to the display, although
+only the ball, the hexagon outline and now and then the HUD text change. DirtyRects replaces the
+clear and the flip:
+
+    dirty = DirtyRects(screen, BLACK)
+    while running:
+        dirty.begin()                                         # instead of screen.fill(BLACK)
+        pygame.draw.polygon(screen, WHITE, points, 5)
+        dirty.draw("hexagon", outline_rects(points, 5))
+        dirty.draw("ball", pygame.draw.circle(screen, BLUE, center, 20))
+        dirty.draw("hud", hud.draw(screen), changed=hud_changed)
+        dirty.end()                                           # instead of pygame.display.flip()
+
+begin() erases the rectangles the items covered last frame; end() pushes last frame's and this
+frame's rectangles of every item that changed with pygame.display.update(rects). An item drawn
+with changed=False (the HUD between two refreshes) is erased and redrawn but not pushed: its
+pixels on the display are already right.
+
+The outline's bounding box covers most of the window, so outline_rects() splits every wall into
+short pieces and returns one small box per piece.
+
+pixels is the number of pixels pushed by the last end(), and summary() gives the average over the
+run. With enabled=False, begin() and end() fill and flip the whole window as before.
+"""
+###############################################################################################
+import math
+
+import pygame
+
+
+class DirtyRects:
+    """Erase-and-push bookkeeping for pygame.display.update(rects)."""
+
+    def __init__(self, surface, background=(0, 0, 0), enabled=True):
+        self.surface = surface
+        self.background = background
+        self.enabled = enabled
+        self.bounds = surface.get_rect()
+        self.frames = 0
+        self.pixels = 0  # Pushed by the last end()
+        self.total_pixels = 0
+        self._last = {}  # Item -> rects it covered last frame, erased by begin()
+        self._now = {}
+        self._changed = set()
+        self._full = True  # The next end() pushes the whole window
+
+    def invalidate(self):
+        """Push the whole window at the next end() (after the window was exposed, say)."""
+        self._full = True
+
+    def begin(self):
+        """Erase last frame's items (the whole window when disabled)."""
+        if not self.enabled:
+            self.surface.fill(self.background)
+            return
+        fill = self.surface.fill
+        background = self.background
+        for rects in self._last.values():
+            for rect in rects:
+                fill(background, rect)
+
+    def draw(self, item, rects, changed=True):
+        """Record the rect (or list of rects) item covers this frame. None records nothing.
+
+        changed=False: the item has the same pixels as last frame, so it needs no push.
+        """
+        if rects is None:
+            return
+        self._now[item] = [rects] if isinstance(rects, pygame.Rect) else list(rects)
+        if changed:
+            self._changed.add(item)
+
+    def end(self):
+        """Push what changed to the display."""
+        if not self.enabled or self._full:
+            pygame.display.flip()
+            pushed = self.bounds.width * self.bounds.height
+            self._full = False
+        else:
+            rects = []
+            for item, old in self._last.items():
+                if item not in self._now:
+                    rects.extend(old)  # Gone this frame: only the erased area changed
+            for item in self._changed:
+                rects.extend(_pair_up(self._last.get(item, ()), self._now[item]))
+            bounds = self.bounds
+            rects = [rect.clip(bounds) for rect in rects]
+            rects = [rect for rect in rects if rect.width and rect.height]
+            pygame.display.update(rects)
+            pushed = sum(rect.width * rect.height for rect in rects)
+        self.pixels = pushed
+        self.total_pixels += pushed
+        self.frames += 1
+        self._last, self._now = self._now, {}
+        self._changed = set()
+
+    def summary(self):
+        """One line: average pixels pushed per frame, and the share of the window."""
+        if not self.frames:
+            return "No frames pushed"
+        window = self.bounds.width * self.bounds.height
+        average = self.total_pixels / self.frames
+        return (f"{average:,.0f} pixels pushed per frame on average over {self.frames} frames, "
+                f"{100 * average / window:.1f}% of the {self.bounds.width}x{self.bounds.height} window")
+
+
+def _pair_up(old, new):
+    """Last frame's and this frame's rects of one item, the i-th old and new merged when they overlap."""
+    rects = []
+    for i, rect in enumerate(new):
+        if i < len(old) and rect.colliderect(old[i]):
+            rects.append(rect.union(old[i]))
+        else:
+            rects.append(rect)
+            if i < len(old):
+                rects.append(old[i])
+    rects.extend(old[len(new):])
+    return rects
+
+
+def outline_rects(points, width, pieces=8):
+    """Small boxes covering a closed outline drawn with pygame.draw.polygon/line of this width.
+
+    Each edge is cut into pieces; every box is grown by the line width so the thick edges and
+    the corner joins stay inside.
+    """
+    pad = width + 1
+    rects = []
+    count = len(points)
+    for i in range(count):
+        x1, y1 = points[i]
+        x2, y2 = points[(i + 1) % count]
+        for k in range(pieces):
+            ax = x1 + (x2 - x1) * k / pieces
+            ay = y1 + (y2 - y1) * k / pieces
+            bx = x1 + (x2 - x1) * (k + 1) / pieces
+            by = y1 + (y2 - y1) * (k + 1) / pieces
+            left = math.floor(min(ax, bx)) - pad
+            top = math.floor(min(ay, by)) - pad
+            rects.append(pygame.Rect(left, top, math.ceil(max(ax, bx)) + pad + 1 - left,
+                                     math.ceil(max(ay, by)) + pad + 1 - top))
+    return rects
@@ -0,0 +1,299 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Headless export of any script (or a recorded trace) to a PNG sequence, an RGB24 stream or a GIF.
+
+The bundled GIFs were screen-captured from the interactive windows, which are capped at
+clock.tick(FPS). Here the engine (hexagon_sim / cube_sim) is stepped as fast as the CPU allows,
+each frame is drawn by scenes.py onto an off-screen pygame.Surface, and the raw pixels are handed
+through a bounded queue to an encoder thread:
+
+    main thread:     step -> draw -> copy the 32-bit pixel buffer -> queue.put (blocks when full)
+    encoder threads: queue.get -> convert to RGB -> PNG / raw / GIF
+
+The queue bounds memory (queue_size frames) and the simulation only waits for the encoder when the
+encoder is a whole queue behind. The PNG writer only needs zlib, which releases the GIL while it
+compresses, so PNG frames are encoded by one thread per CPU. Raw and GIF output are written in
+order by a single thread. GIF output needs Pillow (pip install pillow).
+
+    python export.py 2D_BouncingBall_Hexagon-D.py clip.gif --seconds 60 --seed 1
+    python export.py 3D_BouncingBall_Cube-Manus.py frames/ --seconds 10
+    python export.py run.bbt replay.gif                       (a trace from recording.py)
+    python export.py 2D_BouncingBall_Hexagon-G.py - --format raw | \\
+        ffmpeg -f rawvideo -pix_fmt rgb24 -s 700x520 -r 60 -i - clip.mp4
+"""
+###############################################################################################
+import argparse
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+
+import numpy as np
+import pygame
+
+from recording import ENGINES, TraceReader
+from scenes import make_scene
+
+# Script -> (engine kind, variant)
+SCRIPTS = {
+    "2D_BouncingBall_Hexagon-D.py": ("hexagon", "D"),
+    "2D_BouncingBall_Hexagon-G.py": ("hexagon", "G"),
+    "2D_BouncingBall_Hexagon-Manus.py": ("hexagon", "Manus"),
+    "3D_BouncingBall_Cube-D.py": ("cube", "D"),
+    "3D_BouncingBall_Cube-G.py": ("cube", "G"),
+    "3D_BouncingBall_Cube-Manus.py": ("cube", "Manus"),
+    "MANUS-bouncing_ball_3d.py": ("cube", "Manus-3d"),
+}
+
+
+# ---------------------------------------------------------------------------------------
+class RawEncoder:
+    """Concatenated RGB24 frames, to a file or to stdout ("-") for piping into ffmpeg."""
+
+    parallel = False
+
+    def __init__(self, path, size, fps):
+        self.file = sys.stdout.buffer if path == "-" else open(_make_parent(path), "wb")
+
+    def write(self, index, rgb):
+        self.file.write(rgb)
+
+    def close(self):
+        if self.file is sys.stdout.buffer:
+            self.file.flush()
+        else:
+            self.file.close()
+
+
+class PngEncoder:
+    """A numbered PNG sequence (frame_00000.png, ...) written with zlib alone.
+
+    Frames are independent files, so several encoder threads can write them at once.
+    """
+
+    parallel = True
+
+    def __init__(self, path, size, fps, level=1):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.level = level
+        width, height = size
+        self._header = b"\x89PNG\r\n\x1a\n" + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+    def write(self, index, rgb):
+        height = len(rgb)
+        rows = np.empty((height, rgb[0].size + 1), dtype=np.uint8)
+        rows[:, 0] = 0  # Filter type "None" on every row
+        rows[:, 1:] = rgb.reshape(height, -1)
+        data = self._header + _png_chunk(b"IDAT", zlib.compress(rows, self.level)) + _png_chunk(b"IEND", b"")
+        with open(os.path.join(self.path, f"frame_{index:05d}.png"), "wb") as f:
+            f.write(data)
+
+    def close(self):
+        pass
+
+
+def _make_parent(path):
+    """Create the directory a file will be written to, so a long export cannot fail at the end."""
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    return path
+
+
+def _png_chunk(tag, data):
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+
+class GifEncoder:
+    """Animated GIF through Pillow, streamed: every frame is quantized and written as it arrives.
+
+    The palette is computed once, from the first frame, and every later frame is mapped onto it
+    without dithering: about ten times faster than quantizing each frame adaptively, and the GIF
+    needs only one global colour table. Image.save(append_images=...) would hold every frame
+    until the end, so the file is written with GifImagePlugin's getheader() / getdata(), one frame
+    at a time, each cropped to the box that changed since the previous frame (as save() does).
+    Only the previous frame's palette indices are kept.
+    """
+
+    parallel = False
+
+    def __init__(self, path, size, fps):
+        try:
+            from PIL import Image
+        except ImportError:
+            raise RuntimeError("GIF export needs Pillow (pip install pillow); "
+                               "use a PNG directory or --format raw instead") from None
+        from PIL import GifImagePlugin
+        self.image = Image
+        self.gif = GifImagePlugin
+        self.path = _make_parent(path)
+        self.duration = round(1000 / fps)
+        self.file = None
+        self.palette = None
+        self.previous = None  # Palette indices of the last frame written
+
+    def write(self, index, rgb):
+        Image = self.image
+        frame = Image.fromarray(rgb)
+        if self.palette is None:
+            self.palette = frame.quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+        frame = frame.quantize(palette=self.palette, dither=Image.Dither.NONE)
+        indices = np.asarray(frame)
+        if self.previous is None:
+            header, _ = self.gif.getheader(frame, info={"loop": 0})
+            self.file = open(self.path, "wb")
+            self.file.write(b"".join(header))
+            box = (0, 0, frame.width, frame.height)
+        else:
+            changed = indices != self.previous
+            rows = np.flatnonzero(changed.any(axis=1))
+            if len(rows):
+                columns = np.flatnonzero(changed[rows[0]:rows[-1] + 1].any(axis=0))
+                box = (int(columns[0]), int(rows[0]), int(columns[-1]) + 1, int(rows[-1]) + 1)
+            else:
+                box = (0, 0, 1, 1)  # Same picture: one unchanged pixel keeps the frame's timing
+        self.previous = indices
+        data = self.gif.getdata(frame.crop(box), offset=box[:2], duration=self.duration)
+        self.file.write(b"".join(data))
+
+    def close(self):
+        if self.file is not None:
+            self.file.write(b";")  # GIF trailer
+            self.file.close()
+            self.file = None
+
+
+ENCODERS = {"raw": RawEncoder, "png": PngEncoder, "gif": GifEncoder}
+
+
+def guess_format(path):
+    """"-" and .rgb/.raw files are raw, .gif is GIF, anything else is a PNG directory."""
+    extension = os.path.splitext(path)[1].lower()
+    if path == "-" or extension in (".rgb", ".raw"):
+        return "raw"
+    return "gif" if extension == ".gif" else "png"
+
+
+# ---------------------------------------------------------------------------------------
+class _EncoderThread(threading.Thread):
+    """Drains (index, pixels) items from the frame queue into an encoder until it gets None."""
+
+    def __init__(self, encoder, frames, surface):
+        super().__init__(daemon=True)
+        self.encoder = encoder
+        self.frames = frames
+        self.error = None
+        # Byte offsets of R, G, B inside a 32-bit pixel (little-endian)
+        self.channels = [shift // 8 for shift in surface.get_shifts()[:3]]
+        self.shape = (surface.get_height(), surface.get_pitch() // 4, 4)
+        self.rgb = np.empty((surface.get_height(), surface.get_width(), 3), dtype=np.uint8)
+
+    def run(self):
+        rgb = self.rgb
+        width = rgb.shape[1]
+        while True:
+            item = self.frames.get()
+            if item is None:
+                break
+            if self.error is not None:
+                continue  # Keep draining so the producer never blocks on a dead encoder
+            index, pixels = item
+            try:
+                pixels = pixels.reshape(self.shape)
+                for i, channel in enumerate(self.channels):
+                    rgb[:, :, i] = pixels[:, :width, channel]  # Three plain copies beat one gather
+                self.encoder.write(index, rgb)
+            except Exception as error:
+                self.error = error
+
+
+def export(source, path, fmt=None, seconds=10, every=1, hud=True, queue_size=32, workers=None):
+    """Render seconds of source (a HexagonSim, CubeSim or TraceReader) to path.
+
+    every=N keeps one frame in N (the clip plays at fps/N). workers is the number of encoder
+    threads (default: one per CPU for PNG, otherwise 1). Returns (frames written, wall seconds).
+    """
+    fmt = fmt or guess_format(path)
+    if isinstance(source, TraceReader):
+        header = source.header
+        kind, variant, params = header["kind"], header["variant"], header["params"]
+        states = source.states(1, 1 + round(seconds * params["fps"]))
+    else:
+        kind, variant, params = source.kind, source.variant, source.params
+        states = _run(source, round(seconds * params["fps"]))
+
+    scene = make_scene(kind, variant, params, hud)
+    surface = pygame.Surface(scene.size, 0, 32)
+    encoder = ENCODERS[fmt](path, scene.size, params["fps"] / every)
+    if not encoder.parallel:
+        workers = 1
+    frames = queue.Queue(maxsize=queue_size)
+    threads = [_EncoderThread(encoder, frames, surface) for _ in range(workers or os.cpu_count() or 1)]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    written = 0
+    try:
+        for index, state in enumerate(states):
+            if index % every:
+                continue
+            scene.draw(surface, state)
+            frames.put((written, np.frombuffer(surface.get_buffer(), dtype=np.uint8).copy()))
+            written += 1
+            if any(thread.error is not None for thread in threads):
+                break
+    finally:
+        for _ in threads:
+            frames.put(None)
+        for thread in threads:
+            thread.join()
+        encoder.close()
+    for thread in threads:
+        if thread.error is not None:
+            raise thread.error
+    return written, time.perf_counter() - started
+
+
+def _run(sim, steps):
+    """Step the engine and yield it after every step, like one pass of a script's main loop."""
+    for _ in range(steps):
+        sim.step()
+        yield sim
+
+
+# ---------------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Export a script's animation without opening a window.")
+    parser.add_argument("source", help="one of the scripts, or a trace recorded with recording.py")
+    parser.add_argument("path", help="clip.gif, clip.rgb, a directory for PNGs, or - for raw RGB on stdout")
+    parser.add_argument("--format", choices=sorted(ENCODERS), help="default: from the output path")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--every", type=int, help="keep one frame in N (default 3 for GIF, else 1)")
+    parser.add_argument("--workers", type=int, help="PNG encoder threads (default: one per CPU)")
+    parser.add_argument("--no-hud", action="store_true")
+    args = parser.parse_args()
+
+    fmt = args.format or guess_format(args.path)
+    every = args.every or (3 if fmt == "gif" else 1)  # GIF delays are in 1/100 s: 20 fps is exact
+    name = os.path.basename(args.source)
+    if name in SCRIPTS:
+        kind, variant = SCRIPTS[name]
+        source = ENGINES[kind](variant, seed=args.seed)
+    else:
+        source = TraceReader(args.source)
+    written, elapsed = export(source, args.path, fmt, args.seconds, every, not args.no_hud,
+                            workers=args.workers)
+    print(f"{written} frames in {elapsed:.2f} s ({written / elapsed:.0f} frames/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
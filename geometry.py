@@ -0,0 +1,103 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Per-frame hexagon geometry.
+
+The hexagon scripts recompute the same six vertices several times per frame: check_collision works
+them out with four cos/sin calls per wall, draw_hexagon does it again, and the Manus script rebuilds
+them in get_hexagon_vertices for both get_hexagon_edges and drawing. A HexagonFrame is built once
+per step and holds everything collision, boundary enforcement and rendering need:
+    points     the six vertices (for pygame.draw.polygon)
+    vertices   the closed outline, vertices[i] -> vertices[i + 1] is wall i
+    units      unit edge vectors
+    normals    inward unit normals
+    lengths    edge lengths
+
+Vertices are computed with the same expressions the scripts use, so reading them from a frame does
+not change a trajectory by a single bit. The scripts use three slightly different vertex formulas,
+hence the three builders.
+
+When the angle only ever moves in exactly representable steps (the D script's 0.5 degrees per frame)
+the set of angles is small and FrameCache turns the per-frame trigonometry into a dict lookup.
+"""
+###############################################################################################
+import math
+
+# Angular offsets of the six vertices. G uses radians(60 * i), Manus uses i * (2 * pi / 6);
+# the two differ in the last bit for i = 5.
+RADIAN_SPOKES = tuple(math.radians(60 * i) for i in range(6))
+TURN_SPOKES = tuple(i * (2 * math.pi / 6) for i in range(6))
+
+
+class HexagonFrame:
+    """Vertices, edge directions, inward normals and edge lengths for one rotation angle."""
+
+    __slots__ = ("angle", "points", "vertices", "units", "normals", "lengths")
+
+    def __init__(self, angle, vertices):
+        """vertices holds seven points; the last one closes the outline."""
+        self.angle = angle
+        self.vertices = vertices
+        self.points = vertices[:6]
+        units = []
+        normals = []
+        lengths = []
+        for i in range(6):
+            x1, y1 = vertices[i]
+            x2, y2 = vertices[i + 1]
+            wall_x = x2 - x1
+            wall_y = y2 - y1
+            length = math.hypot(wall_x, wall_y)
+            unit_x = wall_x / length
+            unit_y = wall_y / length
+            units.append((unit_x, unit_y))
+            normals.append((-unit_y, unit_x))  # Vertices run counterclockwise, so this points inward
+            lengths.append(length)
+        self.units = units
+        self.normals = normals
+        self.lengths = lengths
+
+
+# ---------------------------------------------------------------------------------------
+def hexagon_frame_degrees(center, radius, angle):
+    """Frame for an angle in degrees, built the way the D script's check_collision does."""
+    cx, cy = center
+    vertices = []
+    for i in range(7):
+        theta = math.radians(60 * i + angle)
+        vertices.append((cx + radius * math.cos(theta), cy + radius * math.sin(theta)))
+    return HexagonFrame(angle, vertices)
+
+
+def hexagon_frame(center, radius, angle, spokes=RADIAN_SPOKES):
+    """Frame for an angle in radians (G script). Pass spokes=TURN_SPOKES for the Manus script."""
+    cx, cy = center[0], center[1]
+    vertices = []
+    for offset in spokes:
+        theta = offset + angle
+        vertices.append((cx + radius * math.cos(theta), cy + radius * math.sin(theta)))
+    vertices.append(vertices[0])
+    return HexagonFrame(angle, vertices)
+
+
+class FrameCache:
+    """Memoizes frames by exact rotation angle.
+
+    Only worth it when the angle takes a small set of values, e.g. 0.5 degree steps wrapped to
+    [0, 360). The cache is simply cleared when it reaches maxsize.
+    """
+
+    def __init__(self, build, maxsize=4096):
+        self.build = build
+        self.maxsize = maxsize
+        self._frames = {}
+
+    def __call__(self, angle):
+        frame = self._frames.get(angle)
+        if frame is None:
+            if len(self._frames) >= self.maxsize:
+                self._frames.clear()
+            frame = self._frames[angle] = self.build(angle)
+        return frame
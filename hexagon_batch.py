@@ -0,0 +1,300 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Vectorized N-ball version of the spinning-hexagon simulation.
+
+HexagonSim steps one ball through Python loops. HexagonBatch holds thousands of independent balls,
+each in its own spinning hexagon, as contiguous NumPy arrays:
+    pos, vel             (N, 2) float64
+    angle                (N,)   hexagon rotation in degrees
+    spin_direction       (N,)   +1 / -1
+All six walls are tested against every ball in one (N, 6) pass per step.
+
+The policy is the DeepThink R1 one (2D_BouncingBall_Hexagon-D.py): gravity and friction every frame,
+constrain_ball_inside_hexagon as a rescue, then check_collision with a corner roll or a random kick.
+Where a ball touches two walls in the same frame only the deeper contact is resolved.
+
+gravity, friction, angular_velocity, the spin schedule and the kick ranges accept a scalar or one
+value per ball, so a Monte-Carlo sweep can put every parameter combination into a single batch:
+
+    batch = HexagonBatch(10_000, seed=1, gravity=np.linspace(0.1, 1.0, 10_000))
+    batch.step(3600)
+
+seed may also be a sequence of per-ball seeds (streams.BallStreams): ball i then behaves the same
+in any batch, so one ball out of a million can be re-run alone. rescue=False drops the
+constrain_ball_inside_hexagon pass to check the collision code on its own (verify.py).
+
+HexagonCrowd puts all the balls into one hexagon and lets them collide with each other as well,
+with broadphase.UniformGrid finding the touching pairs:
+
+    crowd = HexagonCrowd(3000, seed=1, ball_radius=3)
+    crowd.step(600)
+"""
+###############################################################################################
+import math
+
+import numpy as np
+
+import swept
+from broadphase import UniformGrid, resolve_contacts
+from hexagon_sim import VARIANTS
+from streams import make_streams
+
+# Parameters that may differ from ball to ball
+PER_BALL = ("gravity", "friction", "angular_velocity", "spin_min", "spin_max",
+            "kick_angle_min", "kick_angle_max", "kick_force_min", "kick_force_max")
+
+# Vertex k of every hexagon sits at 60*k degrees plus the rotation angle
+_VERTEX_DEGREES = 60.0 * np.arange(7)
+
+
+class HexagonBatch:
+    """N balls, each bouncing inside its own spinning hexagon."""
+
+    def __init__(self, n_balls, seed=None, rescue=True, **params):
+        settings = dict(VARIANTS["D"])
+        unknown = set(params) - set(settings)
+        if unknown:
+            raise TypeError(f"Unknown hexagon parameter(s): {', '.join(sorted(unknown))}")
+        settings.update(params)
+
+        n = int(n_balls)
+        self.n_balls = n
+        self.seed = seed
+        self.rescue = rescue
+        self.streams = make_streams(seed, n)
+        for name, value in settings.items():
+            if name in PER_BALL:
+                value = np.broadcast_to(np.asarray(value, dtype=float), (n,)).copy()
+            setattr(self, name, value)
+
+        self.center = np.array([self.width // 2, self.height // 2], dtype=float)
+        self.pos = np.empty((n, 2))
+        self.vel = np.empty((n, 2))
+        self.pos[:] = self.ball_pos
+        self.vel[:] = self.ball_vel
+        self.angle = np.zeros(n)
+        self.spin_direction = np.ones(n)
+        self.spin_timer = np.zeros(n, dtype=np.int64)
+        self.spin_duration = self.streams.integers(slice(None), self.spin_min, self.spin_max)
+        self.bounces = np.zeros(n, dtype=np.int64)
+        self.rescues = np.zeros(n, dtype=np.int64)  # Times constrain_ball_inside_hexagon had to act
+        self.step_count = 0
+
+    # ---------------------------------------------------------------------------------------
+    def step(self, n=1):
+        """Advance every ball by n frames."""
+        for _ in range(n):
+            self._spin()
+            self._integrate()
+            if self.rescue:
+                self._constrain_inside()
+            self._check_collisions()
+            self.step_count += 1
+
+    def _spin(self):
+        """Rotate each hexagon and reverse the ones whose spin duration ran out."""
+        angle = self.angle
+        angle += self.angular_velocity * self.spin_direction
+        np.mod(angle, 360.0, out=angle)
+
+        self.spin_timer += 1
+        expired = self.spin_timer > self.spin_duration
+        if expired.any():
+            self.spin_direction[expired] *= -1
+            self.spin_timer[expired] = 0
+            self.spin_duration[expired] = self.streams.integers(expired, self.spin_min[expired],
+                                                                self.spin_max[expired])
+
+    def _integrate(self):
+        """Gravity, per-frame friction and the position update."""
+        self.vel[:, 1] += self.gravity
+        self.vel *= self.friction[:, None]
+        self.pos += self.vel
+
+    def _constrain_inside(self):
+        """Vectorized constrain_ball_inside_hexagon()."""
+        rel = self.pos - self.center
+        rad = np.radians(-self.angle)
+        cos_a = np.cos(rad)
+        sin_a = np.sin(rad)
+        x_rot = rel[:, 0] * cos_a - rel[:, 1] * sin_a
+        y_rot = rel[:, 0] * sin_a + rel[:, 1] * cos_a
+        radius = self.hexagon_radius
+        outside = (np.abs(x_rot) > radius) | (np.abs(y_rot) > radius * math.sin(math.radians(60)))
+        if outside.any():
+            angle_to_center = np.arctan2(rel[outside, 1], rel[outside, 0])
+            reach = radius - self.ball_radius
+            self.pos[outside, 0] = self.center[0] + reach * np.cos(angle_to_center)
+            self.pos[outside, 1] = self.center[1] + reach * np.sin(angle_to_center)
+            self.rescues[outside] += 1
+
+    def _check_collisions(self):
+        """Vectorized check_collision(): all six walls against all balls at once."""
+        theta = np.radians(self.angle[:, None] + _VERTEX_DEGREES)  # (N, 7)
+        vx = self.center[0] + self.hexagon_radius * np.cos(theta)
+        vy = self.center[1] + self.hexagon_radius * np.sin(theta)
+        x1, y1 = vx[:, :6], vy[:, :6]
+        wall_x = vx[:, 1:] - x1
+        wall_y = vy[:, 1:] - y1
+        wall_length = np.hypot(wall_x, wall_y)
+        unit_x = wall_x / wall_length
+        unit_y = wall_y / wall_length
+
+        px = self.pos[:, 0:1]
+        py = self.pos[:, 1:2]
+        projection = (px - x1) * unit_x + (py - y1) * unit_y
+        distance = np.hypot(px - (x1 + projection * unit_x), py - (y1 + projection * unit_y))
+
+        # Resolve the deepest contact of every ball that touches a wall
+        wall = np.argmin(distance, axis=1)
+        hit = np.nonzero(distance[np.arange(self.n_balls), wall] <= self.ball_radius)[0]
+        if hit.size == 0:
+            return
+        wall = wall[hit]
+        projection = projection[hit, wall]
+        wall_length = wall_length[hit, wall]
+        distance = distance[hit, wall]
+        normal_x = -unit_y[hit, wall]
+        normal_y = unit_x[hit, wall]
+        vel = self.vel[hit]
+
+        # Roll with the spin near a corner, otherwise kick at a random angle and force
+        threshold = self.corner_threshold
+        corner = (np.abs(projection) < threshold) | (np.abs(projection - wall_length) < threshold)
+        roll = self.angular_velocity[hit] * 0.1
+        kick_angle = np.radians(self.streams.uniform(hit, self.kick_angle_min[hit], self.kick_angle_max[hit]))
+        kick_force = self.streams.uniform(hit, self.kick_force_min[hit], self.kick_force_max[hit])
+        vel[:, 0] += np.where(corner, roll, kick_force * np.cos(kick_angle))
+        vel[:, 1] += np.where(corner, roll, kick_force * np.sin(kick_angle))
+
+        # Reflect about the inward normal and push the ball out of the wall
+        dot_product = vel[:, 0] * normal_x + vel[:, 1] * normal_y
+        vel[:, 0] -= 2 * dot_product * normal_x
+        vel[:, 1] -= 2 * dot_product * normal_y
+        overlap = self.ball_radius - distance
+        self.pos[hit, 0] += overlap * normal_x
+        self.pos[hit, 1] += overlap * normal_y
+        self.vel[hit] = vel
+        self.bounces[hit] += 1
+
+    # ---------------------------------------------------------------------------------------
+    def overlap(self):
+        """Per-ball HexagonSim.overlap(): pixels past the nearest wall, <= 0 while fully inside."""
+        rel = self.pos - self.center
+        normal = np.radians(self.angle)[:, None] + swept.PHASES  # (N, 6) outward wall normals
+        reach = (rel[:, 0:1] * np.cos(normal) + rel[:, 1:2] * np.sin(normal)).max(axis=1)
+        return reach - (self.hexagon_radius * swept.APOTHEM - self.ball_radius)
+
+    def kinetic_energy(self):
+        """Per-ball kinetic energy (unit mass), in px^2/frame^2."""
+        return 0.5 * np.einsum("ij,ij->i", self.vel, self.vel)
+
+
+class HexagonCrowd(HexagonBatch):
+    """N balls sharing one spinning hexagon, colliding with the walls and with each other.
+
+    The walls use HexagonBatch's D policy. Ball-ball contacts are resolved after the walls by
+    broadphase.resolve_contacts, with the balls held inside the walls between its iterations.
+    The crowd is dense, and pushing balls apart makes new contacts, so the grid is queried again
+    for a second pass.
+    """
+
+    contact_passes = 2  # Broad phase queries per frame
+    contact_iterations = 2  # resolve_contacts iterations per query
+
+    def __init__(self, n_balls, seed=None, rescue=True, restitution=1.0, **params):
+        if np.ndim(seed) != 0:
+            raise ValueError("The balls of a HexagonCrowd share one hexagon and one seed")
+        super().__init__(n_balls, seed, rescue, **params)
+        self.restitution = restitution
+        self.spin_duration[:] = self.spin_duration[0]  # One hexagon, one spin schedule
+        self.pos[:] = self._lattice(self.n_balls)
+        every = slice(None)
+        heading = self.streams.uniform(every, np.zeros(self.n_balls), np.full(self.n_balls, 2 * math.pi))
+        speed = math.hypot(*self.ball_vel)
+        self.vel[:, 0] = speed * np.cos(heading)
+        self.vel[:, 1] = speed * np.sin(heading)
+
+        diameter = 2 * self.ball_radius
+        corner = self.center - self.hexagon_radius
+        self.grid = UniformGrid(corner, (2 * self.hexagon_radius, 2 * self.hexagon_radius), diameter)
+        self.contacts = 0  # Ball-ball contacts resolved so far
+
+    def _lattice(self, n):
+        """n non-overlapping starting positions on a triangular lattice, closest to the center first."""
+        spacing = 2.05 * self.ball_radius
+        limit = self.hexagon_radius * swept.APOTHEM - self.ball_radius
+        rows = int(limit // (spacing * math.sin(math.radians(60))))
+        cols = int(limit // spacing) + 1
+        row, col = np.mgrid[-rows:rows + 1, -cols:cols + 1]
+        x = (col + 0.5 * (row % 2)) * spacing
+        y = row * spacing * math.sin(math.radians(60))
+        points = np.column_stack([x.ravel(), y.ravel()])
+        normal = np.array(swept.PHASES)
+        reach = (points[:, 0:1] * np.cos(normal) + points[:, 1:2] * np.sin(normal)).max(axis=1)
+        points = points[reach <= limit]
+        if len(points) < n:
+            raise ValueError(f"Only {len(points)} balls of radius {self.ball_radius} fit into the hexagon")
+        order = np.argsort(np.hypot(points[:, 0], points[:, 1]), kind="stable")
+        return self.center + points[order[:n]]
+
+    # ---------------------------------------------------------------------------------------
+    def step(self, n=1):
+        """Advance every ball by n frames."""
+        for _ in range(n):
+            self._spin()
+            self._integrate()
+            if self.rescue:
+                self._constrain_inside()
+            self._check_collisions()
+            self._collide_balls()  # After the walls, which would pile the balls they push back onto each other
+            self.step_count += 1
+
+    def _constrain_inside(self):
+        """Move every ball whose center is past a wall's limit back onto it.
+
+        The D rescue puts an escaped ball back at hexagon_radius - ball_radius from the center,
+        which is outside near the middle of a wall; with a crowd pressing on the walls that
+        happens every frame.
+        """
+        self.rescues[self._inside(self.pos)] += 1
+
+    def _inside(self, pos):
+        """Project the centers in pos that are past a wall's limit onto it. Returns the moved mask."""
+        rel = pos - self.center
+        limit = self.hexagon_radius * swept.APOTHEM - self.ball_radius
+        moved = np.zeros(len(pos), dtype=bool)
+        for phase in swept.PHASES:
+            normal = np.radians(self.angle) + phase
+            nx, ny = np.cos(normal), np.sin(normal)
+            past = rel[:, 0] * nx + rel[:, 1] * ny - limit
+            out = past > 0
+            if out.any():
+                rel[out, 0] -= past[out] * nx[out]
+                rel[out, 1] -= past[out] * ny[out]
+                moved |= out
+        pos[moved] = self.center + rel[moved]
+        return moved
+
+    def _spin(self):
+        """Rotate the hexagon and reverse it when its spin duration runs out."""
+        angle = self.angle
+        angle += self.angular_velocity * self.spin_direction
+        np.mod(angle, 360.0, out=angle)
+
+        self.spin_timer += 1
+        if self.spin_timer[0] > self.spin_duration[0]:
+            self.spin_direction *= -1
+            self.spin_timer[:] = 0
+            self.spin_duration[:] = self.streams.integers([0], self.spin_min[:1], self.spin_max[:1])
+
+    def _collide_balls(self):
+        """Resolve every pair of touching balls found by the grid, keeping the balls inside the walls."""
+        diameter = 2 * self.ball_radius
+        for _ in range(self.contact_passes):
+            i, j = self.grid.pairs(self.pos, diameter)
+            self.contacts += resolve_contacts(self.pos, self.vel, i, j, diameter, self.restitution,
+                                              self.contact_iterations, self._inside)
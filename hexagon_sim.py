@@ -0,0 +1,599 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Headless, fixed-step engine for the spinning-hexagon scripts.
+
+The three hexagon scripts run their physics inside a `while running` loop in main() that is
+paced by clock.tick(60) and needs a display. HexagonSim runs the same physics without pygame:
+
+    sim = HexagonSim("D", seed=42)
+    sim.step(1_000_000)
+
+Each variant reproduces its script's collision policy operation for operation, so with the same seed
+the trajectory matches the original loop bit-for-bit:
+    "D"     -> 2D_BouncingBall_Hexagon-D.py      (check_collision + constrain_ball_inside_hexagon)
+    "G"     -> 2D_BouncingBall_Hexagon-G.py      (wall loop in the main loop + keep_ball_inside)
+    "Manus" -> 2D_BouncingBall_Hexagon-Manus.py  (check_collision + enforce_boundary)
+
+"Swept" is not a script: it keeps D's forces but finds wall contacts by time of impact (swept.py)
+against the moving walls, so no kick force or step size can carry the ball through a wall and no
+rescue pass is needed. substeps > 1 splits every frame into shorter physics steps.
+
+telemetry=BounceLog(...) (telemetry.py) records every wall contact: step, wall, incoming speed,
+normal, kick and the velocity after the bounce.
+
+Wall-clock timers are replaced by a fixed frame time of 1/fps seconds per step, so spin reversals
+happen on the same frames every run.
+"""
+###############################################################################################
+import functools
+import math
+import random
+
+import numpy as np
+
+import swept
+from geometry import TURN_SPOKES, FrameCache, hexagon_frame, hexagon_frame_degrees
+
+# Script defaults. Spin durations are in the units each script uses:
+# D counts frames, G counts milliseconds and Manus counts seconds.
+VARIANTS = {
+    "D": {
+        "width": 700, "height": 520, "fps": 60,
+        "hexagon_radius": 250,
+        "angular_velocity": 0.5,  # Degrees per frame
+        "spin_min": 300, "spin_max": 1200,
+        "ball_radius": 20,
+        "ball_pos": (700 // 2, 520 // 2),
+        "ball_vel": (5, -10),
+        "gravity": 0.5,
+        "friction": 0.99,
+        "kick_angle_min": -45, "kick_angle_max": 45,  # Degrees
+        "kick_force_min": 5, "kick_force_max": 15,
+        "corner_threshold": 10,
+    },
+    "G": {
+        "width": 700, "height": 520, "fps": 60,
+        "hexagon_radius": 250,
+        "angular_velocity": math.radians(0.5),  # Radians per frame
+        "spin_min": 2000, "spin_max": 10000,
+        "ball_radius": 20,
+        "ball_pos": (700 // 2, 520 // 2 - 250 + 20 * 2),
+        "ball_vel": None,  # Random in [-2, 2] on each axis
+        "gravity": 0.2,
+        "friction": 0.98,
+        "kick_force_min": 1, "kick_force_max": 7,
+        "corner_threshold": 20,
+    },
+    "Manus": {
+        "width": 700, "height": 520, "fps": 60,
+        "hexagon_radius": 250,
+        "angular_velocity": 0.01,  # Radians per frame
+        "spin_min": 3.0, "spin_max": 8.0,
+        "ball_radius": 15,
+        "ball_pos": (700 // 2, 520 // 2),
+        "ball_vel": (2.0, 0.0),
+        "gravity": 0.5,
+        "friction": 0.98,
+        "kick_force_min": 3.0, "kick_force_max": 8.0,
+        "kick_effect_duration": 15,  # Frames
+    },
+    "Swept": {
+        "width": 700, "height": 520, "fps": 60,
+        "hexagon_radius": 250,
+        "angular_velocity": math.radians(0.5),  # Radians per frame
+        "spin_min": 300, "spin_max": 1200,  # Frames
+        "ball_radius": 20,
+        "ball_pos": (700 // 2, 520 // 2),
+        "ball_vel": (5, -10),
+        "gravity": 0.5,
+        "friction": 0.99,
+        "kick_angle_min": -45, "kick_angle_max": 45,  # Degrees from the wall's inward normal
+        "kick_force_min": 5, "kick_force_max": 15,
+        "restitution": 0.7,  # Normal speed kept off a wall; with inward kicks, 1.0 gains energy forever
+        "kick_effect_duration": 15,  # Frames
+        "substeps": 1,
+        "max_contacts": 16,  # Per substep
+    },
+}
+
+
+class HexagonSim:
+    """One ball bouncing inside a spinning hexagon, stepped without a display."""
+
+    kind = "hexagon"
+
+    def __init__(self, variant="D", seed=None, telemetry=None, **params):
+        if variant not in VARIANTS:
+            raise ValueError(f"Unknown hexagon variant {variant!r}, expected one of {sorted(VARIANTS)}")
+        settings = dict(VARIANTS[variant])
+        unknown = set(params) - set(settings)
+        if unknown:
+            raise TypeError(f"Unknown {variant} parameter(s): {', '.join(sorted(unknown))}")
+        settings.update(params)
+
+        self.variant = variant
+        self.seed = seed
+        self.params = settings
+        self.rng = random.Random(seed)
+        self.telemetry = telemetry  # A telemetry.BounceLog, or None
+        for name, value in settings.items():
+            setattr(self, name, value)
+
+        self.center = (self.width // 2, self.height // 2)
+        self.frame_time = 1 / self.fps
+        self.step_count = 0
+        self.time = 0.0  # Seconds of simulated time
+        self.direction_change_time = 0.0  # Seconds since the last spin reversal
+        self.hexagon_angle = 0  # Degrees for D, radians for G and Manus
+        self.spin_direction = 1  # 1 for clockwise, -1 for counterclockwise
+        self.bounce_angle = 0.0
+        self.total_bounces = 0
+        self.last_kick_force = 0.0
+        self.last_kick_angle = 0.0
+        self.kick_effect_time = 0
+        self.kick_flash = False  # True on frames the Manus script draws the ball yellow
+
+        # Draw the initial random values in the same order the scripts do at import time
+        ball_vel = self.ball_vel
+        if ball_vel is None:
+            ball_vel = (self.rng.uniform(-2, 2), self.rng.uniform(-2, 2))
+
+        if variant == "Manus":
+            self.center = np.array(self.center)
+            self.ball_pos = np.array(self.ball_pos, dtype=float)
+            self.ball_vel = np.array(ball_vel, dtype=float)
+            self.rotation_speed = self.angular_velocity
+            self.next_direction_change = self.time + self.rng.uniform(self.spin_min, self.spin_max)
+            self._step = self._step_manus
+            self.frame = hexagon_frame(self.center, self.hexagon_radius, self.hexagon_angle, TURN_SPOKES)
+        else:
+            self.ball_pos = [self.ball_pos[0], self.ball_pos[1]]
+            self.ball_vel = [ball_vel[0], ball_vel[1]]
+            self.spin_duration = self.rng.randint(self.spin_min, self.spin_max)
+            self.spin_timer = 0  # D: frames since the last reversal
+            self._last_frame_time = 0.0  # G: clock.get_time() is 0 before the first tick
+            if variant == "Swept":
+                self.hexagon_angle = 0.0
+                self.frame = hexagon_frame(self.center, self.hexagon_radius, self.hexagon_angle)
+                self._step = self._step_swept
+            elif variant == "D":
+                # 0.5 degree steps wrapped to [0, 360) only ever produce 720 distinct angles
+                self._frames = FrameCache(functools.partial(hexagon_frame_degrees,
+                                                            self.center, self.hexagon_radius))
+                self.frame = self._frames(self.hexagon_angle)
+                self._step = self._step_d
+            else:
+                self.frame = hexagon_frame(self.center, self.hexagon_radius, self.hexagon_angle)
+                self._step = self._step_g
+
+    # ---------------------------------------------------------------------------------------
+    @property
+    def angle_radians(self):
+        """Current hexagon rotation in radians, whatever unit the variant keeps it in."""
+        if self.variant == "D":
+            return math.radians(self.hexagon_angle)
+        return float(self.hexagon_angle)
+
+    def overlap(self):
+        """How far (pixels) the ball reaches past the nearest wall; <= 0 while it is fully inside.
+
+        Above ball_radius the ball's center has left the hexagon.
+        """
+        cx, cy = self.center
+        limit = self.hexagon_radius * swept.APOTHEM - self.ball_radius
+        return swept.overlap(self.ball_pos[0] - cx, self.ball_pos[1] - cy, self.angle_radians, limit)
+
+    def step(self, n=1):
+        """Advance the simulation by n frames."""
+        step = self._step
+        for _ in range(n):
+            step()
+
+    # ---------------------------------------------------------------------------------------
+    def _step_d(self):
+        """One frame of 2D_BouncingBall_Hexagon-D.py."""
+        # Update hexagon rotation
+        self.hexagon_angle += self.angular_velocity * self.spin_direction
+        if self.hexagon_angle >= 360:
+            self.hexagon_angle -= 360
+        elif self.hexagon_angle < 0:
+            self.hexagon_angle += 360
+
+        # Reverse spin direction after spin_duration frames
+        self.spin_timer += 1
+        if self.spin_timer > self.spin_duration:
+            self.spin_direction *= -1
+            self.spin_timer = 0
+            self.direction_change_time = 0.0
+            self.spin_duration = self.rng.randint(self.spin_min, self.spin_max)
+
+        # Update ball position and velocity
+        ball_pos = self.ball_pos
+        ball_vel = self.ball_vel
+        friction = self.friction
+        ball_vel[1] += self.gravity
+        ball_vel[0] *= friction
+        ball_vel[1] *= friction
+        ball_pos[0] += ball_vel[0]
+        ball_pos[1] += ball_vel[1]
+
+        self._constrain_inside_d(ball_pos)
+        self.frame = self._frames(self.hexagon_angle)
+        self._check_collision_d(ball_pos, ball_vel, self.frame)
+
+        self._advance_clock(self.frame_time)
+        self.bounce_angle = math.degrees(math.atan2(ball_vel[1], ball_vel[0]))
+
+    def _constrain_inside_d(self, ball_pos):
+        """constrain_ball_inside_hexagon() with is_point_inside_hexagon() inlined."""
+        cx, cy = self.center
+        radius = self.hexagon_radius
+        x = ball_pos[0] - cx
+        y = ball_pos[1] - cy
+        rad = math.radians(-self.hexagon_angle)
+        cos_a = math.cos(rad)
+        sin_a = math.sin(rad)
+        x_rot = x * cos_a - y * sin_a
+        y_rot = x * sin_a + y * cos_a
+        if not (abs(x_rot) <= radius and abs(y_rot) <= radius * math.sin(math.radians(60))):
+            angle_to_center = math.atan2(ball_pos[1] - cy, ball_pos[0] - cx)
+            ball_pos[0] = cx + (radius - self.ball_radius) * math.cos(angle_to_center)
+            ball_pos[1] = cy + (radius - self.ball_radius) * math.sin(angle_to_center)
+
+    def _check_collision_d(self, ball_pos, ball_vel, frame):
+        """check_collision() from the D script, reading the walls from a HexagonFrame."""
+        ball_radius = self.ball_radius
+        corner_threshold = self.corner_threshold
+        rng = self.rng
+        telemetry = self.telemetry
+        vertices = frame.vertices
+        units = frame.units
+        lengths = frame.lengths
+        for i in range(6):
+            x1, y1 = vertices[i]
+            unit_x, unit_y = units[i]
+            wall_length = lengths[i]
+
+            # Project the ball onto the wall and measure the distance to the closest point
+            projection = (ball_pos[0] - x1) * unit_x + (ball_pos[1] - y1) * unit_y
+            distance = math.hypot(ball_pos[0] - (x1 + projection * unit_x),
+                                  ball_pos[1] - (y1 + projection * unit_y))
+
+            if distance <= ball_radius:
+                velocity_in = (ball_vel[0], ball_vel[1])
+                if abs(projection) < corner_threshold or abs(projection - wall_length) < corner_threshold:
+                    # Roll with the hexagon's spin
+                    ball_vel[0] += self.angular_velocity * 0.1
+                    ball_vel[1] += self.angular_velocity * 0.1
+                    kick = (0.0, 0.0)
+                else:
+                    # Kick the ball with a random angle and force
+                    kick_angle = rng.uniform(self.kick_angle_min, self.kick_angle_max)
+                    kick_force = rng.uniform(self.kick_force_min, self.kick_force_max)
+                    kick = (kick_force * math.cos(math.radians(kick_angle)),
+                            kick_force * math.sin(math.radians(kick_angle)))
+                    ball_vel[0] += kick[0]
+                    ball_vel[1] += kick[1]
+                    self.last_kick_force = kick_force
+                    self.last_kick_angle = kick_angle
+
+                # Reflect the ball's velocity about the inward normal
+                normal_x, normal_y = frame.normals[i]
+                dot_product = ball_vel[0] * normal_x + ball_vel[1] * normal_y
+                ball_vel[0] -= 2 * dot_product * normal_x
+                ball_vel[1] -= 2 * dot_product * normal_y
+
+                # Move the ball out of the wall to prevent sticking
+                overlap = ball_radius - distance
+                ball_pos[0] += overlap * normal_x
+                ball_pos[1] += overlap * normal_y
+                self.total_bounces += 1
+                if telemetry is not None:
+                    telemetry.bounce(self.step_count, i, velocity_in, (normal_x, normal_y), kick,
+                                     (ball_vel[0], ball_vel[1]))
+
+    # ---------------------------------------------------------------------------------------
+    def _step_g(self):
+        """One frame of 2D_BouncingBall_Hexagon-G.py."""
+        # The script advances its counters by the previous frame's duration
+        delta_time = self._last_frame_time
+        self._last_frame_time = self.frame_time
+        self.time += delta_time
+        self.direction_change_time += delta_time
+        self.step_count += 1
+
+        if self.direction_change_time * 1000 > self.spin_duration:
+            self.spin_direction *= -1
+            self.direction_change_time = 0
+            self.spin_duration = self.rng.randint(self.spin_min, self.spin_max)
+
+        # Update hexagon rotation
+        self.hexagon_angle += self.angular_velocity * self.spin_direction
+        self.frame = hexagon_frame(self.center, self.hexagon_radius, self.hexagon_angle)
+        hex_points = self.frame.points
+
+        # Update ball position and velocity
+        ball_vel = self.ball_vel
+        ball_vel[1] += self.gravity
+        new_ball_pos = [self.ball_pos[0] + ball_vel[0], self.ball_pos[1] + ball_vel[1]]
+
+        ball_radius = self.ball_radius
+        rng = self.rng
+        for i in range(6):
+            start_point = hex_points[i]
+            end_point = hex_points[(i + 1) % 6]
+            if _point_line_distance(new_ball_pos, start_point, end_point) < ball_radius:
+                normal = [-(end_point[1] - start_point[1]), end_point[0] - start_point[0]]
+                normal_mag = math.sqrt(normal[0]**2 + normal[1]**2)
+                normal = [n / normal_mag for n in normal]
+                velocity_in = (ball_vel[0], ball_vel[1])
+
+                kick = (0.0, 0.0)
+                if not self._is_near_corner_g(new_ball_pos, hex_points):
+                    kick_angle = rng.uniform(0, math.pi * 2)
+                    kick_force = rng.uniform(self.kick_force_min, self.kick_force_max)
+                    kick = (math.cos(kick_angle) * kick_force, math.sin(kick_angle) * kick_force)
+                    ball_vel[0] += kick[0]
+                    ball_vel[1] += kick[1]
+                    self.last_kick_force = kick_force
+                    self.last_kick_angle = math.degrees(kick_angle)
+
+                # reflect_ball(): mirror about the wall normal, then apply friction
+                dot_product = ball_vel[0] * normal[0] + ball_vel[1] * normal[1]
+                ball_vel[0] -= 2 * dot_product * normal[0]
+                ball_vel[1] -= 2 * dot_product * normal[1]
+                ball_vel[0] *= self.friction
+                ball_vel[1] *= self.friction
+                self.bounce_angle = math.degrees(math.atan2(-ball_vel[1], ball_vel[0]))
+                self.total_bounces += 1
+                if self.telemetry is not None:  # step_count was already advanced for this frame
+                    self.telemetry.bounce(self.step_count - 1, i, velocity_in, tuple(normal), kick,
+                                          (ball_vel[0], ball_vel[1]))
+
+        self.ball_pos = new_ball_pos
+        self._keep_inside_g(new_ball_pos, hex_points)
+
+    def _is_near_corner_g(self, ball_pos, hex_points):
+        """is_near_corner() from the G script."""
+        threshold = self.corner_threshold
+        return any(math.sqrt((ball_pos[0] - p[0])**2 + (ball_pos[1] - p[1])**2) < threshold
+                   for p in hex_points)
+
+    def _keep_inside_g(self, ball_pos, hex_points):
+        """keep_ball_inside() from the G script."""
+        ball_radius = self.ball_radius
+        for i in range(6):
+            start_point = hex_points[i]
+            end_point = hex_points[(i + 1) % 6]
+            dist = _point_line_distance(ball_pos, start_point, end_point)
+            if dist < ball_radius:
+                # The script normalizes with sqrt(x**2 + y**2); keep that rather than frame.normals
+                edge_vector = [end_point[0] - start_point[0], end_point[1] - start_point[1]]
+                normal = [-edge_vector[1], edge_vector[0]]
+                normal_mag = math.sqrt(normal[0] ** 2 + normal[1] ** 2)
+                normal = [n / normal_mag for n in normal]
+                overlap = ball_radius - dist
+                ball_pos[0] += normal[0] * overlap
+                ball_pos[1] += normal[1] * overlap
+
+    # ---------------------------------------------------------------------------------------
+    def _step_manus(self):
+        """One frame of 2D_BouncingBall_Hexagon-Manus.py.
+
+        The Manus script works on 2-element NumPy arrays. np.dot and np.linalg.norm may round
+        differently from scalar Python arithmetic, so this variant keeps the same NumPy calls.
+        """
+        current_time = self.time
+        if current_time >= self.next_direction_change:
+            self._toggle_spin_manus(current_time)
+
+        # Update hexagon rotation
+        self.hexagon_angle += self.rotation_speed
+        self.frame = hexagon_frame(self.center, self.hexagon_radius, self.hexagon_angle, TURN_SPOKES)
+
+        # Update ball position with gravity
+        self.ball_vel[1] += self.gravity
+        self.ball_pos += self.ball_vel
+
+        self._check_collision_manus()
+        self._enforce_boundary_manus()
+
+        # The script counts the kick flash down while drawing
+        self.kick_flash = self.kick_effect_time > 0
+        if self.kick_flash:
+            self.kick_effect_time -= 1
+        self._advance_clock(self.frame_time)
+
+    def _toggle_spin_manus(self, current_time):
+        """toggle_spin_direction() from the Manus script."""
+        self.rotation_speed = -self.rotation_speed
+        self.spin_direction = 1 if self.rotation_speed > 0 else -1
+        self.direction_change_time = 0.0
+        self.next_direction_change = current_time + self.rng.uniform(self.spin_min, self.spin_max)
+
+    def _check_collision_manus(self):
+        """check_collision() and apply_random_kick() from the Manus script."""
+        vertices = self.frame.vertices
+        ball_radius = self.ball_radius
+        for i in range(6):
+            edge = (vertices[i], vertices[i + 1])
+            dist, nearest = _distance_point_to_line(self.ball_pos, edge[0], edge[1])
+            if dist <= ball_radius:
+                # Normal perpendicular to the edge, pointing toward the ball
+                edge_vec = np.array(edge[1]) - np.array(edge[0])
+                normal = np.array([-edge_vec[1], edge_vec[0]])
+                normal = normal / np.linalg.norm(normal)
+                if np.dot(normal, self.ball_pos - np.array(edge[0])) < 0:
+                    normal = -normal
+
+                # Move ball outside the edge
+                penetration = ball_radius - dist
+                self.ball_pos = self.ball_pos + penetration * normal
+                velocity_in = self.ball_vel.tolist()
+
+                # Angle between incoming velocity and normal
+                incoming_angle = _angle_degrees(self.ball_vel)
+                normal_angle = _angle_degrees(normal)
+                bounce_angle = abs(incoming_angle - normal_angle)
+                if bounce_angle > 180:
+                    bounce_angle = 360 - bounce_angle
+                self.bounce_angle = bounce_angle
+
+                # Reflect with friction, then add the drag of the rotating wall
+                self.ball_vel = _reflect_velocity(self.ball_vel, normal) * self.friction
+                tangent = np.array([normal[1], -normal[0]])
+                rotation_effect = self.rotation_speed * self.hexagon_radius * tangent
+                self.ball_vel = self.ball_vel + rotation_effect * 0.2
+
+                # Apply random kick
+                kick_force = self.rng.uniform(self.kick_force_min, self.kick_force_max)
+                kick_angle_rad = self.rng.uniform(0, 2 * math.pi)
+                kick = np.array([kick_force * math.cos(kick_angle_rad), kick_force * math.sin(kick_angle_rad)])
+                self.ball_vel += kick
+                self.last_kick_force = kick_force
+                self.last_kick_angle = math.degrees(kick_angle_rad)
+                self.kick_effect_time = self.kick_effect_duration
+                self.total_bounces += 1
+                if self.telemetry is not None:
+                    self.telemetry.bounce(self.step_count, i, velocity_in, normal.tolist(), kick.tolist(),
+                                          self.ball_vel.tolist())
+
+    def _enforce_boundary_manus(self):
+        """enforce_boundary() from the Manus script."""
+        dist_from_center = np.linalg.norm(self.ball_pos - self.center)
+        max_safe_dist = self.hexagon_radius - self.ball_radius - 5  # 5 pixel buffer
+        if dist_from_center > max_safe_dist:
+            to_center = self.center - self.ball_pos
+            to_center_norm = to_center / np.linalg.norm(to_center)
+            self.ball_pos = self.center - max_safe_dist * to_center_norm
+            if np.dot(self.ball_vel, to_center) < 0:  # If moving away from center
+                self.ball_vel = _reflect_velocity(self.ball_vel, to_center_norm) * self.friction
+
+    # ---------------------------------------------------------------------------------------
+    def _step_swept(self):
+        """One frame of the swept policy: D's forces, walls by time of impact."""
+        self.spin_timer += 1
+        if self.spin_timer > self.spin_duration:
+            self.spin_direction *= -1
+            self.spin_timer = 0
+            self.direction_change_time = 0.0
+            self.spin_duration = self.rng.randint(self.spin_min, self.spin_max)
+
+        h = 1 / self.substeps
+        omega = self.angular_velocity * self.spin_direction
+        gravity = self.gravity * h
+        friction = self.friction ** h
+        ball_vel = self.ball_vel
+        for _ in range(self.substeps):
+            ball_vel[1] += gravity
+            ball_vel[0] *= friction
+            ball_vel[1] *= friction
+            self._sweep(h, omega)
+        self.frame = hexagon_frame(self.center, self.hexagon_radius, self.hexagon_angle)
+
+        self.kick_flash = self.kick_effect_time > 0
+        if self.kick_flash:
+            self.kick_effect_time -= 1
+        self._advance_clock(self.frame_time)
+        self.bounce_angle = math.degrees(math.atan2(ball_vel[1], ball_vel[0]))
+
+    def _sweep(self, duration, omega):
+        """Move the ball and turn the hexagon through duration frames, bouncing at every contact."""
+        cx, cy = self.center
+        x = self.ball_pos[0] - cx
+        y = self.ball_pos[1] - cy
+        vx, vy = self.ball_vel
+        angle = self.hexagon_angle
+        limit = self.hexagon_radius * swept.APOTHEM - self.ball_radius
+        remaining = duration
+        for _ in range(self.max_contacts):
+            hit = swept.time_of_impact(x, y, vx, vy, angle, omega, limit, remaining)
+            if hit is None:
+                x += vx * remaining
+                y += vy * remaining
+                angle += omega * remaining
+                break
+            t, wall = hit
+            x += vx * t
+            y += vy * t
+            angle += omega * t
+            remaining -= t
+            nx, ny = swept.wall_normal(angle, wall)
+            velocity_in = (vx, vy)
+            vx, vy = swept.bounce(x, y, vx, vy, nx, ny, self.ball_radius, omega, self.restitution)
+
+            # Kick the ball off the wall, within kick_angle_min..max of the inward normal
+            kick_angle = math.atan2(-ny, -nx) + math.radians(self.rng.uniform(self.kick_angle_min,
+                                                                              self.kick_angle_max))
+            kick_force = self.rng.uniform(self.kick_force_min, self.kick_force_max)
+            kick_x = kick_force * math.cos(kick_angle)
+            kick_y = kick_force * math.sin(kick_angle)
+            vx += kick_x
+            vy += kick_y
+            self.last_kick_force = kick_force
+            self.last_kick_angle = math.degrees(kick_angle)
+            self.kick_effect_time = self.kick_effect_duration
+            self.total_bounces += 1
+            if self.telemetry is not None:
+                # swept.wall_normal points out of the hexagon; telemetry reports the inward normal
+                self.telemetry.bounce(self.step_count, wall, velocity_in, (-nx, -ny), (kick_x, kick_y), (vx, vy))
+        else:
+            # Out of contacts for this substep: ride along with the wall, which keeps every f_k
+            cos_a = math.cos(omega * remaining)
+            sin_a = math.sin(omega * remaining)
+            x, y = x * cos_a - y * sin_a, x * sin_a + y * cos_a
+            angle += omega * remaining
+
+        self.ball_pos[0] = cx + x
+        self.ball_pos[1] = cy + y
+        self.ball_vel[0] = vx
+        self.ball_vel[1] = vy
+        self.hexagon_angle = angle
+
+    # ---------------------------------------------------------------------------------------
+    def _advance_clock(self, dt):
+        self.step_count += 1
+        self.time += dt
+        self.direction_change_time += dt
+
+
+# ---------------------------------------------------------------------------------------
+def _point_line_distance(point, line_start, line_end):
+    """Distance from a point to the infinite line through two points (G script)."""
+    px, py = point
+    x1, y1 = line_start
+    x2, y2 = line_end
+    A = y2 - y1
+    B = x1 - x2
+    C = x2 * y1 - x1 * y2
+    return abs(A * px + B * py + C) / math.sqrt(A**2 + B**2)
+
+
+def _distance_point_to_line(point, line_start, line_end):
+    """Distance from a point to a line segment (Manus script)."""
+    line_vec = np.array(line_end) - np.array(line_start)
+    point_vec = np.array(point) - np.array(line_start)
+    line_len = np.linalg.norm(line_vec)
+    line_unitvec = line_vec / line_len
+    point_vec_scaled = point_vec / line_len
+
+    t = np.dot(line_unitvec, point_vec_scaled)
+    t = max(0, min(1, t))  # Clamp t to [0,1]
+
+    nearest = np.array(line_start) + t * line_vec
+    dist = np.linalg.norm(np.array(point) - nearest)
+    return dist, nearest
+
+
+def _reflect_velocity(velocity, normal):
+    """Reflect velocity vector across a normal vector."""
+    normal = normal / np.linalg.norm(normal)
+    return velocity - 2 * np.dot(velocity, normal) * normal
+
+
+def _angle_degrees(vector):
+    """Angle of a vector from the positive x-axis, in [0, 360)."""
+    return (math.degrees(math.atan2(vector[1], vector[0])) + 360) % 360
@@ -0,0 +1,106 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Text overlay (HUD) shared by the hexagon and cube scripts.
+
+The scripts used to call pygame.font.SysFont("Arial", 20) every frame (a system font lookup at
+60 Hz) and re-render every HUD line with font.render even when nothing on it had changed.
+    - get_font() creates each font once.
+    - HUD splits every line into a static label ("Ball Velocity: ") and a value ("3.25").
+      Label surfaces are rendered once; a value is re-rendered only when its text changes.
+    - refresh_hz optionally limits how often the values are refreshed, independently of the
+      physics/frame rate. Between refreshes the cached surfaces are blitted again.
+    - update() says whether anything on screen changed and draw() returns the area it covered,
+      for dirty_rects.DirtyRects.
+
+    hud = HUD(get_font("Arial", 20), YELLOW, line_height=20, refresh_hz=15)
+    ...
+    if hud.refresh_due():
+        hud.update([("Total Time: ", f"{total_time:.2f} s"), ...])
+    hud.draw(screen)
+"""
+###############################################################################################
+import pygame
+
+_fonts = {}
+
+
+def get_font(name, size):
+    """Return a cached font. name=None gives pygame's default font (pygame.font.Font(None, size))."""
+    if not pygame.font.get_init():
+        pygame.font.init()
+        _fonts.clear()  # Fonts created before a pygame.quit() are no longer usable
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(None, size) if name is None else pygame.font.SysFont(name, size)
+        _fonts[key] = font
+    return font
+
+
+class HUD:
+    """Lines of "label value" text with cached label surfaces and re-render-on-change values."""
+
+    def __init__(self, font, color, origin=(10, 10), line_height=20, refresh_hz=None):
+        self.font = font
+        self.color = color
+        self.origin = origin
+        self.line_height = line_height
+        self.refresh_hz = refresh_hz
+        self.renders = 0  # font.render calls so far, to see what the cache saves
+        self._next_refresh = 0
+        self._label_surfaces = {}
+        self._lines = []  # Per line: [label surface, value text, value surface]
+
+    def refresh_due(self, now_ms=None):
+        """True when the values should be refreshed this frame (always, without refresh_hz)."""
+        if self.refresh_hz is None:
+            return True
+        now = pygame.time.get_ticks() if now_ms is None else now_ms
+        if now < self._next_refresh:
+            return False
+        self._next_refresh = now + 1000 / self.refresh_hz
+        return True
+
+    def update(self, lines):
+        """Set the HUD lines, a list of (label, value) string pairs. Returns True if any text changed."""
+        changed = len(self._lines) > len(lines)
+        del self._lines[len(lines):]
+        for i, (label, value) in enumerate(lines):
+            label_surface = self._label(label)
+            if i == len(self._lines):
+                self._lines.append([label_surface, value, self._render(value)])
+                changed = True
+                continue
+            line = self._lines[i]
+            if line[0] is not label_surface:
+                line[0] = label_surface
+                changed = True
+            if line[1] != value:
+                line[1] = value
+                line[2] = self._render(value)
+                changed = True
+        return changed
+
+    def draw(self, surface):
+        """Blit the current lines onto surface. Returns the Rect they cover."""
+        x, y = self.origin
+        area = pygame.Rect(x, y, 0, 0)
+        for label_surface, _, value_surface in self._lines:
+            area.union_ip(surface.blit(label_surface, (x, y)))
+            area.union_ip(surface.blit(value_surface, (x + label_surface.get_width(), y)))
+            y += self.line_height
+        return area
+
+    # ---------------------------------------------------------------------------------------
+    def _label(self, text):
+        label_surface = self._label_surfaces.get(text)
+        if label_surface is None:
+            label_surface = self._label_surfaces[text] = self._render(text)
+        return label_surface
+
+    def _render(self, text):
+        self.renders += 1
+        return self.font.render(text, True, self.color)
@@ -0,0 +1,586 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Compiled physics kernels for the Manus hexagon and the Manus cube, with a pure-Python fallback.
+
+The Manus scripts work on 2- and 3-element NumPy arrays: _distance_point_to_line builds five
+temporary arrays per wall per frame and apply_collision_response does the same with 3-vectors,
+so NumPy's per-call overhead is most of the step. Here the whole state of a run lives in one flat,
+preallocated float64 buffer (the S_* / C_* offsets below), the parameters in another, and a
+kernel advances the state by many steps per call with plain scalar arithmetic:
+
+    sim = HexagonKernelSim(seed=42)                  numba if it is installed, else Python
+    sim = CubeKernelSim("Manus-3d", seed=42, backend="python")
+    sim.step(100_000)
+
+The same kernel source runs either way: compiled with numba.njit when numba is installed, or as
+ordinary Python on lists otherwise. The lists are kept between calls (the state is copied back
+only when it is read), so step() one frame at a time costs about as much as a frame of
+step(100_000). Randomness cannot come from random.Random inside a compiled
+kernel, so the Mersenne Twister's raw 32-bit words are drawn in blocks with rng.getrandbits(32)
+and the kernel turns them into random() and randint() values exactly as CPython does. A seeded
+kernel run therefore consumes the same random numbers as HexagonSim("Manus") / CubeSim("Manus").
+The two backends are bit-identical to each other. They are not bit-identical to the NumPy
+engines: np.dot, np.linalg.norm and the 3x3 matmuls go through BLAS, which fuses multiply-adds on
+CPUs that have them, so the last bits differ within the first hundred steps. In the cube the
+difference stays near 1e-12 px. In the hexagon it grows chaotically (5.7e-14 px at step 75 for
+seed 3, a few pixels thousands of steps later) until a bounce lands on a different frame; from
+then on the two runs are unrelated, hundreds of pixels apart. The self-check therefore compares
+against the NumPy engine only up to the first step where the bounce counts differ, and fails if
+the deviation there exceeds --tolerance or the counts part within --min-window steps.
+
+The sims expose the engine attributes (ball_pos, ball_vel, angle_radians / angles, total_bounces,
+kick_flash, time, ...), so scenes, recording.state_row and play.py take them as they are.
+
+    python kernels.py                  check that the backends produce identical trajectories, and
+                                       that they follow the NumPy engines until the bounces diverge
+    python kernels.py --steps 100000 --tolerance 1
+"""
+###############################################################################################
+import argparse
+import math
+import random
+import sys
+import time
+
+import numpy as np
+
+import cube_sim
+import hexagon_sim
+import swept
+
+try:
+    import numba
+except ImportError:  # Optional: the Python path gives the same results, only slower
+    numba = None
+
+BACKENDS = ("numba", "python") if numba is not None else ("python",)
+
+# Hexagon state buffer offsets
+S_X, S_Y, S_VX, S_VY = 0, 1, 2, 3
+S_ANGLE, S_ROTATION, S_SPIN = 4, 5, 6
+S_TIME, S_NEXT_CHANGE, S_CHANGE_TIME, S_STEP = 7, 8, 9, 10
+S_BOUNCES, S_KICK_TIME, S_KICK_FLASH, S_KICK_FORCE, S_KICK_ANGLE, S_BOUNCE_ANGLE = 11, 12, 13, 14, 15, 16
+S_CURSOR = 17  # Next unused random word
+HEXAGON_STATE = 18
+
+# Cube state buffer offsets
+C_X, C_Y, C_Z, C_VX, C_VY, C_VZ = 0, 1, 2, 3, 4, 5
+C_PITCH, C_YAW, C_ROLL, C_DIR_X, C_DIR_Y, C_DIR_Z = 6, 7, 8, 9, 10, 11
+C_TIME, C_NEXT_CHANGE, C_CHANGE_TIME, C_STEP = 12, 13, 14, 15
+C_BOUNCES, C_KICK_TIME, C_KICK_FLASH, C_KICK_FORCE, C_KICK_ANGLE, C_BOUNCE_ANGLE, C_FACE = 16, 17, 18, 19, 20, 21, 22
+C_CURSOR = 23
+CUBE_STATE = 24
+
+# Parameter buffer offsets (shared layout, unused entries stay 0)
+P_CX, P_CY, P_SIZE, P_BALL_RADIUS, P_GRAVITY, P_FRICTION = 0, 1, 2, 3, 4, 5
+P_KICK_MIN, P_KICK_MAX, P_SPIN_MIN, P_SPIN_MAX, P_KICK_DURATION, P_FRAME_TIME, P_SPEED = 6, 7, 8, 9, 10, 11, 12
+PARAMS = 13
+
+# Random words one step may use at most: hexagon 2 + 6 walls * 4, cube 2 * (1 + 2) + 3 faces * 6
+HEXAGON_WORDS = 26
+CUBE_WORDS = 24
+WORD_BLOCK = 4096
+
+
+def _build(jit):
+    """The kernels, compiled with jit (numba.njit) or left as Python (jit = identity)."""
+
+    @jit
+    def random_at(words, cursor):
+        """random.Random.random() from two 32-bit Mersenne Twister words."""
+        a = words[cursor] >> 5
+        b = words[cursor + 1] >> 6
+        return (a * 67108864.0 + b) * (1.0 / 9007199254740992.0)
+
+    @jit
+    def hexagon_manus_steps(state, params, words, n):
+        """Up to n frames of 2D_BouncingBall_Hexagon-Manus.py. Returns the frames done."""
+        cx = params[P_CX]
+        cy = params[P_CY]
+        radius = params[P_SIZE]
+        ball_radius = params[P_BALL_RADIUS]
+        gravity = params[P_GRAVITY]
+        friction = params[P_FRICTION]
+        turn = 2 * math.pi / 6
+        done = 0
+        while done < n and len(words) - state[S_CURSOR] >= HEXAGON_WORDS:
+            cursor = int(state[S_CURSOR])
+            now = state[S_TIME]
+            if now >= state[S_NEXT_CHANGE]:  # toggle_spin_direction()
+                rotation = -state[S_ROTATION]
+                state[S_ROTATION] = rotation
+                state[S_SPIN] = 1.0 if rotation > 0 else -1.0
+                state[S_CHANGE_TIME] = 0.0
+                u = random_at(words, cursor)
+                cursor += 2
+                state[S_NEXT_CHANGE] = now + (params[P_SPIN_MIN] + (params[P_SPIN_MAX] - params[P_SPIN_MIN]) * u)
+
+            rotation = state[S_ROTATION]
+            angle = state[S_ANGLE] + rotation
+            state[S_ANGLE] = angle
+            vx = state[S_VX]
+            vy = state[S_VY] + gravity
+            px = state[S_X] + vx
+            py = state[S_Y] + vy
+
+            # check_collision(): distance_point_to_line against every wall
+            for i in range(6):
+                theta = i * turn + angle
+                x1 = cx + radius * math.cos(theta)
+                y1 = cy + radius * math.sin(theta)
+                theta = ((i + 1) % 6) * turn + angle
+                x2 = cx + radius * math.cos(theta)
+                y2 = cy + radius * math.sin(theta)
+                lx = x2 - x1
+                ly = y2 - y1
+                length = math.sqrt(lx * lx + ly * ly)
+                t = lx / length * ((px - x1) / length) + ly / length * ((py - y1) / length)
+                t = max(0.0, min(1.0, t))
+                dx = px - (x1 + t * lx)
+                dy = py - (y1 + t * ly)
+                dist = math.sqrt(dx * dx + dy * dy)
+                if dist > ball_radius:
+                    continue
+
+                # Normal perpendicular to the edge, pointing toward the ball
+                length = math.sqrt(ly * ly + lx * lx)
+                nx = -ly / length
+                ny = lx / length
+                if nx * (px - x1) + ny * (py - y1) < 0:
+                    nx = -nx
+                    ny = -ny
+                penetration = ball_radius - dist
+                px = px + penetration * nx
+                py = py + penetration * ny
+
+                incoming = (math.degrees(math.atan2(vy, vx)) + 360) % 360
+                bounce_angle = abs(incoming - (math.degrees(math.atan2(ny, nx)) + 360) % 360)
+                state[S_BOUNCE_ANGLE] = 360 - bounce_angle if bounce_angle > 180 else bounce_angle
+
+                # Reflect with friction, then add the drag of the rotating wall
+                length = math.sqrt(nx * nx + ny * ny)
+                mx = nx / length
+                my = ny / length
+                dot = vx * mx + vy * my
+                vx = (vx - 2 * dot * mx) * friction
+                vy = (vy - 2 * dot * my) * friction
+                drag = rotation * radius
+                vx = vx + drag * ny * 0.2
+                vy = vy + drag * -nx * 0.2
+
+                # apply_random_kick()
+                kick_force = params[P_KICK_MIN] + (params[P_KICK_MAX] - params[P_KICK_MIN]) * random_at(words, cursor)
+                kick_angle = 0.0 + (2 * math.pi - 0.0) * random_at(words, cursor + 2)
+                cursor += 4
+                vx += kick_force * math.cos(kick_angle)
+                vy += kick_force * math.sin(kick_angle)
+                state[S_KICK_FORCE] = kick_force
+                state[S_KICK_ANGLE] = math.degrees(kick_angle)
+                state[S_KICK_TIME] = params[P_KICK_DURATION]
+                state[S_BOUNCES] += 1
+
+            # enforce_boundary()
+            dx = px - cx
+            dy = py - cy
+            max_safe = radius - ball_radius - 5
+            if math.sqrt(dx * dx + dy * dy) > max_safe:
+                tx = cx - px
+                ty = cy - py
+                length = math.sqrt(tx * tx + ty * ty)
+                nx = tx / length
+                ny = ty / length
+                px = cx - max_safe * nx
+                py = cy - max_safe * ny
+                if vx * tx + vy * ty < 0:
+                    length = math.sqrt(nx * nx + ny * ny)
+                    mx = nx / length
+                    my = ny / length
+                    dot = vx * mx + vy * my
+                    vx = (vx - 2 * dot * mx) * friction
+                    vy = (vy - 2 * dot * my) * friction
+
+            state[S_X] = px
+            state[S_Y] = py
+            state[S_VX] = vx
+            state[S_VY] = vy
+            kick_time = state[S_KICK_TIME]
+            state[S_KICK_FLASH] = 1.0 if kick_time > 0 else 0.0
+            if kick_time > 0:
+                state[S_KICK_TIME] = kick_time - 1
+            state[S_STEP] += 1
+            state[S_TIME] = now + params[P_FRAME_TIME]
+            state[S_CHANGE_TIME] += params[P_FRAME_TIME]
+            state[S_CURSOR] = cursor
+            done += 1
+        return done
+
+    @jit
+    def cube_manus_steps(state, params, words, n):
+        """Up to n frames of 3D_BouncingBall_Cube-Manus.py. Returns the frames done."""
+        half = params[P_SIZE] / 2
+        ball_radius = params[P_BALL_RADIUS]
+        gravity = params[P_GRAVITY]
+        friction = params[P_FRICTION]
+        speed = params[P_SPEED]
+        pos = [0.0, 0.0, 0.0]
+        vel = [0.0, 0.0, 0.0]
+        done = 0
+        while done < n and len(words) - state[C_CURSOR] >= CUBE_WORDS:
+            cursor = int(state[C_CURSOR])
+            now = state[C_TIME]
+            if now >= state[C_NEXT_CHANGE]:  # toggle_rotation_direction(): randint(0, 2), then uniform
+                axis = words[cursor] >> 30
+                cursor += 1
+                while axis >= 3:
+                    axis = words[cursor] >> 30
+                    cursor += 1
+                state[C_DIR_X + axis] = -state[C_DIR_X + axis]
+                state[C_CHANGE_TIME] = 0.0
+                u = random_at(words, cursor)
+                cursor += 2
+                state[C_NEXT_CHANGE] = now + (params[P_SPIN_MIN] + (params[P_SPIN_MAX] - params[P_SPIN_MIN]) * u)
+
+            pitch = state[C_PITCH] + speed * state[C_DIR_X]
+            yaw = state[C_YAW] + speed * state[C_DIR_Y]
+            roll = state[C_ROLL] + speed * state[C_DIR_Z]
+            state[C_PITCH] = pitch
+            state[C_YAW] = yaw
+            state[C_ROLL] = roll
+
+            # rotated_gravity = rot_x @ rot_y @ rot_z @ [0, gravity, 0]
+            cx, sx = math.cos(pitch), math.sin(pitch)
+            cy, sy = math.cos(yaw), math.sin(yaw)
+            cz, sz = math.cos(roll), math.sin(roll)
+            # rot_x @ rot_y, then its product with rot_z's middle column (the only one gravity uses)
+            a00, a01, a02 = cy, 0.0, sy
+            a10, a11, a12 = sx * sy, cx, -sx * cy
+            a20, a21, a22 = -cx * sy, sx, cx * cy
+            gx = (a00 * -sz + a01 * cz + a02 * 0.0) * gravity
+            gy = (a10 * -sz + a11 * cz + a12 * 0.0) * gravity
+            gz = (a20 * -sz + a21 * cz + a22 * 0.0) * gravity
+            for k in range(3):
+                vel[k] = state[C_VX + k]
+            vel[0] += gx
+            vel[1] += gy
+            vel[2] += gz
+            for k in range(3):
+                pos[k] = state[C_X + k] + vel[k]
+
+            # check_cube_collision() and apply_collision_response()
+            for axis in range(3):
+                p = pos[axis]
+                if abs(p) + ball_radius <= half:
+                    continue
+                normal = -1.0 if p > 0 else 1.0
+                pos[axis] = p - (abs(p) + ball_radius - half) * (1.0 if p > 0 else (-1.0 if p < 0 else 0.0))
+                state[C_FACE] = 2 * (2 - axis) + (1 if p > 0 else 0)
+
+                incoming = math.sqrt(vel[0] * vel[0] + vel[1] * vel[1] + vel[2] * vel[2])
+                dot = vel[axis] * normal
+                if incoming > 0:
+                    state[C_BOUNCE_ANGLE] = math.degrees(math.acos(min(1.0, abs(dot) / incoming)))
+                vel[axis] = (vel[axis] - 2 * dot * normal)
+                for k in range(3):
+                    vel[k] = vel[k] * friction
+
+                kick_force = params[P_KICK_MIN] + (params[P_KICK_MAX] - params[P_KICK_MIN]) * random_at(words, cursor)
+                theta = 0.0 + (math.pi * 2 - 0.0) * random_at(words, cursor + 2)
+                phi = 0.0 + (math.pi - 0.0) * random_at(words, cursor + 4)
+                cursor += 6
+                vel[0] += kick_force * math.sin(phi) * math.cos(theta)
+                vel[1] += kick_force * math.sin(phi) * math.sin(theta)
+                vel[2] += kick_force * math.cos(phi)
+                state[C_KICK_FORCE] = kick_force
+                state[C_KICK_ANGLE] = math.degrees(theta)
+                state[C_KICK_TIME] = params[P_KICK_DURATION]
+                state[C_BOUNCES] += 1
+
+            # enforce_boundary()
+            limit = half - ball_radius
+            for k in range(3):
+                state[C_X + k] = max(-limit, min(limit, pos[k]))
+                state[C_VX + k] = vel[k]
+            kick_time = state[C_KICK_TIME]
+            state[C_KICK_FLASH] = 1.0 if kick_time > 0 else 0.0
+            if kick_time > 0:
+                state[C_KICK_TIME] = kick_time - 1
+            state[C_STEP] += 1
+            state[C_TIME] = now + params[P_FRAME_TIME]
+            state[C_CHANGE_TIME] += params[P_FRAME_TIME]
+            state[C_CURSOR] = cursor
+            done += 1
+        return done
+
+    return hexagon_manus_steps, cube_manus_steps
+
+
+_KERNELS = {"python": _build(lambda function: function)}
+if numba is not None:
+    _KERNELS["numba"] = _build(numba.njit)
+
+
+class _KernelSim:
+    """Flat buffers, the random word supply and the backend choice shared by both sims."""
+
+    words_per_step = 0
+    state_size = 0
+
+    def __init__(self, defaults, variant, seed, backend, params):
+        if backend == "auto":
+            backend = BACKENDS[0]
+        if backend not in _KERNELS:
+            raise ValueError(f"Backend {backend!r} is not available, expected one of {BACKENDS}")
+        settings = dict(defaults)
+        unknown = set(params) - set(settings)
+        if unknown:
+            raise TypeError(f"Unknown {variant} parameter(s): {', '.join(sorted(unknown))}")
+        settings.update(params)
+
+        self.variant = variant
+        self.seed = seed
+        self.backend = backend
+        self.params = settings
+        self.rng = random.Random(seed)
+        for name, value in settings.items():
+            if name not in ("ball_pos", "ball_vel"):  # Starting values; the live ones are in the state
+                setattr(self, name, value)
+        self.frame_time = 1 / self.fps
+        self._state = np.zeros(self.state_size)
+        self.param_buffer = np.zeros(PARAMS)
+        self.words = np.zeros(0, dtype=np.int64)
+        # Python backend: lists index several times faster than arrays from Python, so the state,
+        # parameters and random words stay lists between calls. _state_list is the live state
+        # until self.state is read; the words never leave their list.
+        self._state_list = None
+        self._param_list = None
+        self._word_list = []
+
+    @property
+    def state(self):
+        """The state buffer. On the Python backend, reading it copies the live list back first."""
+        if self._state_list is not None:
+            self._state[:] = self._state_list
+            self._state_list = None  # The array may be written to: the next call starts from it
+        return self._state
+
+    def _run(self, kernel, cursor_offset, n):
+        """Call the kernel until n steps are done, topping up the random words in between."""
+        if self.backend == "python":
+            self._run_python(kernel, cursor_offset, n)
+            return
+        state = self._state
+        while n > 0:
+            cursor = int(state[cursor_offset])
+            if len(self.words) - cursor < self.words_per_step:
+                fresh = [self.rng.getrandbits(32) for _ in range(WORD_BLOCK)]
+                self.words = np.concatenate([self.words[cursor:], np.array(fresh, dtype=np.int64)])
+                state[cursor_offset] = 0
+            n -= kernel(state, self.param_buffer, self.words, n)
+
+    def _run_python(self, kernel, cursor_offset, n):
+        """_run on lists: converted once, not on every call."""
+        state = self._state_list
+        if state is None:
+            state = self._state_list = self._state.tolist()
+        if self._param_list is None:
+            self._param_list = self.param_buffer.tolist()
+        while n > 0:
+            cursor = int(state[cursor_offset])
+            if len(self._word_list) - cursor < self.words_per_step:
+                self._word_list = self._word_list[cursor:] + [self.rng.getrandbits(32) for _ in range(WORD_BLOCK)]
+                state[cursor_offset] = 0
+            n -= kernel(state, self._param_list, self._word_list, n)
+
+    @property
+    def step_count(self):
+        return int(self.state[self._step_offset])
+
+    @property
+    def time(self):
+        return float(self.state[self._time_offset])
+
+    @property
+    def total_bounces(self):
+        return int(self.state[self._bounces_offset])
+
+    @property
+    def kick_flash(self):
+        return bool(self.state[self._bounces_offset + 2])
+
+    @property
+    def last_kick_force(self):
+        return float(self.state[self._bounces_offset + 3])
+
+    @property
+    def last_kick_angle(self):
+        return float(self.state[self._bounces_offset + 4])
+
+    @property
+    def bounce_angle(self):
+        return float(self.state[self._bounces_offset + 5])
+
+
+class HexagonKernelSim(_KernelSim):
+    """HexagonSim("Manus") on a flat state buffer, stepped by a compiled or Python kernel."""
+
+    kind = "hexagon"
+    state_size = HEXAGON_STATE
+    words_per_step = HEXAGON_WORDS
+    _step_offset, _time_offset, _bounces_offset = S_STEP, S_TIME, S_BOUNCES
+
+    def __init__(self, variant="Manus", seed=None, backend="auto", **params):
+        if variant != "Manus":
+            raise ValueError(f"The hexagon kernel runs the Manus policy, got variant {variant!r}")
+        super().__init__(hexagon_sim.VARIANTS[variant], variant, seed, backend, params)
+        self.center = (self.width // 2, self.height // 2)
+        state = self.state
+        state[S_X], state[S_Y] = self.params["ball_pos"]
+        state[S_VX], state[S_VY] = self.params["ball_vel"]
+        state[S_ROTATION] = self.angular_velocity
+        state[S_SPIN] = 1
+        state[S_NEXT_CHANGE] = self.rng.uniform(self.spin_min, self.spin_max)
+        self.param_buffer[:] = [*self.center, self.hexagon_radius, self.ball_radius, self.gravity, self.friction,
+                                self.kick_force_min, self.kick_force_max, self.spin_min, self.spin_max,
+                                self.kick_effect_duration, self.frame_time, 0.0]
+
+    @property
+    def ball_pos(self):
+        return self.state[S_X:S_Y + 1]  # A view into the state buffer, current as of this read
+
+    @property
+    def ball_vel(self):
+        return self.state[S_VX:S_VY + 1]
+
+    def step(self, n=1):
+        """Advance the simulation by n frames."""
+        self._run(_KERNELS[self.backend][0], S_CURSOR, n)
+
+    @property
+    def angle_radians(self):
+        return float(self.state[S_ANGLE])
+
+    @property
+    def spin_direction(self):
+        return int(self.state[S_SPIN])
+
+    def overlap(self):
+        """How far (pixels) the ball reaches past the nearest wall, as HexagonSim.overlap()."""
+        limit = self.hexagon_radius * swept.APOTHEM - self.ball_radius
+        return swept.overlap(self.state[S_X] - self.center[0], self.state[S_Y] - self.center[1],
+                             self.angle_radians, limit)
+
+
+class CubeKernelSim(_KernelSim):
+    """CubeSim("Manus" / "Manus-3d") on a flat state buffer, stepped by a compiled or Python kernel."""
+
+    kind = "cube"
+    state_size = CUBE_STATE
+    words_per_step = CUBE_WORDS
+    _step_offset, _time_offset, _bounces_offset = C_STEP, C_TIME, C_BOUNCES
+
+    def __init__(self, variant="Manus", seed=None, backend="auto", **params):
+        if not variant.startswith("Manus"):
+            raise ValueError(f"The cube kernel runs the Manus policy, got variant {variant!r}")
+        super().__init__(cube_sim.VARIANTS[variant], variant, seed, backend, params)
+        rng = self.rng
+        state = self.state
+        state[C_VX:C_VZ + 1] = [rng.uniform(-2, 2), rng.uniform(-2, 2), rng.uniform(-2, 2)]
+        state[C_PITCH:C_ROLL + 1] = self.initial_angle
+        state[C_DIR_X:C_DIR_Z + 1] = 1
+        state[C_NEXT_CHANGE] = rng.uniform(self.spin_min, self.spin_max)
+        self.param_buffer[:] = [0.0, 0.0, self.cube_size, self.ball_radius, self.gravity, self.friction,
+                                self.kick_force_min, self.kick_force_max, self.spin_min, self.spin_max,
+                                self.kick_effect_duration, self.frame_time, self.rotation_speed]
+
+    @property
+    def ball_pos(self):
+        return self.state[C_X:C_Z + 1]
+
+    @property
+    def ball_vel(self):
+        return self.state[C_VX:C_VZ + 1]
+
+    def step(self, n=1):
+        """Advance the simulation by n frames."""
+        self._run(_KERNELS[self.backend][1], C_CURSOR, n)
+
+    @property
+    def angles(self):
+        """(pitch, yaw, roll) in radians."""
+        return tuple(float(angle) for angle in self.state[C_PITCH:C_ROLL + 1])
+
+    @property
+    def last_face_hit(self):
+        return cube_sim.FACE_NAMES[int(self.state[C_FACE])] if self.total_bounces else "None"
+
+    def overlap(self):
+        """How far (pixels) the ball reaches past the nearest face, as CubeSim.overlap()."""
+        return float(np.abs(self.ball_pos).max()) - (self.cube_size / 2 - self.ball_radius)
+
+
+KERNEL_ENGINES = {"hexagon": HexagonKernelSim, "cube": CubeKernelSim}
+
+
+# ---------------------------------------------------------------------------------------
+def _trajectory(sim, steps):
+    """(steps, 4 or 6) positions and velocities after every step, and the bounce count after every step."""
+    rows = np.empty((steps, 2 * len(sim.ball_pos)))
+    bounces = np.empty(steps, dtype=np.int64)
+    for i in range(steps):
+        sim.step()
+        rows[i] = [*sim.ball_pos, *sim.ball_vel]
+        bounces[i] = sim.total_bounces
+    return rows, bounces
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that every kernel backend gives the same trajectories.")
+    parser.add_argument("--steps", type=int, default=20_000)
+    parser.add_argument("--seeds", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=5.0,
+                        help="largest deviation (px, px/frame) from the NumPy engine before the bounces diverge")
+    parser.add_argument("--min-window", type=int, default=1000,
+                        help="fewest steps the bounce counts must agree with the NumPy engine")
+    args = parser.parse_args()
+
+    print(f"backends: {', '.join(BACKENDS)}" + ("" if numba else " (numba is not installed)"))
+    failed = False
+    for kind, variant, reference in (("hexagon", "Manus", hexagon_sim.HexagonSim),
+                                     ("cube", "Manus", cube_sim.CubeSim),
+                                     ("cube", "Manus-3d", cube_sim.CubeSim)):
+        for seed in range(args.seeds):
+            expected, expected_bounces = _trajectory(reference(variant, seed=seed), args.steps)
+            runs = {}
+            for backend in BACKENDS:
+                sim = KERNEL_ENGINES[kind](variant, seed=seed, backend=backend)
+                sim.step()  # Compile outside the timing
+                sim = KERNEL_ENGINES[kind](variant, seed=seed, backend=backend)
+                start = time.perf_counter()
+                sim.step(args.steps)
+                seconds = time.perf_counter() - start
+                runs[backend] = (_trajectory(KERNEL_ENGINES[kind](variant, seed=seed, backend=backend), args.steps),
+                                 args.steps / seconds)
+            (rows, bounces), _ = runs[BACKENDS[0]]
+            identical = all(np.array_equal(rows, other_rows, equal_nan=True) and np.array_equal(bounces, other_bounces)
+                            for (other_rows, other_bounces), _ in runs.values())
+
+            # Past the first bounce on a different frame the runs are unrelated: compare only before it
+            diverged = np.flatnonzero(bounces != expected_bounces)
+            window = int(diverged[0]) if len(diverged) else args.steps
+            deviation = float(np.abs(rows[:window] - expected[:window]).max()) if window else 0.0
+            follows = deviation <= args.tolerance and window >= min(args.min_window, args.steps)
+            failed |= not (identical and follows)
+
+            speeds = ", ".join(f"{backend} {rate:,.0f}/s" for backend, (_, rate) in runs.items())
+            print(f"{kind} {variant} seed {seed}: backends {'identical' if identical else 'DIFFER'}; "
+                  f"vs NumPy engine max deviation {deviation:.3g} over {window} steps"
+                  + ("" if window == args.steps else " (then the bounces diverge)")
+                  + ("" if follows else " FAIL") + f"; {speeds}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
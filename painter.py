@@ -0,0 +1,234 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Painter's algorithm for the 3D cube scripts: one depth-sorted draw list per frame.
+
+draw_cube sorted the six faces by their mean depth, then drew every edge and the ball on top, so
+the ball was never covered by a front face; the D and G scripts drew the edges and then the ball
+without sorting at all. CubePainter collects the faces, the edges and the balls of a frame with
+one depth each, sorts them once and draws them farthest first, so a ball passes behind the front
+faces and edges and in front of the back ones:
+
+    painter = CubePainter(cube_faces, face_colors, cube_edges, WHITE)
+    painter.cube(rotated_vertices, projected_vertices)
+    painter.balls(projected_balls, ball_depths, radii, RED)
+    painter.draw(screen)
+
+Depth is the camera-space z the projection divides by (larger is farther, for perspective_project
+and fov_project alike): a face's depth is the mean z of its corners, an edge's the z of its
+midpoint. Consecutive balls in the sorted order are drawn by one BallSprites.draw_many call.
+
+DrawList does the sorting. Every item's depth is quantized to 1/256 and packed with its insertion
+slot into one int64 key. The keys are unique, so an in-place ndarray.sort() of the preallocated
+key array puts equal depths in insertion order, as a stable sort would, without allocating a new
+array. The capacity is fixed when the list is made, which bounds the cost of a frame's sort;
+sort_ns and max_sort_ns report it, and
+
+    python painter.py
+
+measures the sort for up to tens of thousands of balls and faces subdivided up to 16x16.
+"""
+###############################################################################################
+import argparse
+from time import perf_counter_ns
+
+import numpy as np
+import pygame
+
+from cube_render import FaceRenderer
+from sprites import BallSprites
+
+FACE, EDGE, BALL = 0, 1, 2  # Item kinds
+
+DEPTH_UNITS = 256  # Quantization steps per unit of depth
+SLOT_BITS = 24  # Up to 16M items
+SLOT_MASK = (1 << SLOT_BITS) - 1
+DEPTH_LIMIT = (1 << (62 - SLOT_BITS)) - 1  # Quantized depths are clipped to +-DEPTH_LIMIT
+
+
+class DrawList:
+    """Items (kind, index, depth) sorted farthest first, in preallocated arrays."""
+
+    def __init__(self, capacity=4096):
+        if capacity > SLOT_MASK + 1:
+            raise ValueError(f"DrawList capacity is at most {SLOT_MASK + 1}")
+        self.capacity = capacity
+        self.count = 0
+        self.kinds = np.empty(capacity, dtype=np.int8)  # In draw order after sort()
+        self.indices = np.empty(capacity, dtype=np.int64)
+        self.sort_ns = 0  # Last sort()
+        self.max_sort_ns = 0
+        self.total_sort_ns = 0
+        self.sorts = 0
+        self._kinds = np.empty(capacity, dtype=np.int8)  # In insertion order
+        self._indices = np.empty(capacity, dtype=np.int64)
+        self._depths = np.empty(capacity)
+        self._keys = np.empty(capacity, dtype=np.int64)
+        self._slots = np.arange(capacity, dtype=np.int64)
+        self._order = np.empty(capacity, dtype=np.int64)
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def add(self, kind, depths):
+        """Append one item of kind per depth, with indices 0, 1, ... in the order given."""
+        start = self.count
+        end = start + len(depths)
+        if end > self.capacity:
+            raise ValueError(f"DrawList holds at most {self.capacity} items, got {end}")
+        self._kinds[start:end] = kind
+        self._indices[start:end] = self._slots[:end - start]
+        # Negated so that ascending keys are farthest first
+        np.multiply(depths, -DEPTH_UNITS, out=self._depths[start:end])
+        self.count = end
+
+    def sort(self):
+        """Put kinds[:count] and indices[:count] in drawing order, farthest first."""
+        started = perf_counter_ns()
+        n = self.count
+        depths = self._depths[:n]
+        keys = self._keys[:n]
+        np.rint(depths, out=depths)
+        np.clip(depths, -DEPTH_LIMIT, DEPTH_LIMIT, out=depths)
+        np.copyto(keys, depths, casting="unsafe")
+        np.left_shift(keys, SLOT_BITS, out=keys)
+        np.bitwise_or(keys, self._slots[:n], out=keys)
+        keys.sort()
+        order = self._order[:n]
+        np.bitwise_and(keys, SLOT_MASK, out=order)
+        # mode="clip": with the default "raise", take() buffers out in a temporary array
+        np.take(self._kinds[:n], order, out=self.kinds[:n], mode="clip")
+        np.take(self._indices[:n], order, out=self.indices[:n], mode="clip")
+
+        elapsed = self.sort_ns = perf_counter_ns() - started
+        self.max_sort_ns = max(self.max_sort_ns, elapsed)
+        self.total_sort_ns += elapsed
+        self.sorts += 1
+
+    def runs(self):
+        """After sort(): (kind, indices) for every run of consecutive items of one kind."""
+        n = self.count
+        if not n:
+            return
+        kinds = self.kinds[:n]
+        start = 0
+        for end in (np.flatnonzero(kinds[1:] != kinds[:-1]) + 1).tolist() + [n]:
+            yield int(kinds[start]), self.indices[start:end]
+            start = end
+
+    def summary(self):
+        """One line: mean and worst sort time."""
+        if not self.sorts:
+            return "No sorts"
+        return (f"Draw list sort: {self.total_sort_ns / self.sorts / 1000:.1f} us mean, "
+                f"{self.max_sort_ns / 1000:.1f} us max over {self.sorts} frames")
+
+
+class CubePainter:
+    """The faces, edges and balls of one frame, drawn back to front."""
+
+    def __init__(self, faces, face_colors, edges, edge_color, edge_width=1,
+                 face_renderer=None, sprites=None, capacity=4096):
+        self.faces = np.asarray(faces, dtype=np.int64).reshape(-1, 4)
+        self.face_colors = list(face_colors)
+        self.edges = np.asarray(edges, dtype=np.int64)
+        self.edge_color = edge_color
+        self.edge_width = edge_width
+        self.face_renderer = face_renderer if face_renderer is not None else FaceRenderer()
+        self.sprites = sprites if sprites is not None else BallSprites()
+        self.list = DrawList(capacity)
+        self._face_points = self.faces.tolist()
+        self._edge_points = self.edges.tolist()
+        self._projected = None
+        self._edge_colors = None
+        self._balls = None
+
+    def cube(self, rotated, projected, edge_colors=None):
+        """Queue the cube: rotated (8, 3) camera-space vertices and their 8 screen positions.
+
+        edge_colors: one color per edge for this frame instead of edge_color.
+        """
+        self._projected = projected.tolist() if isinstance(projected, np.ndarray) else projected
+        self._edge_colors = edge_colors
+        z = rotated[:, 2]
+        if len(self.faces):
+            self.list.add(FACE, z[self.faces].mean(axis=1))
+        self.list.add(EDGE, z[self.edges].mean(axis=1))
+
+    def balls(self, centers, depths, radii, colors):
+        """Queue balls: (N, 2) screen centers, N depths, one radius or N, one color or (N, 3)."""
+        centers = np.asarray(centers)
+        radii = np.asarray(radii)
+        colors = np.asarray(colors)
+        self._balls = (centers, radii, colors)
+        self.list.add(BALL, np.asarray(depths, dtype=float).reshape(len(centers)))
+
+    def draw(self, surface):
+        """Sort the queued items once and draw them farthest first. Empties the list."""
+        draw_list = self.list
+        draw_list.sort()
+        projected = self._projected
+        for kind, indices in draw_list.runs():
+            if kind == FACE:
+                face_points = self._face_points
+                for i in indices.tolist():
+                    self.face_renderer.draw(surface, self.face_colors[i], [projected[v] for v in face_points[i]])
+            elif kind == EDGE:
+                colors = self._edge_colors
+                width = self.edge_width
+                for i in indices.tolist():
+                    start, end = self._edge_points[i]
+                    color = self.edge_color if colors is None else colors[i]
+                    pygame.draw.line(surface, color, projected[start], projected[end], width)
+            else:
+                centers, radii, colors = self._balls
+                self.sprites.draw_many(surface, centers[indices],
+                                       radii if radii.ndim == 0 else radii[indices],
+                                       colors if colors.ndim == 1 else colors[indices])
+        draw_list.clear()
+        self._projected = self._edge_colors = self._balls = None
+
+
+# ---------------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Time the per-frame draw-list sort.")
+    parser.add_argument("--balls", type=int, nargs="+", default=[1, 100, 1000, 10000, 50000])
+    parser.add_argument("--subdivide", type=int, nargs="+", default=[1, 4, 16],
+                        help="faces cut into n x n pieces, one draw item each")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'balls':>8}{'faces':>8}{'items':>8}{'p50 us':>10}{'max us':>10}{'ns/item':>10}")
+    for subdivide in args.subdivide:
+        for balls in args.balls:
+            faces = 6 * subdivide * subdivide
+            draw_list = DrawList(faces + 12 + balls)
+            # Depths move a little between frames, as they do in the scripts
+            face_depths = rng.uniform(-100, 100, faces)
+            edge_depths = rng.uniform(-100, 100, 12)
+            ball_depths = rng.uniform(-100, 100, balls)
+            times = []
+            for _ in range(args.frames):
+                face_depths += rng.normal(0, 0.5, faces)
+                ball_depths += rng.normal(0, 0.5, balls)
+                draw_list.clear()
+                draw_list.add(FACE, face_depths)
+                draw_list.add(EDGE, edge_depths)
+                draw_list.add(BALL, ball_depths)
+                draw_list.sort()
+                times.append(draw_list.sort_ns)
+            items = len(draw_list)
+            p50 = float(np.median(times))
+            print(f"{balls:>8}{faces:>8}{items:>8}{p50 / 1000:>10.1f}{max(times) / 1000:>10.1f}"
+                  f"{p50 / items:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Interactive window for any engine variant, with physics decoupled from rendering.
+
+The engine is stepped at its own fixed rate (timestep.FixedTimestep, one step per 1/fps seconds
+of real time) and the window draws an interpolated state as often as it can, or --render-fps
+times per second. Lowering --render-fps (or a slow machine) makes the animation choppier but the
+ball, gravity and spin keep moving at the same speed.
+
+    python play.py 3D_BouncingBall_Cube-Manus.py
+    python play.py 3D_BouncingBall_Cube-Manus.py --render-fps 15
+    python play.py hexagon Swept --speed 4          (simulated seconds per real second)
+"""
+###############################################################################################
+import argparse
+import os
+import time
+
+import pygame
+
+from export import SCRIPTS
+from recording import ENGINES, ReplayState, state_row
+from scenes import make_scene
+from timestep import FixedTimestep, interpolate
+
+
+def play(sim, render_fps=60, speed=1.0):
+    """Run sim in a window until it is closed."""
+    kind = sim.kind
+    scene = make_scene(kind, sim.variant, sim.params)
+    pygame.init()
+    screen = pygame.display.set_mode(scene.size)
+    pygame.display.set_caption(f"{kind} {sim.variant}: {sim.fps} Hz physics, {render_fps or 'uncapped'} FPS render")
+    clock = pygame.time.Clock()
+    stepper = FixedTimestep(sim.frame_time, max_elapsed=0.25 * speed)
+
+    previous = state_row(sim)
+    last = time.perf_counter()
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+        now = time.perf_counter()
+        for _ in range(stepper.advance((now - last) * speed)):
+            previous = state_row(sim)
+            sim.step()
+        last = now
+
+        state = ReplayState(kind, interpolate(kind, previous, state_row(sim), stepper.alpha), sim.time)
+        state.last_kick_force = sim.last_kick_force
+        state.last_kick_angle = sim.last_kick_angle
+        scene.draw(screen, state)
+        pygame.display.flip()
+        clock.tick(render_fps)
+
+    pygame.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a variant with fixed-rate physics and interpolated rendering.")
+    parser.add_argument("source", help="one of the scripts, or an engine kind (hexagon, cube)")
+    parser.add_argument("variant", nargs="?", help="variant, when source is an engine kind")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--render-fps", type=int, default=60, help="0 = as fast as possible")
+    parser.add_argument("--speed", type=float, default=1.0)
+    args = parser.parse_args()
+
+    name = os.path.basename(args.source)
+    kind, variant = SCRIPTS[name] if name in SCRIPTS else (args.source, args.variant)
+    play(ENGINES[kind](variant, seed=args.seed), args.render_fps, args.speed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Per-phase frame timing for the interactive scripts: where do the 16.6 ms of a 60 fps frame go?
+
+The main loop marks the start of every frame and the end of every phase; each phase's duration
+is kept for the last `window` frames, and the overlay and the exit report show its rolling
+median, 95th and 99th percentile:
+
+    profiler = make_profiler()                # BB_PROFILE=1 in the environment turns it on
+    while running:
+        profiler.frame()
+        ...handle events...
+        profiler.lap("events")
+        ...physics...
+        profiler.lap("physics")
+        ...
+        profiler.draw(screen)                 # Overlay in the lower left, P toggles it
+        pygame.display.flip()
+        profiler.lap("flip")
+    print(profiler.report(), file=sys.stderr)
+
+"frame" is the whole loop period, clock.tick() included, so the phases before "tick" show how
+much of the budget is work. Durations come from time.perf_counter_ns (monotonic, integer ns).
+Without BB_PROFILE make_profiler() returns a NullProfiler, whose methods do nothing.
+"""
+###############################################################################################
+import os
+from time import perf_counter_ns
+
+import numpy as np
+
+from hud import HUD, get_font
+
+PERCENTILES = (50, 95, 99)
+OVERLAY_COLOR = (0, 255, 0)
+
+
+class PhaseProfiler:
+    """Rolling per-phase durations of the last `window` frames."""
+
+    enabled = True
+
+    def __init__(self, window=600, refresh_hz=4):
+        self.window = window
+        self.refresh_hz = refresh_hz
+        self.frames = 0  # Complete frames so far
+        self.overlay = True
+        self._rings = {}  # Phase -> durations in ns, one slot per frame; NaN until that frame ran
+        self._slot = 0
+        self._frame_start = None
+        self._last = None
+        self._hud = None
+
+    def frame(self):
+        """Mark the start of a frame (and the end of the previous one)."""
+        now = perf_counter_ns()
+        if self._frame_start is not None:
+            self._store("frame", now - self._frame_start)
+            self.frames += 1
+            self._slot = self.frames % self.window
+        self._frame_start = self._last = now
+
+    def lap(self, phase):
+        """Charge the time since the previous lap (or the frame start) to phase."""
+        now = perf_counter_ns()
+        self._store(phase, now - self._last)
+        self._last = now
+
+    def _store(self, phase, ns):
+        ring = self._rings.get(phase)
+        if ring is None:
+            ring = self._rings[phase] = np.full(self.window, np.nan)
+        ring[self._slot] = ns
+
+    # ---------------------------------------------------------------------------------------
+    def stats(self):
+        """{phase: (p50, p95, p99) in ms}, in the order the phases first ran, "frame" last."""
+        stats = {}
+        for phase, ring in self._rings.items():
+            if phase != "frame" and not np.isnan(ring).all():
+                stats[phase] = tuple(np.nanpercentile(ring, PERCENTILES) / 1e6)
+        frame = self._rings.get("frame")
+        if frame is not None and not np.isnan(frame).all():
+            stats["frame"] = tuple(np.nanpercentile(frame, PERCENTILES) / 1e6)
+        return stats
+
+    def report(self):
+        """The stats as a table, for printing at exit."""
+        stats = self.stats()
+        header = "".join(f"{'p' + str(p) + ' ms':>10}" for p in PERCENTILES)
+        lines = [f"Phase times over the last {min(self.frames, self.window)} of {self.frames} frames",
+                 f"{'phase':<12}{header}"]
+        for phase, values in stats.items():
+            lines.append(f"{phase:<12}" + "".join(f"{value:>10.3f}" for value in values))
+        return "\n".join(lines)
+
+    def draw(self, surface):
+        """Blit the overlay (refreshed refresh_hz times a second) onto surface. Returns its Rect."""
+        if not self.overlay:
+            return None
+        hud = self._hud
+        if hud is None:
+            hud = self._hud = HUD(get_font(None, 18), OVERLAY_COLOR, line_height=15, refresh_hz=self.refresh_hz)
+        if hud.refresh_due():
+            lines = [("p50 / p95 / p99 ms", "")]
+            lines += [(f"{phase}: ", " / ".join(f"{value:.2f}" for value in values))
+                      for phase, values in self.stats().items()]
+            hud.origin = (10, surface.get_height() - 10 - hud.line_height * len(lines))
+            hud.update(lines)
+        return hud.draw(surface)
+
+
+class NullProfiler:
+    """Stands in for PhaseProfiler when profiling is off: every method returns at once."""
+
+    enabled = False
+    overlay = False
+    frames = 0
+
+    def frame(self):
+        pass
+
+    def lap(self, phase):
+        pass
+
+    def stats(self):
+        return {}
+
+    def report(self):
+        return ""
+
+    def draw(self, surface):
+        return None
+
+
+def make_profiler(window=600):
+    """A PhaseProfiler when BB_PROFILE is set (and not "0"), otherwise a NullProfiler."""
+    if os.environ.get("BB_PROFILE", "0") not in ("", "0"):
+        return PhaseProfiler(window)
+    return NullProfiler()
@@ -0,0 +1,75 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Batched 3D rotation and perspective projection for the cube scripts.
+
+The cube scripts rotated and projected one point at a time: the Manus script rebuilt three rotation
+matrices and pushed every vertex through three chained np.dot calls, and the D/G scripts ran
+rotate_point_3d / project_point in pure Python for each vertex and again for the ball.
+Here the three rotations are composed into one 3x3 matrix per frame and applied to all points at
+once with a single (N,3) @ (3,3) product, followed by a vectorized perspective division.
+The cost per point is the same for the cube's 8 vertices as for a mesh with thousands.
+
+Both scripts rotate pitch (X) first, then yaw (Y), then roll (Z), i.e. Rz @ Ry @ Rx.
+Composing the matrices first changes the rounding: the result can differ from the chained
+products in the last bits. That is invisible on screen, so only drawing uses the composed matrix.
+Physics that feeds back into the state (the Manus scripts' rotated gravity, CubeSim) keeps the
+chained products from axis_matrices, so seeded runs still match the original scripts bit-for-bit.
+The two projections are kept apart because they differ:
+    perspective_project  Manus: z_scale / (z + z_scale), screen y grows with world y
+    fov_project          D/G:   fov / (fov + z), screen y is flipped, pixels truncated to int
+"""
+###############################################################################################
+import math
+
+import numpy as np
+
+
+def axis_matrices(pitch, yaw, roll):
+    """The three single-axis rotation matrices (X, Y, Z), one sin/cos per angle."""
+    cx, sx = math.cos(pitch), math.sin(pitch)
+    cy, sy = math.cos(yaw), math.sin(yaw)
+    cz, sz = math.cos(roll), math.sin(roll)
+    rot_x = np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]])
+    rot_y = np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]])
+    rot_z = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]])
+    return rot_x, rot_y, rot_z
+
+
+def rotation_matrix(pitch, yaw, roll):
+    """Composed rotation Rz(roll) @ Ry(yaw) @ Rx(pitch): pitch is applied first, roll last."""
+    cx, sx = math.cos(pitch), math.sin(pitch)
+    cy, sy = math.cos(yaw), math.sin(yaw)
+    cz, sz = math.cos(roll), math.sin(roll)
+    return np.array([
+        [cz * cy, cz * sy * sx - sz * cx, cz * sy * cx + sz * sx],
+        [sz * cy, sz * sy * sx + cz * cx, sz * sy * cx - cz * sx],
+        [-sy, cy * sx, cy * cx],
+    ])
+
+
+def rotate_points(points, matrix, out=None):
+    """Rotate an (N,3) array of points by a 3x3 matrix in one product."""
+    return np.matmul(points, matrix.T, out=out)
+
+
+def perspective_project(points, z_scale=400, center=(0, 0)):
+    """Manus projection of (N,3) points. Returns (N,2) screen positions and the (N,) depth scales."""
+    z = np.maximum(0.1, points[:, 2] + z_scale)  # Avoid division by zero
+    scale = z_scale / z
+    screen = points[:, :2] * scale[:, None]
+    screen += center
+    return screen, scale
+
+
+def fov_project(points, fov=500, center=(0, 0)):
+    """D/G projection of (N,3) points. Returns (N,2) int pixel positions and the (N,) depth factors."""
+    denominator = fov + points[:, 2]
+    denominator[denominator == 0] = fov + 1
+    factor = fov / denominator
+    screen = np.empty((len(points), 2))
+    screen[:, 0] = center[0] + points[:, 0] * factor
+    screen[:, 1] = center[1] - points[:, 1] * factor
+    return screen.astype(int), factor  # astype truncates toward zero, like int()
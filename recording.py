@@ -0,0 +1,272 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Deterministic record/replay of HexagonSim and CubeSim runs.
+
+A run is fully defined by its engine, variant, seed and parameters, so record mode writes those once
+to a JSON header and then appends one fixed-width float32 row of state per frame:
+
+    b"BBTRACE1" | u32 header length | JSON header (space padded to 8 bytes) | rows ...
+
+Row k is the state after k steps (row 0 is the initial state). Rows are append-only and the file has
+no footer, so an interrupted recording is still readable and can be continued.
+Replay opens the rows as an (frames, fields) np.memmap: any frame or column is a view into the file,
+nothing is re-simulated and nothing is read until it is touched.
+trajectory.py keeps the same rows in fixed-size chunk files, for soak runs too long for one file.
+
+    with TraceWriter("run.bbt", HexagonSim("D", seed=7)) as writer:
+        writer.record(36_000)
+    trace = TraceReader("run.bbt")
+    trace[1200]["x"], trace.column("vy").max()
+
+Command line:
+    python recording.py record hexagon D 36000 run.bbt --seed 7
+    python recording.py info run.bbt
+    python recording.py show run.bbt 1200
+    python recording.py verify run.bbt     (re-simulates from the header and compares)
+"""
+###############################################################################################
+import argparse
+import json
+import os
+import struct
+
+import numpy as np
+
+from cube_sim import CubeSim
+from hexagon_sim import HexagonSim
+
+MAGIC = b"BBTRACE1"
+HEADER_ALIGN = 8
+ROW_DTYPE = np.dtype("<f4")
+
+ENGINES = {"hexagon": HexagonSim, "cube": CubeSim}
+
+# Per-frame fields. Angles are in radians, bounces and kick_flash are stored as floats.
+FIELDS = {
+    "hexagon": ("angle", "spin_direction", "x", "y", "vx", "vy", "bounces", "kick_flash"),
+    "cube": ("pitch", "yaw", "roll", "x", "y", "z", "vx", "vy", "vz", "bounces", "kick_flash"),
+}
+
+
+def state_row(sim):
+    """The sim's current state as one tuple in FIELDS[sim.kind] order."""
+    if sim.kind == "hexagon":
+        return (sim.angle_radians, sim.spin_direction, *sim.ball_pos, *sim.ball_vel,
+                sim.total_bounces, sim.kick_flash)
+    return (*sim.angles, *sim.ball_pos, *sim.ball_vel, sim.total_bounces, sim.kick_flash)
+
+
+def make_sim(header):
+    """A fresh engine from a trace header, in the state of frame 0."""
+    return ENGINES[header["kind"]](header["variant"], seed=header["seed"], **header["params"])
+
+
+# ---------------------------------------------------------------------------------------
+def same_run(header, sim):
+    """Whether a header was written for sim's run: kind, variant, seed and every parameter."""
+    # Through JSON, as the header was, so tuples compare equal to the lists read back
+    return ((header["kind"], header["variant"], header["seed"]) == (sim.kind, sim.variant, sim.seed)
+            and header["params"] == json.loads(json.dumps(sim.params)))
+
+
+def _read_header(f, magic=MAGIC):
+    found = f.read(len(magic))
+    if found != magic:
+        raise ValueError(f"{getattr(f, 'name', 'trace')} is not a {magic.decode()} file (bad magic {found!r})")
+    (length,) = struct.unpack("<I", f.read(4))
+    header = json.loads(f.read(length))
+    header["data_offset"] = len(magic) + 4 + length
+    return header
+
+
+def _pack_header(header, magic=MAGIC):
+    text = json.dumps(header, separators=(",", ":")).encode()
+    pad = -(len(magic) + 4 + len(text)) % HEADER_ALIGN
+    text += b" " * pad
+    return magic + struct.pack("<I", len(text)) + text
+
+
+class TraceWriter:
+    """Append-only writer. Rows are buffered and written in blocks of buffer_rows."""
+
+    def __init__(self, path, sim, buffer_rows=4096):
+        self.path = path
+        self.sim = sim
+        self.fields = FIELDS[sim.kind]
+        self._buffer = np.empty((buffer_rows, len(self.fields)), dtype=ROW_DTYPE)
+        self._pending = 0
+        if sim.seed is None:
+            raise ValueError("Only a seeded run can be recorded: replay re-creates it from the seed")
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            # Continue an existing recording of the same run
+            with open(path, "rb") as f:
+                self.header = _read_header(f)
+            self.frames = (os.path.getsize(path) - self.header["data_offset"]) // self._buffer[0].nbytes
+            header = self.header
+            if not same_run(header, sim) or self.frames != sim.step_count + 1:
+                raise ValueError(f"{path} holds a different run, or the sim is not at its last frame")
+            # Drop the torn end of a row an interrupted run may have left, so new rows stay aligned
+            self._file = open(path, "r+b")
+            self._file.truncate(header["data_offset"] + self.frames * self._buffer[0].nbytes)
+            self._file.seek(0, os.SEEK_END)
+        else:
+            self.header = {
+                "kind": sim.kind, "variant": sim.variant, "seed": sim.seed, "params": sim.params,
+                "fields": list(self.fields), "dtype": ROW_DTYPE.str,
+            }
+            self._file = open(path, "wb")
+            self._file.write(_pack_header(self.header))
+            self.frames = 0
+            self.append()
+
+    def append(self):
+        """Buffer a row for the sim's current state."""
+        self._buffer[self._pending] = state_row(self.sim)
+        self._pending += 1
+        self.frames += 1
+        if self._pending == len(self._buffer):
+            self.flush()
+
+    def record(self, steps):
+        """Step the sim and append a row after every step."""
+        sim = self.sim
+        for _ in range(steps):
+            sim.step()
+            self.append()
+
+    def flush(self):
+        self._file.write(self._buffer[:self._pending].tobytes())
+        self._file.flush()
+        self._pending = 0
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TraceReader:
+    """Random access to a recorded run through a read-only memory map."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.header = _read_header(f)
+        self.fields = tuple(self.header["fields"])
+        self._index = {name: i for i, name in enumerate(self.fields)}
+        row_bytes = len(self.fields) * ROW_DTYPE.itemsize
+        count = (os.path.getsize(path) - self.header["data_offset"]) // row_bytes  # Drops a torn last row
+        self.rows = np.memmap(path, dtype=self.header["dtype"], mode="r",
+                              offset=self.header["data_offset"], shape=(count, len(self.fields)))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, frame):
+        """Frame k as a {field: value} dict."""
+        return dict(zip(self.fields, self.rows[frame].tolist()))
+
+    def column(self, name):
+        """One field across all frames, as a view into the file."""
+        return self.rows[:, self._index[name]]
+
+    def frames(self, start=0, stop=None):
+        """Iterate {field: value} dicts for replay without re-simulating."""
+        for row in self.rows[start:stop].tolist():
+            yield dict(zip(self.fields, row))
+
+    def states(self, start=0, stop=None):
+        """Iterate ReplayStates, which scenes.py can draw like a live engine."""
+        fps = self.header["params"]["fps"]
+        for frame, row in enumerate(self.rows[start:stop].tolist(), start):
+            yield ReplayState(self.header["kind"], row, frame / fps)
+
+
+class ReplayState:
+    """One recorded frame under the engines' attribute names."""
+
+    last_kick_force = 0.0  # Not recorded; scenes skip the Manus kick vector
+    last_kick_angle = 0.0
+
+    def __init__(self, kind, row, time):
+        self.time = time
+        if kind == "hexagon":
+            self.angle_radians, self.spin_direction = row[0], row[1]
+            self.ball_pos, self.ball_vel = row[2:4], row[4:6]
+        else:
+            self.angles = tuple(row[0:3])
+            self.ball_pos, self.ball_vel = row[3:6], row[6:9]
+        self.total_bounces = int(row[-2])
+        self.kick_flash = bool(row[-1])
+
+
+def record(sim, path, steps):
+    """Record steps frames of sim to path and return the number of frames in the file."""
+    with TraceWriter(path, sim) as writer:
+        writer.record(steps)
+    return writer.frames
+
+
+def verify(path):
+    """Re-run the simulation from the trace header and return the first frame that differs, or None."""
+    trace = TraceReader(path)
+    sim = make_sim(trace.header)
+    row = np.empty(len(trace.fields), dtype=ROW_DTYPE)
+    for frame, recorded in enumerate(trace.rows):
+        if frame:
+            sim.step()
+        row[:] = state_row(sim)
+        if not np.array_equal(row, recorded):
+            return frame
+    return None
+
+
+# ---------------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay bouncing-ball runs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rec = commands.add_parser("record", help="run a seeded simulation and record every frame")
+    rec.add_argument("kind", choices=sorted(ENGINES))
+    rec.add_argument("variant")
+    rec.add_argument("steps", type=int)
+    rec.add_argument("path")
+    rec.add_argument("--seed", type=int, default=0)
+    info = commands.add_parser("info", help="print a trace's header and frame count")
+    info.add_argument("path")
+    show = commands.add_parser("show", help="print one frame")
+    show.add_argument("path")
+    show.add_argument("frame", type=int)
+    check = commands.add_parser("verify", help="re-simulate from the header and compare")
+    check.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        frames = record(ENGINES[args.kind](args.variant, seed=args.seed), args.path, args.steps)
+        print(f"{args.path}: {frames} frames, {os.path.getsize(args.path)} bytes")
+    elif args.command == "info":
+        trace = TraceReader(args.path)
+        header = trace.header
+        print(f"{header['kind']} {header['variant']}  seed={header['seed']}  frames={len(trace)}")
+        print("fields: " + ", ".join(trace.fields))
+        for name, value in header["params"].items():
+            print(f"    {name} = {value}")
+    elif args.command == "show":
+        for name, value in TraceReader(args.path)[args.frame].items():
+            print(f"{name:>16} {value:.6g}")
+    else:
+        frame = verify(args.path)
+        print("OK, replay matches" if frame is None else f"Mismatch at frame {frame}")
+
+
+if __name__ == "__main__":
+    main()
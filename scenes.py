@@ -0,0 +1,263 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Off-screen renderers for the engine states, drawn the way each script draws its window.
+
+A scene is built from a variant's parameters (sim.params, or the header of a recorded trace) and
+draws any object with the engines' attribute names onto a plain pygame.Surface. No display is
+opened, so scenes work under SDL_VIDEODRIVER=dummy and in worker processes.
+
+    scene = make_scene(sim.kind, sim.variant, sim.params)
+    surface = scene.new_surface()
+    scene.draw(surface, sim)
+
+Attributes read from a state:
+    hexagon  angle_radians, spin_direction, ball_pos, ball_vel, kick_flash, last_kick_force,
+             last_kick_angle, total_bounces, time
+    cube     angles, ball_pos, ball_vel, kick_flash, total_bounces, time
+
+The cube scenes draw through painter.CubePainter: faces, edges and ball sorted by depth together,
+so the ball passes behind the front of the cube. CubeScene(..., lighting=True) shades the D/G edges like draw_cube_with_lighting in the D script,
+which the script defines but does not call.
+
+CrowdScene draws a HexagonCrowd or CubeCrowd (hexagon_batch / cube_batch): the container as the D
+hexagon or the Manus cube, with all of the balls drawn by BallSprites.draw_many (between the cube's
+faces, for the cube).
+
+The HUD is refreshed on simulated time, so an exported clip shows the same 15 Hz text updates as
+the interactive window regardless of how fast it is rendered.
+"""
+###############################################################################################
+import math
+
+import numpy as np
+import pygame
+
+from geometry import RADIAN_SPOKES, TURN_SPOKES, hexagon_frame, hexagon_frame_degrees
+from hud import HUD, get_font
+from painter import CubePainter
+from projection import fov_project, perspective_project, rotate_points, rotation_matrix
+from sprites import BallSprites
+
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+MANUS_BLUE = (0, 100, 255)
+YELLOW = (255, 255, 0)
+ORANGE = (255, 165, 0)
+GREEN = (0, 255, 0)
+PURPLE = (128, 0, 128)
+CYAN = (0, 255, 255)
+GLASS_COLOR = (100, 100, 255, 128)
+
+HUD_REFRESH_HZ = 15
+
+# Per variant: outline width, ball color, (font name, size, color, line height)
+HEXAGON_STYLES = {
+    "D": (5, BLUE, ("Arial", 20, YELLOW, 20)),
+    "Swept": (5, BLUE, ("Arial", 20, YELLOW, 20)),
+    "G": (3, RED, (None, 24, ORANGE, 30)),
+    "Manus": (2, RED, ("Arial", 16, MANUS_BLUE, 20)),
+}
+CUBE_STYLES = {
+    "D": (YELLOW, ("Arial", 20, YELLOW, 30)),
+    "G": (RED, ("Arial", 20, ORANGE, 30)),
+    "Manus": (RED, ("Arial", 16, MANUS_BLUE, 20)),
+    "Manus-3d": (RED, ("Arial", 16, MANUS_BLUE, 20)),
+}
+
+CUBE_EDGES = [
+    (0, 1), (1, 2), (2, 3), (3, 0),  # Back face
+    (4, 5), (5, 6), (6, 7), (7, 4),  # Front face
+    (0, 4), (1, 5), (2, 6), (3, 7),  # Connecting edges
+]
+EDGE_INDICES = np.array(CUBE_EDGES)
+LIGHT_DIRECTION = np.array([0, 0, -1])  # Light coming from the front
+CUBE_FACES = np.array([
+    [0, 1, 2, 3],  # Back
+    [4, 5, 6, 7],  # Front
+    [0, 1, 5, 4],  # Bottom
+    [2, 3, 7, 6],  # Top
+    [0, 3, 7, 4],  # Left
+    [1, 2, 6, 5],  # Right
+])
+FACE_COLORS = [(*PURPLE, 50), (*CYAN, 50), (*RED, 50), (*GREEN, 50), (*MANUS_BLUE, 50), (*YELLOW, 50)]
+
+
+def _make_hud(style):
+    name, size, color, line_height = style
+    return HUD(get_font(name, size), color, origin=(10, 10), line_height=line_height,
+               refresh_hz=HUD_REFRESH_HZ)
+
+
+def cube_vertices(cube_size):
+    """The eight corners of a cube of side cube_size centred on the origin, in script order."""
+    h = cube_size / 2
+    return np.array([
+        [-h, -h, -h], [h, -h, -h], [h, h, -h], [-h, h, -h],
+        [-h, -h, h], [h, -h, h], [h, h, h], [-h, h, h],
+    ])
+
+
+class HexagonScene:
+    """Draws a HexagonSim state (or a replayed one) like the hexagon scripts."""
+
+    def __init__(self, variant, params, hud=True):
+        self.variant = variant
+        self.size = (params["width"], params["height"])
+        self.center = (params["width"] // 2, params["height"] // 2)
+        self.radius = params["hexagon_radius"]
+        self.ball_radius = params["ball_radius"]
+        self.spokes = TURN_SPOKES if variant == "Manus" else RADIAN_SPOKES
+        self.thickness, self.ball_color, hud_style = HEXAGON_STYLES[variant]
+        self.hud = _make_hud(hud_style) if hud else None
+
+    def new_surface(self):
+        return pygame.Surface(self.size)
+
+    def draw(self, surface, state):
+        surface.fill(BLACK)
+        frame = hexagon_frame(self.center, self.radius, state.angle_radians, self.spokes)
+        pygame.draw.polygon(surface, WHITE, frame.points, self.thickness)
+
+        x, y = int(state.ball_pos[0]), int(state.ball_pos[1])
+        color = self.ball_color
+        if state.kick_flash:
+            color = YELLOW
+            if state.last_kick_force:
+                angle = math.radians(state.last_kick_angle)
+                end = (int(state.ball_pos[0] + state.last_kick_force * 5 * math.cos(angle)),
+                       int(state.ball_pos[1] + state.last_kick_force * 5 * math.sin(angle)))
+                pygame.draw.line(surface, YELLOW, (x, y), end, 2)
+        pygame.draw.circle(surface, color, (x, y), self.ball_radius)
+
+        hud = self.hud
+        if hud is not None:
+            if hud.refresh_due(int(state.time * 1000)):
+                vx, vy = float(state.ball_vel[0]), float(state.ball_vel[1])
+                hud.update([
+                    ("Total Time: ", f"{state.time:.2f} s"),
+                    ("Spin Direction: ", "Clockwise" if state.spin_direction > 0 else "Counterclockwise"),
+                    ("Ball Velocity: ", f"{math.hypot(vx, vy):.2f} @ {math.degrees(math.atan2(vy, vx)):.1f}°"),
+                    ("Bounces: ", f"{int(state.total_bounces)}"),
+                ])
+            hud.draw(surface)
+
+
+class CubeScene:
+    """Draws a CubeSim state (or a replayed one) like the cube scripts."""
+
+    def __init__(self, variant, params, hud=True, lighting=False):
+        self.variant = variant
+        self.manus = variant.startswith("Manus")
+        self.lighting = lighting
+        self.cube_size = params["cube_size"]
+        self.size = (params["width"], params["height"])
+        self.center = (params["width"] // 2, params["height"] // 2)
+        self.ball_radius = params["ball_radius"]
+        self.ball_color, hud_style = CUBE_STYLES[variant]
+        # The eight vertices followed by the ball, rotated and projected together (D/G)
+        self.points = np.vstack([cube_vertices(params["cube_size"]), np.zeros(3)])
+        if self.manus:
+            self.painter = CubePainter(CUBE_FACES, FACE_COLORS, CUBE_EDGES, WHITE)
+        else:
+            self.painter = CubePainter((), (), CUBE_EDGES, GLASS_COLOR)
+        self.hud = _make_hud(hud_style) if hud else None
+
+    def new_surface(self):
+        return pygame.Surface(self.size)
+
+    def draw(self, surface, state):
+        surface.fill(BLACK)
+        matrix = rotation_matrix(*state.angles)
+        if self.manus:
+            self._draw_manus(surface, state, matrix)
+        else:
+            points = self.points
+            points[8] = state.ball_pos
+            rotated = rotate_points(points, matrix)
+            projected, _ = fov_project(rotated, 500, self.center)
+            colors = self._edge_colors(rotated[:8]) if self.lighting else None
+            painter = self.painter
+            painter.cube(rotated[:8], projected[:8], colors)
+            painter.balls(projected[8:], rotated[8:, 2], self.ball_radius, self.ball_color)
+            painter.draw(surface)
+
+        hud = self.hud
+        if hud is not None:
+            if hud.refresh_due(int(state.time * 1000)):
+                pitch, yaw, roll = state.angles
+                hud.update([
+                    ("Pitch: ", f"{math.degrees(pitch) % 360:.1f}°"),
+                    ("Yaw: ", f"{math.degrees(yaw) % 360:.1f}°"),
+                    ("Roll: ", f"{math.degrees(roll) % 360:.1f}°"),
+                    ("Ball Velocity: ", f"{math.sqrt(sum(float(v) ** 2 for v in state.ball_vel)):.2f}"),
+                    ("Bounces: ", f"{int(state.total_bounces)}"),
+                    ("Total Time: ", f"{state.time:.2f} sec"),
+                ])
+            hud.draw(surface)
+
+    def _edge_colors(self, rotated):
+        """draw_cube_with_lighting: brightness from the mean of each edge's normalized end points."""
+        normals = rotated[EDGE_INDICES].mean(axis=1) / self.cube_size
+        brightness = np.clip((normals @ LIGHT_DIRECTION + 1) / 2, 0, 1)
+        return [tuple(int(c * b) for c in GLASS_COLOR[:3]) for b in brightness.tolist()]
+
+    def _draw_manus(self, surface, state, matrix):
+        painter = self.painter
+        rotated = rotate_points(self.points[:8], matrix)
+        projected, _ = perspective_project(rotated, 400, self.center)
+        painter.cube(rotated, projected)
+
+        # The Manus scripts project the ball from the cube's local frame, unrotated
+        ball = np.asarray(state.ball_pos, dtype=float)[None, :]
+        center, scale = perspective_project(ball, 400, self.center)
+        color = YELLOW if state.kick_flash else self.ball_color
+        painter.balls(center, ball[:, 2], (self.ball_radius * scale).astype(int), color)
+        painter.draw(surface)
+
+
+class CrowdScene:
+    """Draws a HexagonCrowd or CubeCrowd: the container and every ball, in batches."""
+
+    def __init__(self, crowd):
+        self.kind = "cube" if hasattr(crowd, "cube_size") else "hexagon"
+        self.size = (crowd.width, crowd.height)
+        self.center = (crowd.width // 2, crowd.height // 2)
+        if self.kind == "cube":
+            self.points = cube_vertices(crowd.cube_size)
+            self.painter = CubePainter(CUBE_FACES, FACE_COLORS, CUBE_EDGES, WHITE,
+                                       capacity=len(CUBE_FACES) + len(CUBE_EDGES) + len(crowd.pos))
+        else:
+            self.sprites = BallSprites()
+
+    def new_surface(self):
+        return pygame.Surface(self.size)
+
+    def draw(self, surface, crowd):
+        surface.fill(BLACK)
+        if self.kind == "hexagon":
+            frame = hexagon_frame_degrees(self.center, crowd.hexagon_radius, float(crowd.angle[0]))
+            pygame.draw.polygon(surface, WHITE, frame.points, 5)
+            self.sprites.draw_many(surface, crowd.pos, crowd.ball_radius, BLUE)
+            return
+
+        # Unlike the Manus scripts, the balls turn with the cube
+        painter = self.painter
+        matrix = rotation_matrix(*crowd.angles[0])
+        rotated = rotate_points(self.points, matrix)
+        projected, _ = perspective_project(rotated, 400, self.center)
+        painter.cube(rotated, projected)
+        rotated = rotate_points(crowd.pos, matrix)
+        projected, scale = perspective_project(rotated, 400, self.center)
+        painter.balls(projected, rotated[:, 2], crowd.ball_radius * scale, RED)
+        painter.draw(surface)
+
+
+def make_scene(kind, variant, params, hud=True, **options):
+    """The scene for an engine kind ("hexagon" or "cube") and variant."""
+    scene = HexagonScene if kind == "hexagon" else CubeScene
+    return scene(variant, params, hud, **options)
@@ -0,0 +1,129 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Pre-rendered ball sprites for the 3D cube scripts.
+
+project_ball() scales the ball's radius with its depth, and the scripts rasterized a fresh circle
+with pygame.draw.circle every frame. BallSprites renders each (color, radius) once, on first use,
+onto a small colorkeyed surface and blits it from then on:
+
+    sprites = BallSprites()
+    rect = sprites.draw(screen, RED, (x, y), radius)      # Same pixels as pygame.draw.circle
+
+The red ball and its yellow kick flash over the depth range of the cube come to a few dozen
+entries. The cache holds at most maxsize sprites and evicts the least recently used one, so many
+balls at many depths stay bounded. step > 1 rounds the radii to multiples of step for fewer,
+shared entries (the circles are then no longer pixel-identical).
+
+render(surface, color, center, radius) draws one sprite; the default is a flat
+pygame.draw.circle, and a shaded or glass-look ball only needs another render function.
+
+draw_many() draws a whole crowd from its (N, 2) array of projected centers, with one radius and
+color or one per ball, in a single Surface.blits call: NumPy groups the balls by (color, radius),
+each group looks up its sprite once, and the blit list is built from plain lists. The cost per
+ball stays flat from a hundred balls to tens of thousands.
+
+    sprites.draw_many(screen, projected, radii, RED)
+"""
+###############################################################################################
+from collections import OrderedDict
+from itertools import repeat
+
+import numpy as np
+import pygame
+
+COLORKEY = (255, 0, 255)  # Transparent around the ball
+
+
+def flat_ball(surface, color, center, radius):
+    pygame.draw.circle(surface, color, center, radius)
+
+
+class BallSprites:
+    """LRU cache of pre-rendered balls, keyed by (color, radius)."""
+
+    def __init__(self, maxsize=64, step=1, render=flat_ball):
+        self.maxsize = maxsize
+        self.step = step
+        self.render = render
+        self.hits = 0
+        self.misses = 0  # Sprites rendered
+        self.evictions = 0
+        self._sprites = OrderedDict()  # (color, radius) -> Surface, least recently used first
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def sprite(self, color, radius):
+        """The sprite for a ball of this color and (quantized) radius; None below one pixel."""
+        step = self.step
+        if step != 1:
+            radius = step * round(radius / step)
+        if radius < 1:
+            return None
+        key = (tuple(color), radius)
+        sprites = self._sprites
+        sprite = sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            sprites.move_to_end(key)
+            return sprite
+        self.misses += 1
+        if len(sprites) >= self.maxsize:
+            sprites.popitem(last=False)
+            self.evictions += 1
+        sprite = sprites[key] = self._render(key[0], radius)
+        return sprite
+
+    def draw(self, surface, color, center, radius):
+        """Blit a ball centered on the integer pixel center. Returns the touched Rect, like pygame.draw.circle."""
+        x, y = center
+        sprite = self.sprite(color, radius)
+        if sprite is None:
+            return pygame.Rect(x, y, 0, 0)
+        radius = sprite.get_width() // 2
+        return surface.blit(sprite, (x - radius, y - radius))
+
+    def draw_many(self, surface, centers, radii, colors):
+        """Blit one ball per row of centers (pixels, truncated like int()), in row order.
+
+        radii is one radius or one per ball, colors one RGB color or an (N, 3) array.
+        """
+        xy = np.asarray(centers).astype(np.int64)
+        n = len(xy)
+        radii = np.asarray(radii)
+        if radii.ndim == 0 and np.asarray(colors).ndim == 1:
+            sprite = self.sprite(colors, int(radii))  # One sprite for every ball
+            if sprite is not None and n:
+                half = sprite.get_width() // 2
+                surface.blits(zip(repeat(sprite, n), (xy - half).tolist()), doreturn=False)
+            return
+
+        radii = np.broadcast_to(radii.astype(np.int64), (n,))
+        if self.step != 1:
+            radii = self.step * np.round(radii / self.step).astype(np.int64)
+        colors = np.asarray(colors, dtype=np.int64)
+        if colors.ndim == 1:
+            colors = np.broadcast_to(colors, (n, 3))
+        key = (radii << 24) | (colors[:, 0] << 16) | (colors[:, 1] << 8) | colors[:, 2]
+        keys, group = np.unique(key, return_inverse=True)
+        sprites = np.empty(len(keys), dtype=object)
+        for i, k in enumerate(keys.tolist()):
+            sprites[i] = self.sprite(((k >> 16) & 255, (k >> 8) & 255, k & 255), k >> 24)
+
+        # Balls under one pixel have no sprite; the sprite of radius r is blitted at center - r
+        drawn = radii >= 1
+        if not drawn.all():
+            xy, radii, group = xy[drawn], radii[drawn], group[drawn]
+        surface.blits(zip(sprites[group].tolist(), (xy - radii[:, None]).tolist()), doreturn=False)
+
+    def _render(self, color, radius):
+        size = 2 * radius  # pygame.draw.circle covers center - radius .. center + radius - 1
+        key = COLORKEY if color[:3] != COLORKEY else (0, 0, 0)
+        sprite = pygame.Surface((size, size))
+        sprite.fill(key)
+        self.render(sprite, color, (radius, radius), radius)
+        sprite.set_colorkey(key, pygame.RLEACCEL)
+        return sprite
@@ -0,0 +1,91 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+State objects for the interactive scripts: one Ball and its container (Hexagon or Cube).
+
+The Manus scripts used to keep the ball, the container and the HUD bookkeeping in module globals
+that every function rebinds through `global` statements, so one process could only hold one
+simulation. Here the state lives in small objects with __slots__: no per-instance __dict__, fixed
+attribute offsets, and functions that take the objects they change:
+
+    ball = Ball((350, 260), (2.0, 0.0), radius=15)
+    hexagon = Hexagon((350, 260), 250, rotation_speed=0.01)
+    check_collision(ball, hexagon, frame)
+
+Any number of (ball, container) pairs can coexist and be stepped side by side. pos and vel are
+float64 NumPy arrays that the physics updates in place.
+"""
+###############################################################################################
+import numpy as np
+
+
+class Ball:
+    """Position, velocity and the bounce / kick bookkeeping of one ball."""
+
+    __slots__ = ("pos", "vel", "radius", "bounce_angle", "total_bounces", "last_bounce_time",
+                 "last_kick_force", "last_kick_angle", "kick_effect_time", "last_face_hit")
+
+    def __init__(self, pos, vel, radius, now=0.0):
+        self.pos = np.array(pos, dtype=float)
+        self.vel = np.array(vel, dtype=float)
+        self.radius = radius
+        self.bounce_angle = 0
+        self.total_bounces = 0
+        self.last_bounce_time = now
+        self.last_kick_force = 0.0
+        self.last_kick_angle = 0.0
+        self.kick_effect_time = 0  # Frames left of the kick flash
+        self.last_face_hit = "None"
+
+    def reset(self, pos, vel):
+        """Put the ball back at pos with velocity vel (the R key)."""
+        self.pos = np.array(pos, dtype=float)
+        self.vel = np.array(vel, dtype=float)
+
+    def __repr__(self):
+        return f"Ball(pos={self.pos.tolist()}, vel={self.vel.tolist()}, radius={self.radius})"
+
+
+class Hexagon:
+    """A spinning hexagon: center, circumradius, angle and the spin schedule."""
+
+    __slots__ = ("center", "radius", "angle", "rotation_speed",
+                 "last_direction_change_time", "next_direction_change")
+
+    def __init__(self, center, radius, angle=0.0, rotation_speed=0.0, now=0.0):
+        self.center = np.array(center)
+        self.radius = radius
+        self.angle = angle
+        self.rotation_speed = rotation_speed  # Per frame; the sign is the spin direction
+        self.last_direction_change_time = now
+        self.next_direction_change = now
+
+    @property
+    def spin_direction(self):
+        return "Clockwise" if self.rotation_speed > 0 else "Counter-Clockwise"
+
+    def __repr__(self):
+        return f"Hexagon(center={self.center.tolist()}, radius={self.radius}, angle={self.angle:.4f})"
+
+
+class Cube:
+    """A cube spinning about all three axes: size, pitch / yaw / roll and their directions."""
+
+    __slots__ = ("size", "pitch", "yaw", "roll", "pitch_direction", "yaw_direction", "roll_direction",
+                 "last_direction_change_time", "next_direction_change")
+
+    def __init__(self, size, now=0.0):
+        self.size = size
+        self.pitch = 0  # X-axis rotation
+        self.yaw = 0  # Y-axis rotation
+        self.roll = 0  # Z-axis rotation
+        self.pitch_direction = 1
+        self.yaw_direction = 1
+        self.roll_direction = 1
+        self.last_direction_change_time = now
+        self.next_direction_change = now
+
+    def __repr__(self):
+        return f"Cube(size={self.size}, pitch={self.pitch:.4f}, yaw={self.yaw:.4f}, roll={self.roll:.4f})"
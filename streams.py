@@ -0,0 +1,89 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Random number streams for the vectorized batches (hexagon_batch.py, cube_batch.py).
+
+A batch normally draws from one shared np.random.Generator, so what ball i sees depends on every
+other ball in the batch. To re-run a single ball alone (verify.py reports a failing ball by its
+seed) every ball needs its own stream. BallStreams keeps one SplitMix64 state per ball in a
+uint64 array. A draw for a subset of balls advances only their states:
+
+    streams = make_streams([7, 8, 9], 3)         one stream per ball
+    streams = make_streams(42, 10_000)           one shared generator, as before
+    kick = streams.uniform(hit, low[hit], high[hit])
+
+Ball i with seed s produces the same sequence in any batch, including a batch of one.
+key separates independent streams of the same seed (e.g. fuzzed parameters vs. the physics).
+"""
+###############################################################################################
+import numpy as np
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_KEY_MULTIPLIER = np.uint64(0x632BE59BD9B4E019)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+def _mix(z):
+    """SplitMix64 output function on a uint64 array."""
+    z = (z ^ (z >> np.uint64(30))) * _MIX_1
+    z = (z ^ (z >> np.uint64(27))) * _MIX_2
+    return z ^ (z >> np.uint64(31))
+
+
+class SharedStream:
+    """All balls draw from one np.random.Generator."""
+
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def uniform(self, index, low, high):
+        return self.rng.uniform(low, high, size=_count(index, low, high))
+
+    def integers(self, index, low, high):
+        """Integers in [low, high], both ends included."""
+        return self.rng.integers(low, np.asarray(high) + 1, size=_count(index, low, high))
+
+
+class BallStreams:
+    """One SplitMix64 stream per ball, seeded by that ball's own seed."""
+
+    def __init__(self, seeds, key=0):
+        seeds = np.asarray(seeds, dtype=np.int64).astype(np.uint64)
+        self.seeds = seeds
+        self.state = _mix(seeds * _GOLDEN + np.uint64(key) * _KEY_MULTIPLIER)
+
+    def random(self, index):
+        """Next float in [0, 1) of the balls at index (an index array, a mask or a slice)."""
+        state = self.state[index] + _GOLDEN
+        self.state[index] = state
+        return (_mix(state) >> np.uint64(11)) * (1.0 / (1 << 53))
+
+    def uniform(self, index, low, high):
+        return low + (high - low) * self.random(index)
+
+    def integers(self, index, low, high):
+        """Integers in [low, high], both ends included."""
+        return (low + np.floor((np.asarray(high) - low + 1) * self.random(index))).astype(np.int64)
+
+
+def make_streams(seed, n):
+    """BallStreams when seed is a sequence of n per-ball seeds, otherwise a SharedStream."""
+    if np.ndim(seed) == 0:
+        return SharedStream(seed)
+    if len(seed) != n:
+        raise ValueError(f"Expected {n} per-ball seeds, got {len(seed)}")
+    return BallStreams(seed)
+
+
+def _count(index, low, high):
+    """Number of values a draw for index needs (low/high are already indexed when arrays)."""
+    shape = np.broadcast(np.asarray(low), np.asarray(high)).shape
+    if shape:
+        return shape
+    if isinstance(index, slice):
+        raise ValueError("A slice index needs array bounds")
+    index = np.asarray(index)
+    return int(index.sum()) if index.dtype == bool else len(index)
@@ -0,0 +1,183 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Parameter sweep: run a grid of kick/gravity/friction settings over all CPU cores.
+
+The kick ranges, FRICTION, GRAVITY and MAX_VELOCITY were tuned by hand (the D cube docstring:
+"up to 15 without ball escaping the cube"). A sweep expands a grid into one headless engine run
+per (grid point, seed), fans the runs out over a ProcessPoolExecutor and collects one row per grid
+point:
+    escapes      frames on which the ball's center ended outside the container (sim.overlap())
+    max_overlap  deepest reach past a wall, in pixels
+    bounces/s    wall contacts per simulated second
+    KE mean/max  kinetic energy per unit mass, 0.5 |v|^2
+
+Every run is cached on disk under a hash of (engine, variant, parameters, seed, steps), so
+re-running a sweep only computes the new points:
+
+    python sweep.py cube D --grid kick_force_max=5,10,15,20,25 friction=0.95,0.98 --seeds 4
+    python sweep.py hexagon D --grid gravity=0.1:1.0:10 --steps 36000 --csv gravity.csv
+
+A value written start:stop:count expands to count evenly spaced values.
+"""
+###############################################################################################
+import argparse
+import concurrent.futures
+import csv
+import hashlib
+import itertools
+import json
+import os
+
+from recording import ENGINES
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sweep_cache")
+CACHE_VERSION = 1  # Bump when the engines change what a run produces
+
+
+def parse_values(text):
+    """"1,2.5,4" -> [1, 2.5, 4]; "0.1:1.0:10" -> 10 evenly spaced values."""
+    if text.count(":") == 2:
+        start, stop, count = text.split(":")
+        start, stop, count = float(start), float(stop), int(count)
+        if count == 1:
+            return [start]
+        return [round(start + (stop - start) * i / (count - 1), 10) for i in range(count)]
+    return [json.loads(value) for value in text.split(",")]
+
+
+def expand_grid(grid):
+    """{name: [values]} -> list of {name: value}, in row-major order."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def run_point(kind, variant, params, seed, steps):
+    """One headless run; the unit of work sent to a worker process."""
+    sim = ENGINES[kind](variant, seed=seed, **params)
+    step = sim.step
+    overlap = sim.overlap
+    radius = sim.ball_radius
+    escapes = 0
+    max_overlap = -float("inf")
+    energy_sum = 0.0
+    energy_max = 0.0
+    for _ in range(steps):
+        step()
+        reach = overlap()
+        if reach > max_overlap:
+            max_overlap = reach
+        if reach > radius:
+            escapes += 1
+        energy = 0.5 * sum(float(v) ** 2 for v in sim.ball_vel)
+        energy_sum += energy
+        if energy > energy_max:
+            energy_max = energy
+    return {
+        "escapes": escapes,
+        "max_overlap": max_overlap,
+        "bounces": sim.total_bounces,
+        "seconds": sim.time,
+        "energy_mean": energy_sum / steps,
+        "energy_max": energy_max,
+    }
+
+
+def _cache_path(kind, variant, params, seed, steps):
+    key = json.dumps([CACHE_VERSION, kind, variant, sorted(params.items()), seed, steps])
+    return os.path.join(CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+
+def sweep(kind, variant, grid, seeds=(0,), steps=36_000, workers=None, use_cache=True):
+    """Run every grid point for every seed. Returns one aggregated row per grid point."""
+    points = expand_grid(grid)
+    runs = {}  # (point index, seed) -> result
+    pending = {}
+    for index, params in enumerate(points):
+        for seed in seeds:
+            path = _cache_path(kind, variant, params, seed, steps)
+            if use_cache and os.path.exists(path):
+                with open(path) as f:
+                    runs[index, seed] = json.load(f)
+            else:
+                pending[index, seed] = (params, path)
+
+    if pending:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(run_point, kind, variant, params, key[1], steps): (key, path)
+                       for key, (params, path) in pending.items()}
+            for future in concurrent.futures.as_completed(futures):
+                key, path = futures[future]
+                runs[key] = result = future.result()
+                with open(path, "w") as f:
+                    json.dump(result, f)
+
+    rows = []
+    for index, params in enumerate(points):
+        results = [runs[index, seed] for seed in seeds]
+        seconds = sum(r["seconds"] for r in results)
+        rows.append({
+            **params,
+            "runs": len(results),
+            "escapes": sum(r["escapes"] for r in results),
+            "max_overlap": max(r["max_overlap"] for r in results),
+            "bounces_per_s": sum(r["bounces"] for r in results) / seconds,
+            "energy_mean": sum(r["energy_mean"] for r in results) / len(results),
+            "energy_max": max(r["energy_max"] for r in results),
+        })
+    return rows, len(pending)
+
+
+def print_table(rows):
+    if not rows:
+        return
+    columns = list(rows[0])
+    cells = [[_format(row[column]) for column in columns] for row in rows]
+    widths = [max(len(column), *(len(line[i]) for line in cells)) for i, column in enumerate(columns)]
+    print("  ".join(column.rjust(width) for column, width in zip(columns, widths)))
+    for line in cells:
+        print("  ".join(cell.rjust(width) for cell, width in zip(line, widths)))
+
+
+def _format(value):
+    if isinstance(value, float):
+        return f"{value:.4g}" if abs(value) < 1e4 else f"{value:.0f}"
+    return str(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep engine parameters over all CPU cores.")
+    parser.add_argument("kind", choices=sorted(ENGINES))
+    parser.add_argument("variant")
+    parser.add_argument("--grid", nargs="+", required=True, metavar="NAME=VALUES",
+                        help="e.g. kick_force_max=5,10,15 or gravity=0.1:1.0:10")
+    parser.add_argument("--seeds", type=int, default=1, help="seeds 0..N-1 per grid point")
+    parser.add_argument("--steps", type=int, default=36_000, help="frames per run (36000 = 10 minutes)")
+    parser.add_argument("--workers", type=int, help="processes (default: one per CPU)")
+    parser.add_argument("--no-cache", action="store_true", help="recompute cached runs")
+    parser.add_argument("--csv", help="also write the table to this file")
+    args = parser.parse_args()
+
+    grid = {}
+    for item in args.grid:
+        name, _, values = item.partition("=")
+        grid[name] = parse_values(values)
+    ENGINES[args.kind](args.variant, **{name: values[0] for name, values in grid.items()})  # Check names early
+
+    rows, computed = sweep(args.kind, args.variant, grid, range(args.seeds), args.steps, args.workers,
+                           not args.no_cache)
+    print_table(rows)
+    print(f"{len(rows)} grid points x {args.seeds} seeds, {computed} runs computed, "
+          f"{len(rows) * args.seeds - computed} from cache")
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Continuous (swept) collision of a ball against the walls of a spinning regular hexagon.
+
+The scripts test only where the ball ends up after a step (distance to a wall <= radius) and then
+rescue escapes with constrain_ball_inside_hexagon / keep_ball_inside / enforce_boundary. A fast
+ball, or a wall sweeping into a ball near a corner, can cross a wall between two tests.
+
+Here the motion during a step is taken into account, for both the ball and the wall. Positions are
+relative to the hexagon's center. Wall k's outward normal is at angle + PHASES[k], and the angle
+turns at omega radians per unit time. Over the step the ball moves in a straight line
+p(t) = p + v t, so for each wall
+
+    f_k(t) = p(t) . n_k(t) - (apothem - ball_radius)
+
+is negative while the ball is clear of the wall. For a convex polygon the ball is inside exactly
+when every f_k <= 0, so corners need no special case. time_of_impact finds the first t at which an
+approaching wall reaches f_k = 0 by conservative advancement: with |f''| <= M over the step,
+f(t + s) <= f + f' s + M s^2 / 2, and the first root of that bound is a step that cannot overshoot.
+Near contact the steps shrink like Newton steps, so a handful of iterations is enough.
+
+bounce() reflects the velocity relative to the moving wall, so a spinning wall throws the ball.
+"""
+###############################################################################################
+import math
+
+# Outward normal of wall k (between vertices k and k+1) relative to the hexagon's angle
+PHASES = tuple(math.radians(60 * k + 30) for k in range(6))
+APOTHEM = math.cos(math.radians(30))  # Center-to-wall distance of a unit-radius hexagon
+
+CONTACT_TOLERANCE = 1e-7  # Pixels; f_k >= -tolerance counts as touching
+MIN_STEP = 1e-4  # Smallest advance past a wall the ball is already leaving
+MAX_ITERATIONS = 100
+
+
+def time_of_impact(x, y, vx, vy, angle, omega, limit, t_max=1.0, phases=PHASES):
+    """First contact of a ball with an approaching wall during [0, t_max].
+
+    x, y     ball center relative to the hexagon center
+    vx, vy   ball velocity, per unit time
+    angle    hexagon angle at t = 0 (radians), turning at omega radians per unit time
+    limit    apothem - ball_radius: how far the ball center may get from the center along a normal
+    Returns (t, wall), or None when the ball stays clear for the whole step.
+    """
+    speed = math.hypot(vx, vy)
+    spin = abs(omega)
+    # Bound on |f''| for every wall: 2 |omega| |v| + omega^2 max|p(t)|
+    curvature = 2 * spin * speed + spin * spin * (math.hypot(x, y) + speed * t_max)
+
+    t = 0.0
+    for _ in range(MAX_ITERATIONS):
+        px = x + vx * t
+        py = y + vy * t
+        step = t_max - t
+        for wall, phase in enumerate(phases):
+            a = angle + omega * t + phase
+            nx = math.cos(a)
+            ny = math.sin(a)
+            f = px * nx + py * ny - limit
+            df = vx * nx + vy * ny + omega * (py * nx - px * ny)
+            if f >= -CONTACT_TOLERANCE:
+                if df > 0:
+                    return t, wall
+                # Touching but leaving: this wall only limits the step once it could turn back
+                s = max(_safe_step(0.0, df, curvature), MIN_STEP)
+            else:
+                s = _safe_step(f, df, curvature)
+            if s < step:
+                step = s
+        t += step
+        if t >= t_max:
+            return None
+    return t, _deepest_wall(x + vx * t, y + vy * t, angle + omega * t, phases)
+
+
+def _safe_step(f, df, curvature):
+    """Largest s >= 0 with f + df s + curvature s^2 / 2 <= 0, for f <= 0."""
+    if curvature <= 0:
+        return -f / df if df > 0 else math.inf
+    return (-df + math.sqrt(df * df - 2 * curvature * f)) / curvature
+
+
+def _deepest_wall(x, y, angle, phases):
+    return max(range(len(phases)), key=lambda k: x * math.cos(angle + phases[k]) + y * math.sin(angle + phases[k]))
+
+
+def wall_normal(angle, wall, phases=PHASES):
+    """Outward unit normal of a wall at the given hexagon angle."""
+    a = angle + phases[wall]
+    return math.cos(a), math.sin(a)
+
+
+def bounce(x, y, vx, vy, nx, ny, ball_radius, omega, restitution=1.0):
+    """Velocity after hitting the wall with outward normal (nx, ny), relative to the wall's motion.
+
+    (x, y) is the ball center relative to the hexagon center. The wall point under the ball moves
+    at omega * (-py, px), which is added back after reflecting the relative velocity.
+    """
+    px = x + ball_radius * nx
+    py = y + ball_radius * ny
+    wall_vx = -omega * py
+    wall_vy = omega * px
+    approach = (vx - wall_vx) * nx + (vy - wall_vy) * ny
+    if approach <= 0:
+        return vx, vy
+    impulse = (1 + restitution) * approach
+    return vx - impulse * nx, vy - impulse * ny
+
+
+def overlap(x, y, angle, limit, phases=PHASES):
+    """How far (pixels) the ball center is past the closest wall's limit; <= 0 means inside."""
+    return max(x * math.cos(angle + phase) + y * math.sin(angle + phase) for phase in phases) - limit
@@ -0,0 +1,265 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Per-bounce telemetry: every wall / face contact of a HexagonSim or CubeSim as one packed record.
+
+The HUD shows the last bounce angle, kick and face, then forgets them. With a BounceLog attached,
+every contact is recorded:
+
+    step      frame of the contact (0 = the first step)
+    wall      hexagon wall index 0..5, or the cube face ("Top", "Left", ...) as an index into
+              cube_sim.FACE_NAMES
+    velocity_in  ball velocity before the bounce
+    normal    unit normal of the wall or face that was hit, pointing into the container, for
+              every variant (the D cube and Swept hexagon reflect about the outward normal and
+              their normals are negated before logging)
+    kick      velocity the random kick added ([0, 0] for the D hexagon's corner roll)
+    velocity  ball velocity after the whole response
+
+On the simulation thread a bounce is a few appends to plain lists. Full batches of batch_size
+records go through a bounded queue to a writer thread, as export.py does with frames: the
+simulation only waits when the writer is queue_size batches behind. The writer turns a batch into
+one NumPy structured array with a handful of array conversions and writes its bytes, so it holds
+the GIL for well under a microsecond per bounce. The file is a JSON header and the records,
+the same layout as recording.py's traces:
+
+    b"BBBOUNCE" | u32 header length | JSON header (kind, dim, walls, dtype) | records ...
+
+read() maps the records as a NumPy array; to_ndjson() turns a file into NDJSON offline,
+one line per bounce, with the incoming speed added:
+
+    {"step": 812, "wall": 3, "speed": 14.27, "normal": [-0.5, 0.866], "kick": [6.1, -2.3],
+     "velocity": [-3.9, 12.8]}
+
+    log = BounceLog("bounces.bnc")
+    sim = HexagonSim("D", seed=1, telemetry=log)
+    sim.step(100_000)
+    log.close()
+    header, records = read("bounces.bnc")
+
+or from the command line, with the cost of the telemetry measured against a plain run:
+
+    python telemetry.py record hexagon D bounces.bnc --steps 200000 --seed 1 --baseline
+    python telemetry.py ndjson bounces.bnc - | head
+"""
+###############################################################################################
+import argparse
+import json
+import math
+import os
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+
+from cube_sim import FACE_NAMES
+from recording import ENGINES, _pack_header, _read_header
+
+MAGIC = b"BBBOUNCE"
+WALL_CODES = {name: code for code, name in enumerate(FACE_NAMES)}
+
+
+def record_dtype(dim):
+    """The packed record of a 2D (hexagon) or 3D (cube) bounce."""
+    return np.dtype([("step", "<i8"), ("wall", "<i8"), ("velocity_in", "<f8", dim), ("normal", "<f8", dim),
+                     ("kick", "<f8", dim), ("velocity", "<f8", dim)])
+
+
+class BounceLog:
+    """Buffered, batched writer of packed bounce records."""
+
+    def __init__(self, path, batch_size=4096, queue_size=16):
+        self.path = path
+        self.batch_size = batch_size
+        self.file = open(path, "wb")
+        self.records = 0  # Bounces handed to the writer so far
+        self.stalls = 0  # Batches that had to wait for a free slot in the queue
+        self.error = None
+        self._steps = []
+        self._walls = []
+        self._values = []  # velocity_in, normal, kick, velocity of every bounce, flattened
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._write, daemon=True)
+        self._thread.start()
+
+    def bounce(self, step, wall, velocity_in, normal, kick, velocity_out):
+        """Record one contact. The sequences are copied, so arrays may be reused afterwards."""
+        self._steps.append(step)
+        self._walls.append(wall)
+        extend = self._values.extend
+        extend(velocity_in)
+        extend(normal)
+        extend(kick)
+        extend(velocity_out)
+        if len(self._steps) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Hand the records collected so far to the writer thread."""
+        batch = (self._steps, self._walls, self._values)
+        if not batch[0]:
+            return
+        self._steps, self._walls, self._values = [], [], []
+        self.records += len(batch[0])
+        try:
+            self._queue.put_nowait(batch)
+        except queue.Full:
+            self.stalls += 1
+            self._queue.put(batch)
+
+    def close(self):
+        """Flush, wait for the writer to finish and close the file."""
+        if self._thread is None:
+            return
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self.file.close()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ---------------------------------------------------------------------------------------
+    def _write(self):
+        """Writer thread: pack batches into the file until it gets None."""
+        header = None
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                break
+            if self.error is not None:
+                continue  # Keep draining so the simulation never blocks on a dead writer
+            try:
+                steps, walls, values = batch
+                if header is None:
+                    # The first bounce fixes the dimension and whether walls are face names
+                    dim = len(values) // (4 * len(steps))
+                    header = {"kind": "cube" if dim == 3 else "hexagon", "dim": dim,
+                              "walls": FACE_NAMES if isinstance(walls[0], str) else None,
+                              "dtype": record_dtype(dim).descr}
+                    self.file.write(_pack_header(header, MAGIC))
+                    dtype = record_dtype(dim)
+                records = np.empty(len(steps), dtype=dtype)
+                records["step"] = steps
+                records["wall"] = [WALL_CODES[wall] for wall in walls] if header["walls"] else walls
+                values = np.array(values, dtype=np.float64).reshape(len(steps), 4, dim)
+                for i, name in enumerate(("velocity_in", "normal", "kick", "velocity")):
+                    records[name] = values[:, i]
+                self.file.write(records.tobytes())
+            except Exception as error:
+                self.error = error
+        if header is None and self.error is None:
+            self.file.write(_pack_header({"kind": None, "dim": None, "walls": None, "dtype": None}, MAGIC))
+
+
+def read(path):
+    """(header, records): the records as a read-only memory map (an empty array when there are none)."""
+    with open(path, "rb") as f:
+        header = _read_header(f, MAGIC)
+    if header["dim"] is None:
+        return header, np.empty(0, dtype=record_dtype(2))
+    dtype = record_dtype(header["dim"])
+    size = (os.path.getsize(path) - header["data_offset"]) // dtype.itemsize
+    if not size:
+        return header, np.empty(0, dtype=dtype)
+    return header, np.memmap(path, dtype=dtype, mode="r", offset=header["data_offset"], shape=(size,))
+
+
+def to_ndjson(path, out, batch_size=65536):
+    """Write the bounces of a BounceLog file to the text stream out as NDJSON. Returns the count."""
+    header, records = read(path)
+    if not len(records):
+        return 0
+    dim = header["dim"]
+    vector = "[" + ", ".join(["%r"] * dim) + "]"
+    line = ('{"step": %d, "wall": %s, "speed": %r, "normal": ' + vector + ', "kick": ' + vector
+            + ', "velocity": ' + vector + '}\n')
+    walls = [json.dumps(name) for name in header["walls"]] if header["walls"] else None
+    for start in range(0, len(records), batch_size):
+        chunk = records[start:start + batch_size]
+        wall = [walls[code] for code in chunk["wall"].tolist()] if walls else chunk["wall"].tolist()
+        rows = zip(chunk["step"].tolist(), wall, chunk["velocity_in"].tolist(), chunk["normal"].tolist(),
+                   chunk["kick"].tolist(), chunk["velocity"].tolist())
+        out.write("".join([line % (step, wall, math.hypot(*velocity_in), *normal, *kick, *velocity)
+                           for step, wall, velocity_in, normal, kick, velocity in rows]))
+    return len(records)
+
+
+def record(kind, variant, path, steps, seed=None, **options):
+    """Run an engine for steps frames with a BounceLog on path. Returns (log, wall seconds)."""
+    log = BounceLog(path, **options)
+    sim = ENGINES[kind](variant, seed=seed, telemetry=log)
+    started = time.perf_counter()
+    try:
+        sim.step(steps)
+    finally:
+        log.close()
+    return log, time.perf_counter() - started
+
+
+def plain_run(kind, variant, steps, seed=None):
+    """Wall seconds of the same run without telemetry."""
+    sim = ENGINES[kind](variant, seed=seed)
+    started = time.perf_counter()
+    sim.step(steps)
+    return time.perf_counter() - started
+
+
+# ---------------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Record every bounce of a headless run.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rec = commands.add_parser("record", help="run a seeded simulation and log every bounce")
+    rec.add_argument("kind", choices=sorted(ENGINES))
+    rec.add_argument("variant")
+    rec.add_argument("path", help="output file of packed records")
+    rec.add_argument("--steps", type=int, default=3600)
+    rec.add_argument("--seed", type=int, default=0)
+    rec.add_argument("--batch-size", type=int, default=4096, help="records per batch handed to the writer")
+    rec.add_argument("--queue-size", type=int, default=16, help="batches the writer may fall behind")
+    rec.add_argument("--baseline", action="store_true", help="also time the same run without telemetry")
+    rec.add_argument("--repeat", type=int, default=3, help="runs of each kind with --baseline")
+    text = commands.add_parser("ndjson", help="convert a log to NDJSON")
+    text.add_argument("path")
+    text.add_argument("out", help="output .ndjson file, or - for stdout")
+    args = parser.parse_args()
+
+    if args.command == "ndjson":
+        if args.out == "-":
+            to_ndjson(args.path, sys.stdout)
+        else:
+            with open(args.out, "w", encoding="utf-8", buffering=1 << 20) as out:
+                to_ndjson(args.path, out)
+        return
+
+    options = {"batch_size": args.batch_size, "queue_size": args.queue_size}
+    if not args.baseline:
+        log, seconds = record(args.kind, args.variant, args.path, args.steps, args.seed, **options)
+    else:
+        # Warm up, then alternate the two runs and keep the fastest of each, so neither one pays
+        # for cold caches or a slow stretch of the machine alone
+        plain_run(args.kind, args.variant, min(args.steps, 2000), args.seed)
+        seconds = plain = math.inf
+        for _ in range(args.repeat):
+            log, elapsed = record(args.kind, args.variant, args.path, args.steps, args.seed, **options)
+            seconds = min(seconds, elapsed)
+            plain = min(plain, plain_run(args.kind, args.variant, args.steps, args.seed))
+    print(f"{args.kind} {args.variant}: {log.records} bounces in {args.steps} steps, "
+          f"{args.steps / seconds:,.0f} steps/s with telemetry ({log.stalls} stalled batches)", file=sys.stderr)
+    if args.baseline:
+        print(f"{args.steps / plain:,.0f} steps/s without: {100 * (seconds / plain - 1):+.1f}% wall time "
+              f"(best of {args.repeat} alternating runs each)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Fixed-timestep physics clock with an accumulator, and render-side interpolation.
+
+The scripts run one physics step per rendered frame, and their constants are per frame (gravity
+per frame, ROTATION_SPEED radians per frame, friction per frame). When drawing takes longer than
+1/60 s (the Manus cube's six alpha-blended faces on a slow machine) the whole simulation slows
+down with it. Here real time is fed into an accumulator and the engines are stepped in fixed
+frames of dt = 1/fps, however many are due:
+
+    stepper = FixedTimestep(sim.frame_time)
+    while running:
+        for _ in range(stepper.advance(elapsed)):
+            previous = state_row(sim)
+            sim.step()
+        draw(interpolate(kind, previous, state_row(sim), stepper.alpha))
+
+The time left in the accumulator (alpha, a fraction of a step) is used to blend the last two
+physics states, so motion stays smooth when the render rate is not a multiple of the physics rate.
+Elapsed time is clamped, so a stall (window drag, breakpoint) cannot trigger a burst of steps that
+takes longer than the stall itself.
+"""
+###############################################################################################
+import math
+
+from recording import FIELDS
+
+# Fields blended the short way round the circle, and fields that just take the newest value
+ANGLE_FIELDS = {"angle", "pitch", "yaw", "roll"}
+DISCRETE_FIELDS = {"spin_direction", "bounces", "kick_flash"}
+
+
+class FixedTimestep:
+    """Turns elapsed real time into a whole number of fixed physics steps."""
+
+    def __init__(self, dt, max_elapsed=0.25):
+        self.dt = dt
+        self.max_elapsed = max_elapsed  # Seconds of real time accepted per advance()
+        self.accumulator = 0.0
+        self.steps = 0
+
+    def advance(self, elapsed):
+        """Add elapsed seconds and return the number of steps now due."""
+        self.accumulator += min(elapsed, self.max_elapsed)
+        steps = 0
+        while self.accumulator >= self.dt:
+            self.accumulator -= self.dt
+            steps += 1
+        self.steps += steps
+        return steps
+
+    @property
+    def alpha(self):
+        """How far the clock is between the last step and the next one, in [0, 1)."""
+        return self.accumulator / self.dt
+
+
+def interpolate(kind, previous, current, alpha):
+    """Blend two state rows (recording.state_row) of an engine kind; alpha=0 gives previous."""
+    row = []
+    for name, a, b in zip(FIELDS[kind], previous, current):
+        if name in DISCRETE_FIELDS:
+            row.append(b)
+        elif name in ANGLE_FIELDS:
+            delta = (b - a + math.pi) % (2 * math.pi) - math.pi  # D wraps its angle at 360 degrees
+            row.append(a + delta * alpha)
+        else:
+            row.append(a + (b - a) * alpha)
+    return row
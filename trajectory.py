@@ -0,0 +1,294 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Chunked, memory-mapped trajectory store for soak runs of HexagonSim and CubeSim.
+
+recording.py keeps a run in one file that grows by one buffered write at a time, which suits
+minutes of frames. Hours of simulation (hundreds of millions of steps, tens of GB) go into a
+directory of fixed-size chunk files instead:
+
+    soak/
+        header.json         kind, variant, seed, params, fields, dtype, chunk_rows, frames
+        chunk-000000.bin    chunk_rows fixed-width rows
+        chunk-000001.bin
+        ...
+
+The rows are recording.py's: FIELDS[kind] in one fixed-width row per frame, row k the state after
+k steps (row 0 is the initial state). Each chunk file is created at its full size up front (a
+sparse file, nothing is written) and mapped with np.memmap. The writer stores every row straight
+into the map and opens the next chunk when one is full, so the run grows one chunk at a time.
+header.json says how many frames are valid. It is replaced atomically at every chunk boundary,
+on flush() and on close(), so a killed run keeps everything up to the last flush and can be
+continued from there.
+
+The reader maps a chunk only when it is touched (at most max_open at once). window(start, stop)
+is a view into the chunk file when the range lies within one chunk; pieces(start, stop) yields
+views chunk by chunk for a range of any length. Analysis can jump to any window of the run
+without reading the rest of it:
+
+    with TrajectoryWriter("soak", HexagonSim("D", seed=7)) as writer:
+        writer.record(100_000_000)
+    store = TrajectoryReader("soak")
+    rows = store.window(50_000_000, 50_003_600)         # (3600, fields), no copy
+    speed = max(abs(piece[:, 4]).max() for _, piece in store.pieces(0, len(store)))
+
+Command line:
+    python trajectory.py record hexagon D 100000000 soak --seed 7
+    python trajectory.py info soak
+    python trajectory.py show soak 50000000
+    python trajectory.py stats soak vx --start 1000000 --stop 2000000
+"""
+###############################################################################################
+import argparse
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from recording import ENGINES, FIELDS, ROW_DTYPE, ReplayState, same_run, state_row
+
+HEADER_NAME = "header.json"
+CHUNK_ROWS = 1 << 20  # 1M frames per chunk: 32 MB for the hexagon, 44 MB for the cube in float32
+
+
+def chunk_path(path, index):
+    return os.path.join(path, f"chunk-{index:06d}.bin")
+
+
+def _read_header(path):
+    with open(os.path.join(path, HEADER_NAME), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_header(path, header):
+    """Replace header.json atomically, so a reader never sees half of it."""
+    name = os.path.join(path, HEADER_NAME)
+    with open(name + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(header, f, indent=1)
+    os.replace(name + ".tmp", name)
+
+
+class TrajectoryWriter:
+    """Appends one row per frame into preallocated, memory-mapped chunk files."""
+
+    def __init__(self, path, sim, chunk_rows=CHUNK_ROWS, dtype=ROW_DTYPE):
+        self.path = path
+        self.sim = sim
+        self.fields = FIELDS[sim.kind]
+        self._chunk = None  # Memory map of the chunk being written
+        self._rows = None  # The same pages as a plain ndarray: row stores skip the memmap subclass
+        self._row = 0  # Next row in it
+        if sim.seed is None:
+            raise ValueError("Only a seeded run can be recorded: replay re-creates it from the seed")
+
+        if os.path.exists(os.path.join(path, HEADER_NAME)):
+            # Continue an existing store of the same run
+            header = self.header = _read_header(path)
+            if not same_run(header, sim) or header["frames"] != sim.step_count + 1:
+                raise ValueError(f"{path} holds a different run, or the sim is not at its last frame")
+            self.chunk_rows = header["chunk_rows"]
+            self.frames = header["frames"]
+            if self.frames % self.chunk_rows:
+                self._open_chunk(self.frames // self.chunk_rows)
+                self._row = self.frames % self.chunk_rows
+        else:
+            os.makedirs(path, exist_ok=True)
+            self.chunk_rows = chunk_rows
+            self.header = {
+                "kind": sim.kind, "variant": sim.variant, "seed": sim.seed, "params": sim.params,
+                "fields": list(self.fields), "dtype": np.dtype(dtype).str, "chunk_rows": chunk_rows,
+                "frames": 0,
+            }
+            self.frames = 0
+            self.append()
+
+    def _open_chunk(self, index):
+        """Map chunk index for writing, creating it at full size if it does not exist yet."""
+        if self._chunk is not None:
+            self._chunk.flush()
+        name = chunk_path(self.path, index)
+        shape = (self.chunk_rows, len(self.fields))
+        if not os.path.exists(name):
+            with open(name, "wb") as f:
+                f.truncate(self.chunk_rows * len(self.fields) * np.dtype(self.header["dtype"]).itemsize)
+        self._chunk = np.memmap(name, dtype=self.header["dtype"], mode="r+", shape=shape)
+        self._rows = self._chunk.view(np.ndarray)
+        self._row = 0
+
+    def append(self):
+        """Store a row for the sim's current state."""
+        if self._chunk is None or self._row == self.chunk_rows:
+            if self._chunk is not None:
+                self.flush()  # A full chunk: make it durable before starting the next one
+            self._open_chunk(self.frames // self.chunk_rows)
+        self._rows[self._row] = state_row(self.sim)
+        self._row += 1
+        self.frames += 1
+
+    def record(self, steps):
+        """Step the sim and append a row after every step."""
+        sim = self.sim
+        append = self.append
+        for _ in range(steps):
+            sim.step()
+            append()
+
+    def flush(self):
+        """Write the mapped rows back and record the frame count in header.json."""
+        if self._chunk is not None:
+            self._chunk.flush()
+        self.header["frames"] = self.frames
+        _write_header(self.path, self.header)
+
+    def close(self):
+        if self._chunk is not None:
+            self.flush()
+            self._chunk = self._rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TrajectoryReader:
+    """Random access to a chunked store through read-only memory maps, opened on demand."""
+
+    def __init__(self, path, max_open=64):
+        self.path = path
+        self.header = _read_header(path)
+        self.fields = tuple(self.header["fields"])
+        self.chunk_rows = self.header["chunk_rows"]
+        self.max_open = max_open
+        self._index = {name: i for i, name in enumerate(self.fields)}
+        self._maps = OrderedDict()  # Chunk index -> memmap, least recently used first
+
+    def __len__(self):
+        return self.header["frames"]
+
+    def _chunk(self, index):
+        maps = self._maps
+        chunk = maps.get(index)
+        if chunk is not None:
+            maps.move_to_end(index)
+            return chunk
+        if len(maps) >= self.max_open:
+            maps.popitem(last=False)
+        chunk = maps[index] = np.memmap(chunk_path(self.path, index), dtype=self.header["dtype"], mode="r",
+                                        shape=(self.chunk_rows, len(self.fields)))
+        return chunk
+
+    def _range(self, start, stop):
+        frames = len(self)
+        start, stop, _ = slice(start, stop).indices(frames)
+        return start, max(start, stop)
+
+    def pieces(self, start=0, stop=None):
+        """Yield (first frame, rows view) for frames start..stop-1, one piece per chunk touched."""
+        start, stop = self._range(start, stop)
+        rows = self.chunk_rows
+        while start < stop:
+            index, offset = divmod(start, rows)
+            end = min(stop, (index + 1) * rows)
+            yield start, self._chunk(index)[offset:offset + end - start]
+            start = end
+
+    def window(self, start, stop):
+        """Frames start..stop-1 as an (n, fields) array: a view within one chunk, a copy across chunks."""
+        parts = [rows for _, rows in self.pieces(start, stop)]
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return np.empty((0, len(self.fields)), dtype=self.header["dtype"])
+        return np.concatenate(parts)
+
+    def column(self, name, start=0, stop=None):
+        """One field over frames start..stop-1 (a view within one chunk)."""
+        return self.window(start, stop)[:, self._index[name]]
+
+    def __getitem__(self, frame):
+        """Frame k as a {field: value} dict."""
+        if frame < 0:
+            frame += len(self)
+        if not 0 <= frame < len(self):
+            raise IndexError(f"frame {frame} is outside 0..{len(self) - 1}")
+        index, offset = divmod(frame, self.chunk_rows)
+        return dict(zip(self.fields, self._chunk(index)[offset].tolist()))
+
+    def states(self, start=0, stop=None):
+        """Iterate ReplayStates, which scenes.py can draw like a live engine."""
+        fps = self.header["params"]["fps"]
+        kind = self.header["kind"]
+        for first, rows in self.pieces(start, stop):
+            for frame, row in enumerate(rows.tolist(), first):
+                yield ReplayState(kind, row, frame / fps)
+
+
+def record(sim, path, steps, chunk_rows=CHUNK_ROWS):
+    """Record steps frames of sim into the store at path and return its frame count."""
+    with TrajectoryWriter(path, sim, chunk_rows) as writer:
+        writer.record(steps)
+    return writer.frames
+
+
+# ---------------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Chunked, memory-mapped trajectories of long runs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rec = commands.add_parser("record", help="run a seeded simulation and store every frame")
+    rec.add_argument("kind", choices=sorted(ENGINES))
+    rec.add_argument("variant")
+    rec.add_argument("steps", type=int)
+    rec.add_argument("path")
+    rec.add_argument("--seed", type=int, default=0)
+    rec.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    info = commands.add_parser("info", help="print a store's header, frame count and chunks")
+    info.add_argument("path")
+    show = commands.add_parser("show", help="print one frame")
+    show.add_argument("path")
+    show.add_argument("frame", type=int)
+    stats = commands.add_parser("stats", help="min / max / mean of one field over a frame range")
+    stats.add_argument("path")
+    stats.add_argument("field")
+    stats.add_argument("--start", type=int, default=0)
+    stats.add_argument("--stop", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        frames = record(ENGINES[args.kind](args.variant, seed=args.seed), args.path, args.steps, args.chunk_rows)
+        print(f"{args.path}: {frames} frames in {-(-frames // args.chunk_rows)} chunks")
+    elif args.command == "info":
+        store = TrajectoryReader(args.path)
+        header = store.header
+        chunks = -(-len(store) // store.chunk_rows)
+        print(f"{header['kind']} {header['variant']}  seed={header['seed']}  frames={len(store)}  "
+              f"chunks={chunks} x {store.chunk_rows} rows")
+        print("fields: " + ", ".join(store.fields))
+        for name, value in header["params"].items():
+            print(f"    {name} = {value}")
+    elif args.command == "show":
+        for name, value in TrajectoryReader(args.path)[args.frame].items():
+            print(f"{name:>16} {value:.6g}")
+    else:
+        # Streamed chunk by chunk: only the pages of the range are read
+        store = TrajectoryReader(args.path)
+        column = store.fields.index(args.field)
+        low, high, total, count = np.inf, -np.inf, 0.0, 0
+        for _, rows in store.pieces(args.start, args.stop):
+            values = rows[:, column]
+            low = min(low, float(values.min()))
+            high = max(high, float(values.max()))
+            total += float(values.sum(dtype=np.float64))
+            count += len(values)
+        if not count:
+            print("No frames in that range")
+        else:
+            print(f"{args.field}: min {low:.6g}  max {high:.6g}  mean {total / count:.6g}  over {count} frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+###############################################################################################
+# Fadil Eldin
+# Oct/18/2026
+###############################################################################################
+"""
+Containment fuzzer: do the balls stay inside the spinning hexagon / cube?
+
+Every script ends its frame with a last-resort clamp (constrain_ball_inside_hexagon in the D
+hexagon, enforce_boundary's np.clip in the Manus cube) because nothing else guarantees that the
+ball stays in. This runs large batches of balls, each with its own seed and with a kick range and
+spin schedule drawn from that seed, and flags every ball whose center ends a step outside the
+container shrunk by the ball radius (overlap() > --tolerance pixels).
+
+    hexagon D            HexagonBatch, all balls stepped together
+    cube Manus/Manus-3d  CubeBatch, all balls stepped together
+    anything else        the HexagonSim / CubeSim engine, one seed after another (slower)
+
+--no-rescue leaves the batch's clamp out, so the collision code is checked on its own.
+Fuzzed parameters are drawn relative to the variant's defaults: kick forces up to --kick-scale
+times the default maximum, any kick direction, spin speeds up to --spin-scale times the default
+and spin durations from 1% of the default minimum up to the default maximum on top of that.
+
+Of the failing balls the one that fails earliest (then the lowest seed) is re-run alone to confirm
+it, and printed with its parameters and the command that reproduces it. The exit status is 1 when
+anything failed, so the fuzzer can run in a loop or a CI job:
+
+    python verify.py hexagon D --balls 20000 --steps 3600
+    python verify.py hexagon D --no-rescue --seed 4711 --steps 13
+    python verify.py hexagon Swept --balls 50
+"""
+###############################################################################################
+import argparse
+import sys
+import time
+
+import numpy as np
+
+import cube_sim
+import hexagon_sim
+from cube_batch import CubeBatch
+from hexagon_batch import HexagonBatch
+from recording import ENGINES
+from streams import BallStreams
+
+DEFAULTS = {"hexagon": hexagon_sim.VARIANTS, "cube": cube_sim.VARIANTS}
+BATCHED = {("hexagon", "D"), ("cube", "Manus"), ("cube", "Manus-3d")}
+FUZZ_KEY = 1  # Stream key of the fuzzed parameters; the physics uses key 0
+
+
+def fuzz_params(kind, variant, seeds, kick_scale=4.0, spin_scale=4.0):
+    """Per-seed parameter arrays drawn from each seed's own stream."""
+    defaults = DEFAULTS[kind][variant]
+    streams = BallStreams(seeds, key=FUZZ_KEY)
+    every = slice(None)
+    zero = np.zeros(len(seeds))
+    params = {}
+
+    # Kick range: force anywhere up to kick_scale times the default maximum, in any direction
+    top = streams.uniform(every, zero, zero + kick_scale * defaults["kick_force_max"])
+    params["kick_force_max"] = top
+    params["kick_force_min"] = top * streams.random(every)
+    if "kick_angle_min" in defaults:
+        center = streams.uniform(every, zero - 180, zero + 180)
+        width = streams.uniform(every, zero, zero + 360)
+        params["kick_angle_min"] = center - width / 2
+        params["kick_angle_max"] = center + width / 2
+    if "max_velocity" in defaults:
+        params["max_velocity"] = defaults["max_velocity"] * streams.uniform(every, zero + 1, zero + kick_scale)
+
+    # Spin schedule: speed and the range of durations between reversals
+    speed = "angular_velocity" if kind == "hexagon" else "rotation_speed"
+    params[speed] = defaults[speed] * streams.uniform(every, zero, zero + spin_scale)
+    shortest = defaults["spin_min"] * streams.uniform(every, zero + 0.01, zero + 1)
+    longest = shortest + defaults["spin_max"] * streams.random(every)
+    if isinstance(defaults["spin_min"], int):
+        shortest, longest = np.floor(shortest).astype(np.int64), np.floor(longest).astype(np.int64)
+    params["spin_min"] = shortest
+    params["spin_max"] = longest
+    return params
+
+
+def run_batch(kind, variant, seeds, params, steps, tolerance=0.01, rescue=True):
+    """Step one batch. Returns (first failing step or -1, overlap at that step) per ball."""
+    n = len(seeds)
+    if kind == "hexagon":
+        batch = HexagonBatch(n, seed=seeds, rescue=rescue, **params)
+    else:
+        batch = CubeBatch(n, seed=seeds, rescue=rescue, variant=variant, **params)
+    first = np.full(n, -1, dtype=np.int64)
+    worst = np.zeros(n)
+    with np.errstate(all="ignore"):  # Balls that already left may fly off to inf
+        for step in range(steps):
+            batch.step()
+            overlap = batch.overlap()
+            failed = ~(overlap <= tolerance) & (first < 0)  # NaN counts as a failure
+            if failed.any():
+                first[failed] = step
+                worst[failed] = overlap[failed]
+    return first, worst
+
+
+def run_engine(kind, variant, seeds, params, steps, tolerance=0.01):
+    """run_batch() for the scalar engines, one seed at a time."""
+    first = np.full(len(seeds), -1, dtype=np.int64)
+    worst = np.zeros(len(seeds))
+    for i, seed in enumerate(seeds):
+        sim = ENGINES[kind](variant, seed=int(seed), **_params_of(params, i))
+        for step in range(steps):
+            sim.step()
+            overlap = sim.overlap()
+            if not overlap <= tolerance:
+                first[i], worst[i] = step, overlap
+                break
+    return first, worst
+
+
+def fuzz(kind, variant, seeds, steps, tolerance=0.01, rescue=True, kick_scale=4.0, spin_scale=4.0):
+    """Fuzz one group of seeds. Returns (params, first failing step per seed, overlap per seed)."""
+    seeds = np.asarray(seeds, dtype=np.int64)
+    params = fuzz_params(kind, variant, seeds, kick_scale, spin_scale)
+    if (kind, variant) in BATCHED:
+        first, worst = run_batch(kind, variant, seeds, params, steps, tolerance, rescue)
+    else:
+        first, worst = run_engine(kind, variant, seeds, params, steps, tolerance)
+    return params, first, worst
+
+
+def _params_of(params, i):
+    return {name: values[i].item() for name, values in params.items()}
+
+
+def _format_params(params):
+    return ", ".join(f"{name}={value:.4g}" if isinstance(value, float) else f"{name}={value}"
+                     for name, value in params.items())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzz the collision code for balls leaving their container.")
+    parser.add_argument("kind", choices=sorted(DEFAULTS))
+    parser.add_argument("variant")
+    parser.add_argument("--balls", type=int, default=10_000, help="balls (seeds) per batch")
+    parser.add_argument("--batches", type=int, default=1)
+    parser.add_argument("--steps", type=int, default=3600, help="frames per ball")
+    parser.add_argument("--seed", type=int, default=0, help="first seed; seeds run consecutively")
+    parser.add_argument("--tolerance", type=float, default=0.01, help="pixels past the limit to flag")
+    parser.add_argument("--no-rescue", action="store_true", help="leave the batch's last-resort clamp out")
+    parser.add_argument("--kick-scale", type=float, default=4.0)
+    parser.add_argument("--spin-scale", type=float, default=4.0)
+    args = parser.parse_args()
+
+    kind, variant = args.kind, args.variant
+    if variant not in DEFAULTS[kind]:
+        parser.error(f"unknown {kind} variant {variant!r}, expected one of {sorted(DEFAULTS[kind])}")
+    if args.no_rescue and (kind, variant) not in BATCHED:
+        parser.error("--no-rescue needs a batched variant: "
+                     + ", ".join(f"{k} {v}" for k, v in sorted(BATCHED)))
+    rescue = not args.no_rescue
+    options = (args.steps, args.tolerance, rescue, args.kick_scale, args.spin_scale)
+
+    start = time.perf_counter()
+    failures = []  # (first step, seed, overlap, params)
+    n_balls = args.balls
+    for batch in range(args.batches):
+        seeds = args.seed + batch * n_balls + np.arange(n_balls)
+        params, first, worst = fuzz(kind, variant, seeds, *options)
+        for i in np.nonzero(first >= 0)[0]:
+            failures.append((int(first[i]), int(seeds[i]), float(worst[i]), _params_of(params, i)))
+    seconds = time.perf_counter() - start
+
+    total = args.batches * n_balls
+    ball_steps = total * args.steps
+    print(f"{kind} {variant}{'' if rescue else ' (no rescue)'}: {total} balls x {args.steps} steps "
+          f"= {ball_steps / 1e6:.1f}M ball-steps in {seconds:.1f} s ({ball_steps / seconds / 1e6:.2f}M/s)")
+    if not failures:
+        print(f"OK: every ball stayed inside (overlap <= {args.tolerance} px)")
+        return 0
+
+    step, seed, overlap, params = min(failures)
+    print(f"FAIL: {len(failures)} of {total} balls ended a step with the center outside the {kind} "
+          f"minus the radius (overlap > {args.tolerance} px)")
+    print(f"Minimal reproducer: seed {seed} at step {step} (overlap {overlap:.3f} px)")
+    _, alone, alone_overlap = fuzz(kind, variant, [seed], step + 1, *options[1:])
+    confirmed = alone[0] == step and np.isclose(alone_overlap[0], overlap, equal_nan=True)
+    print(f"  re-run alone: {'same failure' if confirmed else f'step {alone[0]}, overlap {alone_overlap[0]:.3f} px'}")
+    print(f"  params: {_format_params(params)}")
+    print(f"  python verify.py {kind} {variant}{'' if rescue else ' --no-rescue'} --balls 1 "
+          f"--seed {seed} --steps {step + 1} --tolerance {args.tolerance} "
+          f"--kick-scale {args.kick_scale} --spin-scale {args.spin_scale}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())